@@ -18,6 +18,18 @@ class Settings:
         self.app_name: str = os.getenv("APP_NAME", "Educational Center API")
         self.environment: str = os.getenv("ENV", "development")
         self.database_url: str = os.getenv("DATABASE_URL", _default_sqlite_url())
+        # по умолчанию выводится из DATABASE_URL заменой драйвера (aiosqlite / asyncpg)
+        self.async_database_url: str | None = os.getenv("ASYNC_DATABASE_URL")
+
+        # Connection pool (QueuePool); sync handlers run in the AnyIO threadpool, sized to match
+        self.db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "10"))
+        self.db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+        self.db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+        self.db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+        self.db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+        self.threadpool_size: int = int(os.getenv("THREADPOOL_SIZE", str(self.db_pool_size + self.db_max_overflow)))
+        self.health_cache_ttl: float = float(os.getenv("HEALTH_CACHE_TTL", "5"))
+
         self.jwt_secret: str = os.getenv("JWT_SECRET", "dev-secret")
         self.jwt_algorithm: str = "HS256"
         self.jwt_exp_minutes: int = int(os.getenv("JWT_EXP_MINUTES", "60"))
@@ -25,6 +37,20 @@ class Settings:
         self.admin_password: str = os.getenv("ADMIN_PASSWORD", "admin123")
         self.telegram_bot_token: str | None = os.getenv("TELEGRAM_BOT_TOKEN")
         self.telegram_chat_id: str | None = os.getenv("TELEGRAM_CHAT_ID")
+        self.telegram_api_base: str = os.getenv("TELEGRAM_API_BASE", "https://api.telegram.org")
+
+        # Notification outbox worker
+        self.outbox_enabled: bool = os.getenv("OUTBOX_ENABLED", "true").lower() == "true"
+        self.outbox_poll_interval: float = float(os.getenv("OUTBOX_POLL_INTERVAL", "5"))
+        self.outbox_batch_size: int = int(os.getenv("OUTBOX_BATCH_SIZE", "20"))
+        self.outbox_max_attempts: int = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "12"))
+        self.outbox_backoff_base: float = float(os.getenv("OUTBOX_BACKOFF_BASE", "2"))
+        self.outbox_backoff_max: float = float(os.getenv("OUTBOX_BACKOFF_MAX", "900"))
+
+        # Group commit for POST /applications: one INSERT and one COMMIT per window instead of per request
+        self.application_batching: bool = os.getenv("APPLICATION_BATCHING", "false").lower() == "true"
+        self.application_batch_window_ms: float = float(os.getenv("APPLICATION_BATCH_WINDOW_MS", "5"))
+        self.application_batch_max: int = int(os.getenv("APPLICATION_BATCH_MAX", "200"))
 
         # CORS settings
         cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:8080,http://localhost:5173")
@@ -33,11 +59,50 @@ class Settings:
         # Rate limiting
         self.rate_limit_enabled: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
         self.redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379")
+        self.rate_limit_storage_uri: str = os.getenv("RATE_LIMIT_STORAGE_URI", self.redis_url)
+        self.rate_limit_default: str = os.getenv("RATE_LIMIT_DEFAULT", "300/minute")
+        self.rate_limit_applications: str = os.getenv("RATE_LIMIT_APPLICATIONS", "5/minute;20/hour")
+        self.rate_limit_login: str = os.getenv("RATE_LIMIT_LOGIN", "5/minute;30/hour")
+        # включать только за nginx, который выставляет X-Real-IP
+        self.trust_proxy_headers: bool = os.getenv("TRUST_PROXY_HEADERS", "false").lower() == "true"
+
+        # Prometheus /metrics
+        self.metrics_enabled: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+        # Slow-query / N+1 log (opt-in, for development and short investigations)
+        self.query_log_enabled: bool = os.getenv("QUERY_LOG_ENABLED", "false").lower() == "true"
+        self.query_log_max_queries: int = int(os.getenv("QUERY_LOG_MAX_QUERIES", "20"))
+        self.query_log_slow_ms: float = float(os.getenv("QUERY_LOG_SLOW_MS", "500"))
+        self.query_log_repeat_threshold: int = int(os.getenv("QUERY_LOG_REPEAT_THRESHOLD", "5"))
+        self.query_log_stack_depth: int = int(os.getenv("QUERY_LOG_STACK_DEPTH", "6"))
 
         # Pagination
         self.default_page_size: int = int(os.getenv("DEFAULT_PAGE_SIZE", "20"))
         self.max_page_size: int = int(os.getenv("MAX_PAGE_SIZE", "100"))
 
+        # Uploaded images (content-addressed)
+        self.media_dir: str = os.getenv("MEDIA_DIR", str(BASE_DIR / "media"))
+        self.image_variants_enabled: bool = os.getenv("IMAGE_VARIANTS_ENABLED", "true").lower() == "true"
+        self.image_workers: int = int(os.getenv("IMAGE_WORKERS", "2"))
+
+        # Public response cache (per worker)
+        self.public_cache_enabled: bool = os.getenv("PUBLIC_CACHE_ENABLED", "true").lower() == "true"
+        self.public_cache_ttl: float = float(os.getenv("PUBLIC_CACHE_TTL", "60"))
+        # LRU cap: keys include query values, so memory is bounded by entries, not by what clients send
+        self.public_cache_max_entries: int = int(os.getenv("PUBLIC_CACHE_MAX_ENTRIES", "2000"))
+        # Second level in Redis (REDIS_URL), shared by all workers and hosts; writes invalidate via pub/sub
+        self.public_cache_shared: bool = os.getenv("PUBLIC_CACHE_SHARED", "false").lower() == "true"
+        self.public_cache_shared_ttl: float = float(os.getenv("PUBLIC_CACHE_SHARED_TTL", "300"))
+        # orjson for responses and row-mapping serialization of public lists (needs orjson installed)
+        self.json_fast_path: bool = os.getenv("JSON_FAST_PATH", "false").lower() == "true"
+
+        # Static prerender of public pages; empty PRERENDER_DIR disables it
+        self.prerender_dir: str = os.getenv("PRERENDER_DIR", "")
+        self.prerender_template_dir: str = os.getenv("PRERENDER_TEMPLATE_DIR") or str(BASE_DIR.parent / "frontend")
+
+        # Startup schema check against the migration head: error | warn | off
+        self.schema_check: str = os.getenv("SCHEMA_CHECK", "error").lower()
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -1,7 +1,14 @@
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from .config import get_settings
+from .services import querylog
+from .services.metrics import record_query
 
 settings = get_settings()
 
@@ -9,9 +16,64 @@ connect_args = {}
 if settings.database_url.startswith("sqlite"):
     connect_args = {"check_same_thread": False}
 
-engine = create_engine(settings.database_url, echo=False, future=True, connect_args=connect_args)
+
+def _pool_options(url: str) -> dict:
+    # in-memory SQLite живёт в одном соединении (SingletonThreadPool/StaticPool) — размеры пула к нему неприменимы
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+engine = create_engine(
+    settings.database_url, echo=False, future=True, connect_args=connect_args, **_pool_options(settings.database_url)
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 
+# Async-драйверы для тех же баз: aiosqlite локально, asyncpg на Postgres
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg", "postgres": "postgresql+asyncpg"}
+
+
+def _async_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r}; set ASYNC_DATABASE_URL")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+async_database_url = settings.async_database_url or _async_url(settings.database_url)
+async_pool_options = _pool_options(async_database_url)
+if async_pool_options and make_url(async_database_url).get_backend_name() == "sqlite":
+    # aiosqlite по умолчанию работает без пула (NullPool) — открывает соединение на каждую сессию
+    async_pool_options["poolclass"] = AsyncAdaptedQueuePool
+async_engine = create_async_engine(async_database_url, echo=False, **async_pool_options)
+
+
+def _track_queries(target) -> None:
+    # время каждого SQL-выражения уходит в статистику текущего HTTP-запроса (services/metrics.py, services/querylog.py)
+    @event.listens_for(target, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(target, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        record_query(elapsed)
+        querylog.record(statement, elapsed)
+
+
+_track_queries(engine)
+_track_queries(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
@@ -23,3 +85,19 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def pool_status(target) -> dict:
+    """
+    Checked-in/checked-out/overflow counters of an engine's pool (sync or async).
+    """
+    pool = getattr(target, "sync_engine", target).pool
+    stats = {"class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        counter = getattr(pool, name, None)
+        if callable(counter):
+            stats[name] = counter()
+    return stats
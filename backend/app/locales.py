@@ -0,0 +1,14 @@
+# Языки сайта; порядок — как у переключателя на фронтенде
+LOCALES = ("ru", "uz", "en", "ja")
+
+
+def base_slug(slug: str) -> str:
+    """
+    Slug without the locale suffix: переводы одной записи называются "<base>-<locale>".
+    """
+    if not slug:
+        return slug
+    parts = slug.split("-")
+    if parts[-1] in LOCALES:
+        return "-".join(parts[:-1]) or slug
+    return slug
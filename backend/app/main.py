@@ -1,15 +1,27 @@
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
+import anyio.to_thread
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
+from slowapi.middleware import SlowAPIASGIMiddleware
 
 from .config import get_settings
-from .database import Base, engine
-from .routers import admin, auth, public
+from . import migrate
+from .database import async_engine, engine
+from .ratelimit import limiter
+from .routers import admin, auth, health, public
+from .services import derivatives, fastjson, telegram
+from .services.cache import shared_cache
+from .services.intake import intake_batcher
+from .services.metrics import MetricsMiddleware, registry
+from .services.outbox import outbox_worker
+from .services.prerender import prerender_worker
+from .services.querylog import QueryLogMiddleware
 
 settings = get_settings()
 
@@ -20,22 +32,41 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Rate limiter
-limiter = Limiter(key_func=get_remote_address, enabled=settings.rate_limit_enabled)
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting application...")
-    Base.metadata.create_all(bind=engine)
-    logger.info("Database tables created/verified")
+    # синхронные обработчики (админка) работают в пуле потоков AnyIO: не больше потоков, чем соединений в пуле БД
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+    # схему создают миграции (python -m app.migrate), при старте только сверяем ревизию
+    if settings.schema_check != "off":
+        await anyio.to_thread.run_sync(migrate.check, engine)
+    if settings.outbox_enabled:
+        if telegram.is_configured():
+            outbox_worker.start()
+        else:
+            logger.warning("Telegram: token/chat_id not configured, notifications stay in the outbox")
+    if settings.prerender_dir:
+        prerender_worker.start()
+    shared_cache.start()
+    if settings.application_batching:
+        intake_batcher.start()
     yield
     # Shutdown
     logger.info("Shutting down application...")
-
-
-app = FastAPI(title=settings.app_name, lifespan=lifespan)
+    # очередь заявок дописывается до остановки outbox и пула соединений
+    await intake_batcher.stop()
+    await outbox_worker.stop()
+    await prerender_worker.stop()
+    await shared_cache.stop()
+    derivatives.shutdown()
+    await async_engine.dispose()
+
+
+# ответы с response_model (админка, поиск) кодирует orjson вместо json.dumps
+default_response_class = ORJSONResponse if fastjson.enabled() else JSONResponse
+app = FastAPI(title=settings.app_name, lifespan=lifespan, default_response_class=default_response_class)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
@@ -48,25 +79,30 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# лимит по умолчанию для всех маршрутов; у заявок и логина свои, более строгие (декораторы)
+app.add_middleware(SlowAPIASGIMiddleware)
+if settings.query_log_enabled:
+    app.add_middleware(QueryLogMiddleware)
+if settings.metrics_enabled:
+    # добавлен последним — внешний слой, считает и CORS-ответы
+    app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth.router, prefix="/api")
 app.include_router(public.router, prefix="/api")
 app.include_router(admin.router, prefix="/api")
+app.include_router(health.router)
 
 
 @app.get("/health")
-def health():
-    """Health check endpoint"""
-    try:
-        # Проверяем подключение к БД
-        from .database import SessionLocal
-        db = SessionLocal()
-        db.execute("SELECT 1")
-        db.close()
-        return {"status": "ok", "database": "connected"}
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        return {"status": "degraded", "database": "disconnected", "error": str(e)}
-
-
-
+@limiter.exempt
+async def health_check(response: Response):
+    """Health check endpoint (same as /health/ready)"""
+    return await health.ready(response)
+
+
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    @limiter.exempt
+    def metrics():
+        """Prometheus text exposition"""
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,188 @@
+import argparse
+import ast
+import logging
+import re
+from pathlib import Path
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+
+from .config import BASE_DIR, get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = BASE_DIR / "migrations"
+ALEMBIC_INI = BASE_DIR / "alembic.ini"
+# `revision: str = '…'` / `down_revision: Union[str, None] = …` в шапке файла миграции
+_REVISION_LINE = re.compile(r"^(revision|down_revision)\b[^=\n]*=\s*(.+?)\s*$", re.MULTILINE)
+
+
+# Объекты, по которым видно, что ревизия уже применена. Нужны базам без alembic_version, созданным через
+# create_all до b3d8f2a6c471: такая база соответствует последней ревизии, чьи объекты в ней все есть.
+# Ревизии, которые только правят данные (e2a7c4f81d36), признаков не имеют и при upgrade выполняются заново.
+SCHEMA_MARKERS = [
+    ('c0406f8291c1', [('table', 'courses'), ('table', 'teachers'), ('table', 'blog_posts'), ('table', 'applications')]),
+    ('4b1f6d2e9a07', [('table', 'assets'), ('column', 'teachers', 'photo_hash')]),
+    ('9d3e5a1c7b24', [('column', 'assets', 'variants'), ('column', 'blog_posts', 'cover_variants')]),
+    ('5f8b2d9e0c13', [('index', 'applications', 'ix_applications_created_at_id')]),
+    ('7a6c3e1d9b52', [('table', 'notification_outbox')]),
+    ('b3d8f2a6c471', [('table', 'search_documents')]),
+]
+# полнотекстовый индекс create_all не создавал: без него ревизия поиска не применена
+SEARCH_INDEX_MARKERS = {
+    'sqlite': ('table', 'search_documents_fts'),
+    'postgresql': ('index', 'search_documents', 'ix_search_documents_tsv'),
+}
+
+
+class SchemaMismatch(RuntimeError):
+    pass
+
+
+def _revision_ids(path: Path) -> tuple[str, tuple[str, ...]]:
+    """(revision, down revisions) read from a version file without importing it."""
+    values = dict(_REVISION_LINE.findall(path.read_text(encoding="utf-8")))
+    down = ast.literal_eval(values.get("down_revision", "None")) or ()
+    return ast.literal_eval(values["revision"]), tuple(down) if isinstance(down, (list, tuple)) else (down,)
+
+
+def script_heads() -> set[str]:
+    """
+    Head revisions of the migration scripts. Parsed statically: importing alembic and every version
+    module costs more than the rest of the startup.
+    """
+    revisions, parents = set(), set()
+    for path in (MIGRATIONS_DIR / "versions").glob("*.py"):
+        revision, down = _revision_ids(path)
+        revisions.add(revision)
+        parents.update(down)
+    return revisions - parents
+
+
+def database_revisions(engine: Engine) -> set[str]:
+    try:
+        with engine.connect() as connection:
+            return {row[0] for row in connection.execute(text("SELECT version_num FROM alembic_version"))}
+    except DBAPIError:
+        # таблицы нет — база не создавалась миграциями
+        return set()
+
+
+def check(engine: Engine) -> None:
+    """
+    One query at startup instead of create_all: the database must be at the migration head.
+    """
+    expected, current = script_heads(), database_revisions(engine)
+    if current == expected:
+        logger.info("Database schema is at the migration head %s", ", ".join(sorted(current)))
+        return
+    message = (
+        f"Database schema is at {', '.join(sorted(current)) or 'no revision'}, "
+        f"the code expects {', '.join(sorted(expected))}; run `python -m app.migrate`"
+    )
+    if settings.schema_check == "warn":
+        logger.warning(message)
+        return
+    raise SchemaMismatch(message)
+
+
+def detect_revision(engine: Engine) -> str | None:
+    """
+    Revision a database without alembic_version (created by create_all) is at, from the objects it has.
+    None for an empty database; SchemaMismatch when the schema stops halfway through a revision.
+    """
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+
+    def present(marker: tuple) -> bool:
+        kind, table, *name = marker
+        if table not in tables:
+            return False
+        if kind == 'column':
+            return name[0] in {column['name'] for column in inspector.get_columns(table)}
+        if kind == 'index':
+            return name[0] in {index['name'] for index in inspector.get_indexes(table)}
+        return True
+
+    detected, missing, partial = None, False, []
+    for revision, markers in SCHEMA_MARKERS:
+        if revision == 'b3d8f2a6c471' and engine.dialect.name in SEARCH_INDEX_MARKERS:
+            markers = [*markers, SEARCH_INDEX_MARKERS[engine.dialect.name]]
+        found = [present(marker) for marker in markers]
+        if all(found) and not missing:
+            detected = revision
+        elif any(found):
+            # объекты ревизии есть частично или после пропущенной — цепочке это не соответствует
+            partial.append(revision)
+        else:
+            missing = True
+    if partial:
+        raise SchemaMismatch(
+            f"Database schema matches {detected or 'no revision'} but already has part of "
+            f"{', '.join(partial)}; finish those migrations by hand, then stamp"
+        )
+    return detected
+
+
+def _alembic_config():
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    # путь в alembic.ini относительный — не зависим от текущего каталога
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    return config
+
+
+def main() -> None:
+    """Apply or inspect Alembic migrations for DATABASE_URL."""
+    from alembic import command
+
+    parser = argparse.ArgumentParser(description="Database migrations (Alembic)")
+    commands = parser.add_subparsers(dest="command")
+    upgrade = commands.add_parser("upgrade", help="upgrade to a revision (default: head)")
+    upgrade.add_argument("revision", nargs="?", default="head")
+    downgrade = commands.add_parser("downgrade", help="downgrade to a revision, e.g. -1")
+    downgrade.add_argument("revision")
+    stamp = commands.add_parser("stamp", help="record a revision without running migrations")
+    stamp.add_argument("revision")
+    commands.add_parser("adopt", help="stamp a database created by create_all with the revision its schema matches")
+    commands.add_parser("current", help="show the revision of the database")
+    commands.add_parser("check", help="exit with an error unless the database is at head")
+    args = parser.parse_args()
+
+    config = _alembic_config()
+    if args.command in (None, "upgrade"):
+        command.upgrade(config, getattr(args, "revision", "head"))
+    elif args.command == "downgrade":
+        command.downgrade(config, args.revision)
+    elif args.command == "stamp":
+        command.stamp(config, args.revision)
+    elif args.command == "adopt":
+        from .database import engine
+
+        if database_revisions(engine):
+            raise SystemExit("database already has alembic_version; run `python -m app.migrate`")
+        try:
+            revision = detect_revision(engine)
+        except SchemaMismatch as exc:
+            raise SystemExit(str(exc)) from exc
+        if revision is None:
+            raise SystemExit("database has no tables; run `python -m app.migrate`")
+        command.stamp(config, revision)
+        print(f"stamped {revision}; now run `python -m app.migrate`")
+    elif args.command == "current":
+        command.current(config, verbose=True)
+    else:
+        from .database import engine
+
+        try:
+            check(engine)
+        except SchemaMismatch as exc:
+            raise SystemExit(str(exc)) from exc
+        print("database is at head")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,32 @@
 from datetime import datetime, timezone
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, JSON, String, Text
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    JSON,
+    String,
+    Text,
+    UniqueConstraint,
+    event,
+)
 from sqlalchemy.orm import relationship
 
 from .database import Base
+from .locales import base_slug
+
+
+def _translation_group(context) -> str:
+    # переводы одной записи создаются со slug "<base>-<locale>" — по умолчанию группа и есть base
+    return base_slug(context.get_current_parameters()["slug"])
+
+
+def _name_search(context) -> str:
+    # lower() в SQLite складывает только ASCII — регистр кириллицы снимаем в Python при вставке
+    return context.get_current_parameters()["name"].casefold()
 
 
 class Admin(Base):
@@ -29,11 +53,16 @@ class Course(Base):
     advantages = Column(JSON, nullable=True)
     is_active = Column(Boolean, default=True, index=True)
     slug = Column(String(255), unique=True, index=True, nullable=False)
+    # общий для всех языковых версий курса; не меняется при смене slug
+    translation_group = Column(String(255), nullable=False, index=True, default=_translation_group)
     description = Column(Text, nullable=True)
     locale = Column(String(10), default="ru", index=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
+    # публичный список: locale + is_active, новые первыми — индекс отдаёт строки уже в нужном порядке
+    __table_args__ = (Index("ix_courses_locale_is_active_created_at", "locale", "is_active", "created_at"),)
+
     applications = relationship("Application", back_populates="course")
 
 
@@ -48,9 +77,35 @@ class Application(Base):
     course_title = Column(String(255), nullable=True)
     status = Column(String(50), default="new", index=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    # имя для префиксного поиска; заявки после создания не переименовываются, onupdate не нужен
+    name_search = Column(String(255), nullable=False, default=_name_search)
 
     course = relationship("Course", back_populates="applications")
 
+    # Инбокс листается по (created_at, id) с фильтрами по статусу/курсу и префиксу телефона/имени
+    __table_args__ = (
+        Index("ix_applications_created_at_id", "created_at", "id"),
+        Index("ix_applications_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_applications_course_id_created_at_id", "course_id", "created_at", "id"),
+        Index("ix_applications_phone_prefix", "phone", postgresql_ops={"phone": "varchar_pattern_ops"}),
+        Index("ix_applications_name_search", "name_search", postgresql_ops={"name_search": "varchar_pattern_ops"}),
+    )
+
+
+class Asset(Base):
+    """Uploaded image stored once on disk under its sha256; rows reference it by hash."""
+
+    __tablename__ = "assets"
+
+    hash = Column(String(64), primary_key=True)
+    content_type = Column(String(100), nullable=False)
+    size = Column(Integer, nullable=False)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    # {"thumb": {"hash", "width", "height"}, ...}; заполняется фоновой задачей
+    variants = Column(JSON(none_as_null=True), nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
 
 class Teacher(Base):
     __tablename__ = "teachers"
@@ -58,12 +113,17 @@ class Teacher(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
     bio = Column(Text, nullable=True)
-    photo_base64 = Column(Text, nullable=True)
+    photo_hash = Column(String(64), ForeignKey("assets.hash"), nullable=True)
+    photo_width = Column(Integer, nullable=True)
+    photo_height = Column(Integer, nullable=True)
+    photo_variants = Column(JSON(none_as_null=True), nullable=True)
     socials = Column(JSON, nullable=True)
     locale = Column(String(10), default="ru", index=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
+    __table_args__ = (Index("ix_teachers_locale_created_at", "locale", "created_at"),)
+
 
 class TrackStep(Base):
     __tablename__ = "track_steps"
@@ -77,6 +137,8 @@ class TrackStep(Base):
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
+    __table_args__ = (Index("ix_track_steps_locale_order", "locale", "order"),)
+
 
 class Review(Base):
     __tablename__ = "reviews"
@@ -90,6 +152,8 @@ class Review(Base):
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
+    __table_args__ = (Index("ix_reviews_locale_is_visible_created_at", "locale", "is_visible", "created_at"),)
+
 
 class Partner(Base):
     __tablename__ = "partners"
@@ -97,12 +161,21 @@ class Partner(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
     url = Column(String(500), nullable=True)
-    logo_base64 = Column(Text, nullable=True)
+    logo_hash = Column(String(64), ForeignKey("assets.hash"), nullable=True)
+    logo_width = Column(Integer, nullable=True)
+    logo_height = Column(Integer, nullable=True)
+    logo_variants = Column(JSON(none_as_null=True), nullable=True)
     locale = Column(String(10), default="ru", index=True)
     order = Column(Integer, default=0)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
+    # сортировка order ASC, created_at DESC; главная читает партнёров без locale
+    __table_args__ = (
+        Index("ix_partners_locale_order_created_at", "locale", "order", created_at.desc()),
+        Index("ix_partners_order_created_at", "order", created_at.desc()),
+    )
+
 
 class BlogPost(Base):
     __tablename__ = "blog_posts"
@@ -110,9 +183,13 @@ class BlogPost(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     slug = Column(String(255), unique=True, index=True, nullable=False)
+    translation_group = Column(String(255), nullable=False, index=True, default=_translation_group)
     body = Column(Text, nullable=False)
     excerpt = Column(Text, nullable=True)
-    cover_base64 = Column(Text, nullable=True)
+    cover_hash = Column(String(64), ForeignKey("assets.hash"), nullable=True)
+    cover_width = Column(Integer, nullable=True)
+    cover_height = Column(Integer, nullable=True)
+    cover_variants = Column(JSON(none_as_null=True), nullable=True)
     locale = Column(String(10), default="ru", index=True)
     is_published = Column(Boolean, default=False, index=True)
     published_at = Column(DateTime, nullable=True)
@@ -121,6 +198,11 @@ class BlogPost(Base):
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
+    # лента блога: locale + is_published, keyset по (published_at, id) в обратном порядке
+    __table_args__ = (
+        Index("ix_blog_posts_locale_is_published_published_at_id", "locale", "is_published", "published_at", "id"),
+    )
+
 
 class StaticPage(Base):
     __tablename__ = "static_pages"
@@ -146,3 +228,62 @@ class ContactInfo(Base):
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
+
+
+class NotificationOutbox(Base):
+    __tablename__ = "notification_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    channel = Column(String(50), nullable=False, default="telegram")
+    payload = Column(JSON, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    # NULL — доставлено или попытки исчерпаны; иначе время следующей попытки (или конец аренды воркера)
+    next_attempt_at = Column(DateTime, nullable=True, default=lambda: datetime.now(timezone.utc))
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (Index("ix_notification_outbox_next_attempt_at", "next_attempt_at"),)
+
+
+class SearchDocument(Base):
+    """Denormalized text of public courses and blog posts; the full-text index is built over it."""
+
+    __tablename__ = "search_documents"
+
+    id = Column(Integer, primary_key=True)
+    entity = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    locale = Column(String(10), nullable=True, index=True)
+    slug = Column(String(255), nullable=False)
+    title = Column(String(255), nullable=False)
+    body = Column(Text, nullable=True)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (UniqueConstraint("entity", "entity_id", name="uq_search_documents_entity"),)
+
+
+# Индекс зависит от СУБД: FTS5 (external content + триггеры) на SQLite, GIN по tsvector на Postgres.
+# Те же выражения создаёт миграция; запросы в services/search.py должны совпадать с ними.
+SEARCH_INDEX_DDL = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE search_documents_fts USING fts5("
+        "title, body, content='search_documents', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER search_documents_ai AFTER INSERT ON search_documents BEGIN "
+        "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+        "CREATE TRIGGER search_documents_ad AFTER DELETE ON search_documents BEGIN "
+        "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) "
+        "VALUES ('delete', old.id, old.title, old.body); END",
+        "CREATE TRIGGER search_documents_au AFTER UPDATE ON search_documents BEGIN "
+        "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) "
+        "VALUES ('delete', old.id, old.title, old.body); "
+        "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    ],
+    "postgresql": [
+        "CREATE INDEX ix_search_documents_tsv ON search_documents USING gin "
+        "(to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(body, '')))",
+    ],
+}
+for _dialect, _statements in SEARCH_INDEX_DDL.items():
+    for _statement in _statements:
+        event.listen(SearchDocument.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
@@ -0,0 +1,30 @@
+from fastapi import Request
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+from .config import get_settings
+
+settings = get_settings()
+
+
+def client_ip(request: Request) -> str:
+    # За nginx адрес клиента приходит в X-Real-IP (nginx перезаписывает его, подделать нельзя)
+    if settings.trust_proxy_headers:
+        real_ip = request.headers.get("x-real-ip")
+        if real_ip:
+            return real_ip.strip()
+    return get_remote_address(request)
+
+
+# Общие счётчики в Redis со скользящим окном: лимит один на все воркеры uvicorn.
+# Если Redis недоступен, slowapi переключается на память процесса и периодически проверяет Redis снова.
+limiter = Limiter(
+    key_func=client_ip,
+    enabled=settings.rate_limit_enabled,
+    storage_uri=settings.rate_limit_storage_uri,
+    storage_options={"socket_connect_timeout": 0.5, "socket_timeout": 0.5},
+    strategy="moving-window",
+    default_limits=[settings.rate_limit_default],
+    in_memory_fallback_enabled=True,
+    key_prefix="ratelimit",
+)
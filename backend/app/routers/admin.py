@@ -1,23 +1,49 @@
+from datetime import datetime, timezone
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, func, select, text, tuple_, update
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
-from ..database import get_db
+from ..config import get_settings
+from ..database import SessionLocal, get_db
 from ..deps import get_current_admin
+from ..pagination import decode_cursor, encode_cursor
+from ..ratelimit import limiter
+from ..services.assets import InvalidImage, store_base64
+from ..services import derivatives, export, prerender, search
+from ..services.cache import response_cache
 
 router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(get_current_admin)])
-LOCALES = {"ru", "uz", "en", "ja"}
-
-
-def _base_slug(slug: str) -> str:
-    if not slug:
-        return slug
-    parts = slug.split("-")
-    if parts[-1] in LOCALES:
-        return "-".join(parts[:-1]) or slug
-    return slug
+settings = get_settings()
+
+
+def _with_image(db: Session, payload, field: str) -> dict:
+    """
+    Payload fields for a model with an image stored as an asset.
+    `{field}_base64` is a new upload, `{field}_hash` keeps an already uploaded one, neither clears the image.
+    """
+    data = payload.dict(exclude={f"{field}_base64", f"{field}_hash"})
+    upload = getattr(payload, f"{field}_base64")
+    asset_hash = getattr(payload, f"{field}_hash")
+    asset = None
+    if upload:
+        try:
+            asset = store_base64(db, upload)
+        except InvalidImage as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    elif asset_hash:
+        asset = db.get(models.Asset, asset_hash)
+        if not asset:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown image")
+    data[f"{field}_hash"] = asset.hash if asset else None
+    data[f"{field}_width"] = asset.width if asset else None
+    data[f"{field}_height"] = asset.height if asset else None
+    # варианты уже могли быть нарезаны для этого же файла раньше
+    data[f"{field}_variants"] = asset.variants if asset else None
+    return data
 
 
 @router.get("/courses", response_model=List[schemas.CourseRead])
@@ -31,7 +57,11 @@ def create_course(payload: schemas.CourseCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Slug already exists")
     course = models.Course(**payload.dict())
     db.add(course)
+    db.flush()
+    search.index_rows(db, "course", [course])
     db.commit()
+    response_cache.bump("courses")
+    prerender.prerender_worker.schedule(*prerender.pages_for("course", [course]))
     db.refresh(course)
     return course
 
@@ -41,16 +71,21 @@ def update_course(course_id: int, payload: schemas.CourseCreate, db: Session = D
     course = db.query(models.Course).filter(models.Course.id == course_id).first()
     if not course:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
-    base = _base_slug(course.slug)
+    # старый slug/локаль: их страница должна исчезнуть, если они меняются
+    stale = prerender.pages_for("course", [course])
     for key, value in payload.dict().items():
         setattr(course, key, value)
     # синхронизируем статус активности по всем локалям этого курса
-    # Экранируем спецсимволы для LIKE
-    escaped_base = base.replace('%', r'\%').replace('_', r'\_')
-    db.query(models.Course).filter(
-        (models.Course.slug == base) | models.Course.slug.like(f"{escaped_base}-%", escape='\\')
-    ).update({models.Course.is_active: payload.is_active}, synchronize_session=False)
+    db.flush()
+    siblings = db.query(models.Course).filter(models.Course.translation_group == course.translation_group)
+    siblings.update({models.Course.is_active: payload.is_active}, synchronize_session=False)
+    # видимость в поиске меняется у всех локалей сразу
+    affected = {course, *siblings.populate_existing().all()}
+    search.index_rows(db, "course", affected)
+    pages = stale + prerender.pages_for("course", affected)
     db.commit()
+    response_cache.bump("courses")
+    prerender.prerender_worker.schedule(*pages)
     db.refresh(course)
     return course
 
@@ -60,25 +95,144 @@ def delete_course(course_id: int, db: Session = Depends(get_db)):
     course = db.query(models.Course).filter(models.Course.id == course_id).first()
     if not course:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
-    base = _base_slug(course.slug)
-    # Экранируем спецсимволы для LIKE
-    escaped_base = base.replace('%', r'\%').replace('_', r'\_')
-    db.query(models.Course).filter(
-        (models.Course.slug == base) | models.Course.slug.like(f"{escaped_base}-%", escape='\\')
-    ).delete(synchronize_session=False)
+    siblings = db.query(models.Course).filter(models.Course.translation_group == course.translation_group)
+    removed = siblings.with_entities(models.Course.id, models.Course.locale, models.Course.slug).all()
+    search.remove(db, "course", [row.id for row in removed])
+    siblings.delete(synchronize_session=False)
     db.commit()
+    response_cache.bump("courses")
+    prerender.prerender_worker.schedule(*prerender.pages_for("course", removed))
     return None
 
 
-@router.get("/applications", response_model=List[schemas.ApplicationRead])
+def _application_criteria(filters: schemas.ApplicationFilter) -> list:
+    criteria = []
+    if filters.status:
+        criteria.append(models.Application.status == filters.status)
+    if filters.course_id is not None:
+        criteria.append(models.Application.course_id == filters.course_id)
+    if filters.date_from:
+        criteria.append(models.Application.created_at >= filters.date_from)
+    if filters.date_to:
+        criteria.append(models.Application.created_at < filters.date_to)
+    if filters.q:
+        # Экранируем спецсимволы для LIKE, начиная с обратного слеша; префиксный поиск идёт по индексам phone и name_search
+        escaped = filters.q.replace('\\', '\\\\').replace('%', r'\%').replace('_', r'\_')
+        criteria.append(
+            models.Application.phone.like(f"{escaped}%", escape='\\')
+            | models.Application.name_search.like(f"{escaped.casefold()}%", escape='\\')
+        )
+    return criteria
+
+
+def _count_applications(db: Session, criteria: list) -> tuple[int, bool]:
+    if not criteria and db.bind.dialect.name == "postgresql":
+        # count(*) по всей таблице — полный проход; статистика планировщика достаточно точна для инбокса
+        estimate = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'applications'::regclass")
+        ).scalar()
+        if estimate is not None and estimate >= 0:
+            return int(estimate), True
+    return db.query(func.count(models.Application.id)).filter(*criteria).scalar(), False
+
+
+@router.get("/applications", response_model=schemas.ApplicationPage)
 def list_applications(
-    status_filter: Optional[str] = Query(None, alias="status"),
+    filters: schemas.ApplicationFilter = Depends(),
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
 ):
-    query = db.query(models.Application).order_by(models.Application.created_at.desc())
-    if status_filter:
-        query = query.filter(models.Application.status == status_filter)
-    return query.all()
+    criteria = _application_criteria(filters)
+    query = db.query(models.Application).filter(*criteria)
+    if cursor:
+        created_at, application_id = decode_cursor(cursor, (datetime, int))
+        query = query.filter(
+            tuple_(models.Application.created_at, models.Application.id) < tuple_(created_at, application_id)
+        )
+    rows = query.order_by(models.Application.created_at.desc(), models.Application.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor((last.created_at, last.id))
+    total, total_is_estimate = (None, False) if cursor else _count_applications(db, criteria)
+    return {
+        "items": rows[:limit],
+        "next_cursor": next_cursor,
+        "total": total,
+        "total_is_estimate": total_is_estimate,
+    }
+
+
+EXPORT_COLUMNS = [
+    ("ID", models.Application.id),
+    ("Дата", models.Application.created_at),
+    ("Имя", models.Application.name),
+    ("Телефон", models.Application.phone),
+    ("Telegram", models.Application.tg_username),
+    ("Курс", models.Application.course_title),
+    ("Статус", models.Application.status),
+]
+
+
+def _export_rows(criteria: list):
+    # своя сессия: зависимость get_db закрывается до того, как StreamingResponse начнёт отдавать тело
+    db = SessionLocal()
+    try:
+        query = (
+            select(*(column for _, column in EXPORT_COLUMNS))
+            .where(*criteria)
+            .order_by(models.Application.created_at.desc(), models.Application.id.desc())
+        )
+        # yield_per включает серверный курсор на Postgres — строки читаются пачками, а не целиком
+        yield from db.execute(query.execution_options(yield_per=1000))
+    finally:
+        db.close()
+
+
+@router.get("/applications/export")
+# ASGI-middleware slowapi шлёт http.response.start перед каждым куском тела — потоковый ответ на нём падает
+@limiter.exempt
+def export_applications(
+    filters: schemas.ApplicationFilter = Depends(),
+    export_format: str = Query("csv", alias="format", pattern="^(csv|xlsx)$"),
+):
+    criteria = _application_criteria(filters)
+    header = [title for title, _ in EXPORT_COLUMNS]
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    if export_format == "xlsx":
+        body = export.xlsx_chunks(header, _export_rows(criteria), sheet_name="Заявки")
+        media_type = export.XLSX_MEDIA_TYPE
+    else:
+        body = export.csv_chunks(header, _export_rows(criteria))
+        media_type = export.CSV_MEDIA_TYPE
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="applications-{stamp}.{export_format}"'},
+    )
+
+
+@router.post("/applications/bulk", response_model=schemas.ApplicationBulkResult)
+def bulk_applications(payload: schemas.ApplicationBulkRequest, db: Session = Depends(get_db)):
+    if payload.ids is not None:
+        criteria = [models.Application.id.in_(payload.ids)]
+    else:
+        criteria = _application_criteria(payload.filter)
+        if not criteria:
+            # пустой фильтр задел бы все заявки — такое только явным списком id
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Filter must have at least one condition"
+            )
+    # одно UPDATE/DELETE по множеству строк вместо SELECT + UPDATE + refresh на каждую заявку
+    if payload.action == schemas.ApplicationBulkAction.DELETE:
+        statement = delete(models.Application).where(*criteria)
+    else:
+        statement = update(models.Application).where(*criteria).values(status=payload.status.value)
+    result = db.execute(statement.execution_options(synchronize_session=False))
+    db.commit()
+    return {"action": payload.action, "affected": result.rowcount}
 
 
 @router.patch("/applications/{application_id}", response_model=schemas.ApplicationRead)
@@ -114,10 +268,13 @@ def list_teachers_admin(db: Session = Depends(get_db)):
 
 @router.post("/teachers", response_model=schemas.TeacherRead, status_code=status.HTTP_201_CREATED)
 def create_teacher(payload: schemas.TeacherCreate, db: Session = Depends(get_db)):
-    teacher = models.Teacher(**payload.dict())
+    teacher = models.Teacher(**_with_image(db, payload, "photo"))
     db.add(teacher)
     db.commit()
+    response_cache.bump("teachers")
     db.refresh(teacher)
+    if not teacher.photo_variants:
+        derivatives.schedule(teacher.photo_hash)
     return teacher
 
 
@@ -126,10 +283,13 @@ def update_teacher(teacher_id: int, payload: schemas.TeacherCreate, db: Session
     teacher = db.query(models.Teacher).filter(models.Teacher.id == teacher_id).first()
     if not teacher:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Teacher not found")
-    for k, v in payload.dict().items():
+    for k, v in _with_image(db, payload, "photo").items():
         setattr(teacher, k, v)
     db.commit()
+    response_cache.bump("teachers")
     db.refresh(teacher)
+    if not teacher.photo_variants:
+        derivatives.schedule(teacher.photo_hash)
     return teacher
 
 
@@ -140,6 +300,7 @@ def delete_teacher(teacher_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Teacher not found")
     db.delete(teacher)
     db.commit()
+    response_cache.bump("teachers")
     return None
 
 
@@ -154,6 +315,8 @@ def create_track_step(payload: schemas.TrackStepCreate, db: Session = Depends(ge
     step = models.TrackStep(**payload.dict())
     db.add(step)
     db.commit()
+    response_cache.bump("track")
+    prerender.prerender_worker.schedule(prerender.home(step.locale))
     db.refresh(step)
     return step
 
@@ -163,9 +326,12 @@ def update_track_step(step_id: int, payload: schemas.TrackStepCreate, db: Sessio
     step = db.query(models.TrackStep).filter(models.TrackStep.id == step_id).first()
     if not step:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Track step not found")
+    locales = {step.locale, payload.locale}
     for k, v in payload.dict().items():
         setattr(step, k, v)
     db.commit()
+    response_cache.bump("track")
+    prerender.prerender_worker.schedule(*prerender.homes(*locales))
     db.refresh(step)
     return step
 
@@ -175,8 +341,11 @@ def delete_track_step(step_id: int, db: Session = Depends(get_db)):
     step = db.query(models.TrackStep).filter(models.TrackStep.id == step_id).first()
     if not step:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Track step not found")
+    locale = step.locale
     db.delete(step)
     db.commit()
+    response_cache.bump("track")
+    prerender.prerender_worker.schedule(prerender.home(locale))
     return None
 
 
@@ -191,6 +360,8 @@ def create_review(payload: schemas.ReviewCreate, db: Session = Depends(get_db)):
     review = models.Review(**payload.dict())
     db.add(review)
     db.commit()
+    response_cache.bump("reviews")
+    prerender.prerender_worker.schedule(prerender.home(review.locale))
     db.refresh(review)
     return review
 
@@ -200,9 +371,12 @@ def update_review(review_id: int, payload: schemas.ReviewCreate, db: Session = D
     review = db.query(models.Review).filter(models.Review.id == review_id).first()
     if not review:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
+    locales = {review.locale, payload.locale}
     for k, v in payload.dict().items():
         setattr(review, k, v)
     db.commit()
+    response_cache.bump("reviews")
+    prerender.prerender_worker.schedule(*prerender.homes(*locales))
     db.refresh(review)
     return review
 
@@ -212,8 +386,11 @@ def delete_review(review_id: int, db: Session = Depends(get_db)):
     review = db.query(models.Review).filter(models.Review.id == review_id).first()
     if not review:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
+    locale = review.locale
     db.delete(review)
     db.commit()
+    response_cache.bump("reviews")
+    prerender.prerender_worker.schedule(prerender.home(locale))
     return None
 
 
@@ -225,10 +402,14 @@ def list_partners_admin(db: Session = Depends(get_db)):
 
 @router.post("/partners", response_model=schemas.PartnerRead, status_code=status.HTTP_201_CREATED)
 def create_partner(payload: schemas.PartnerCreate, db: Session = Depends(get_db)):
-    partner = models.Partner(**payload.dict())
+    partner = models.Partner(**_with_image(db, payload, "logo"))
     db.add(partner)
     db.commit()
+    response_cache.bump("partners")
+    prerender.prerender_worker.schedule(*prerender.homes())
     db.refresh(partner)
+    if not partner.logo_variants:
+        derivatives.schedule(partner.logo_hash)
     return partner
 
 
@@ -237,10 +418,14 @@ def update_partner(partner_id: int, payload: schemas.PartnerCreate, db: Session
     partner = db.query(models.Partner).filter(models.Partner.id == partner_id).first()
     if not partner:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Partner not found")
-    for k, v in payload.dict().items():
+    for k, v in _with_image(db, payload, "logo").items():
         setattr(partner, k, v)
     db.commit()
+    response_cache.bump("partners")
+    prerender.prerender_worker.schedule(*prerender.homes())
     db.refresh(partner)
+    if not partner.logo_variants:
+        derivatives.schedule(partner.logo_hash)
     return partner
 
 
@@ -251,10 +436,18 @@ def delete_partner(partner_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Partner not found")
     db.delete(partner)
     db.commit()
+    response_cache.bump("partners")
+    prerender.prerender_worker.schedule(*prerender.homes())
     return None
 
 
 # Blog
+def _stamp_published(post: models.BlogPost) -> None:
+    # публичный список листается по (published_at, id), поэтому у опубликованного поста дата обязательна
+    if post.is_published and post.published_at is None:
+        post.published_at = datetime.now(timezone.utc)
+
+
 @router.get("/blog", response_model=List[schemas.BlogPostRead])
 def list_blog_admin(db: Session = Depends(get_db)):
     return db.query(models.BlogPost).order_by(models.BlogPost.created_at.desc()).all()
@@ -264,10 +457,17 @@ def list_blog_admin(db: Session = Depends(get_db)):
 def create_blog_post(payload: schemas.BlogPostCreate, db: Session = Depends(get_db)):
     if db.query(models.BlogPost).filter(models.BlogPost.slug == payload.slug).first():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Slug already exists")
-    post = models.BlogPost(**payload.dict())
+    post = models.BlogPost(**_with_image(db, payload, "cover"))
+    _stamp_published(post)
     db.add(post)
+    db.flush()
+    search.index_rows(db, "blog", [post])
     db.commit()
+    response_cache.bump("blog")
+    prerender.prerender_worker.schedule(*prerender.pages_for("blog", [post]))
     db.refresh(post)
+    if not post.cover_variants:
+        derivatives.schedule(post.cover_hash)
     return post
 
 
@@ -279,10 +479,18 @@ def update_blog_post(post_id: int, payload: schemas.BlogPostCreate, db: Session
     if payload.slug != post.slug:
         if db.query(models.BlogPost).filter(models.BlogPost.slug == payload.slug).first():
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Slug already exists")
-    for k, v in payload.dict().items():
+    stale = prerender.pages_for("blog", [post])
+    for k, v in _with_image(db, payload, "cover").items():
         setattr(post, k, v)
+    _stamp_published(post)
+    search.index_rows(db, "blog", [post])
+    pages = stale + prerender.pages_for("blog", [post])
     db.commit()
+    response_cache.bump("blog")
+    prerender.prerender_worker.schedule(*pages)
     db.refresh(post)
+    if not post.cover_variants:
+        derivatives.schedule(post.cover_hash)
     return post
 
 
@@ -291,8 +499,14 @@ def delete_blog_post(post_id: int, db: Session = Depends(get_db)):
     post = db.query(models.BlogPost).filter(models.BlogPost.id == post_id).first()
     if not post:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+    search.remove(db, "blog", [post.id])
+    # у переводов пропадает ссылка на удалённый язык; после удаления группу уже не найти
+    translations = db.query(models.BlogPost).filter(models.BlogPost.translation_group == post.translation_group)
+    pages = prerender.pages_for("blog", translations.all())
     db.delete(post)
     db.commit()
+    response_cache.bump("blog")
+    prerender.prerender_worker.schedule(*pages)
     return None
 
 
@@ -307,6 +521,7 @@ def create_static_page(payload: schemas.StaticPageCreate, db: Session = Depends(
     page = models.StaticPage(**payload.dict())
     db.add(page)
     db.commit()
+    response_cache.bump("static")
     db.refresh(page)
     return page
 
@@ -319,6 +534,7 @@ def update_static_page(page_id: int, payload: schemas.StaticPageCreate, db: Sess
     for k, v in payload.dict().items():
         setattr(page, k, v)
     db.commit()
+    response_cache.bump("static")
     db.refresh(page)
     return page
 
@@ -330,6 +546,7 @@ def delete_static_page(page_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Page not found")
     db.delete(page)
     db.commit()
+    response_cache.bump("static")
     return None
 
 
@@ -344,6 +561,8 @@ def create_contact(payload: schemas.ContactInfoCreate, db: Session = Depends(get
     contact = models.ContactInfo(**payload.dict())
     db.add(contact)
     db.commit()
+    response_cache.bump("contacts")
+    prerender.prerender_worker.schedule(*prerender.homes())
     db.refresh(contact)
     return contact
 
@@ -356,6 +575,8 @@ def update_contact(contact_id: int, payload: schemas.ContactInfoCreate, db: Sess
     for k, v in payload.dict().items():
         setattr(contact, k, v)
     db.commit()
+    response_cache.bump("contacts")
+    prerender.prerender_worker.schedule(*prerender.homes())
     db.refresh(contact)
     return contact
 
@@ -367,5 +588,13 @@ def delete_contact(contact_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found")
     db.delete(contact)
     db.commit()
+    response_cache.bump("contacts")
+    prerender.prerender_worker.schedule(*prerender.homes())
     return None
 
+
+
+# Cache
+@router.get("/cache/stats")
+def cache_stats():
+    return response_cache.stats()
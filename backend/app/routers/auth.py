@@ -1,26 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from functools import lru_cache
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 
 from ..config import get_settings
 from ..database import get_db
+from ..ratelimit import limiter
 from .. import models
 from ..schemas import LoginRequest, Token
 from ..security import create_access_token
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 settings = get_settings()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+@lru_cache
+def pwd_context():
+    # passlib/bcrypt грузим при первом входе, а не при старте приложения
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 @router.post("/login", response_model=Token)
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
+@limiter.limit(settings.rate_limit_login)
+def login(request: Request, payload: LoginRequest, db: Session = Depends(get_db)):
     # Сначала пробуем найти в БД
     admin = db.query(models.Admin).filter(models.Admin.username == payload.login).first()
 
     if admin and admin.is_active:
         # Проверяем хешированный пароль
-        if pwd_context.verify(payload.password, admin.hashed_password):
+        if pwd_context().verify(payload.password, admin.hashed_password):
             token = create_access_token({"sub": admin.username})
             return {"access_token": token, "token_type": "bearer"}
 
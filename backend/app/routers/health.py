@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+from fastapi import APIRouter, Response, status
+from sqlalchemy import text
+
+from ..config import get_settings
+from ..database import async_engine, engine, pool_status
+from ..ratelimit import limiter
+
+router = APIRouter(prefix="/health", tags=["health"])
+settings = get_settings()
+
+# Последний результат проверки БД: частые пробы балансировщика не ходят в базу каждый раз
+_probe = {"ok": False, "error": None, "latency_ms": None, "checked_at": 0.0}
+_probe_lock = asyncio.Lock()
+
+
+async def _select_one() -> None:
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def _check_database() -> dict:
+    if time.monotonic() - _probe["checked_at"] < settings.health_cache_ttl:
+        return _probe
+    async with _probe_lock:
+        # пока ждали замок, проверку мог сделать другой запрос
+        if time.monotonic() - _probe["checked_at"] < settings.health_cache_ttl:
+            return _probe
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(_select_one(), timeout=settings.db_pool_timeout)
+            _probe.update(ok=True, error=None)
+        except Exception as exc:
+            _probe.update(ok=False, error=f"{type(exc).__name__}: {exc}")
+        _probe.update(latency_ms=round((time.perf_counter() - started) * 1000, 2), checked_at=time.monotonic())
+    return _probe
+
+
+@router.get("/live")
+@limiter.exempt
+async def live():
+    """Liveness: the process is up and serving the event loop; never touches the database."""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+@limiter.exempt
+async def ready(response: Response):
+    """Readiness: cached database probe plus connection pool counters."""
+    probe = await _check_database()
+    if not probe["ok"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "status": "ok" if probe["ok"] else "unavailable",
+        "database": {
+            "connected": probe["ok"],
+            "error": probe["error"],
+            "latency_ms": probe["latency_ms"],
+            "age_s": round(time.monotonic() - probe["checked_at"], 2),
+        },
+        "pool": {"sync": pool_status(engine), "async": pool_status(async_engine)},
+    }
@@ -1,141 +1,450 @@
-from typing import List
+from datetime import datetime
+from functools import partial
+from html import escape
+from typing import Any, Awaitable, Callable, Hashable, List, Sequence, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import case
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import FileResponse
+from pydantic import TypeAdapter
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import models, schemas
-from ..database import get_db
-from ..services.telegram import send_application_message
+from ..config import get_settings
+from ..database import get_async_db
+from ..locales import LOCALES
+from ..pagination import decode_cursor, encode_cursor
+from ..ratelimit import limiter
+from ..services import fastjson
+from ..services import search as search_index
+from ..services.assets import HASH_RE, asset_path
+from ..services.cache import as_utc, http_date, is_not_modified, make_etag, response_cache, shared_cache
+from ..services.content import (
+    HOME_SECTIONS,
+    fetch,
+    locale_filter,
+    query_blog,
+    query_contact,
+    query_courses,
+    query_partners,
+    query_reviews,
+    query_track,
+)
+from ..services.intake import intake_batcher
+from ..services.outbox import enqueue, outbox_worker
 
 router = APIRouter(prefix="/public", tags=["public"])
+settings = get_settings()
 
+Source = Tuple[Any, Tuple[Any, ...]]
 
-def _locale_filter(query, model, locale: str | None):
+# Адаптеры собираются один раз на процесс, а не на каждый запрос
+_course_list = TypeAdapter(List[schemas.CourseRead])
+_course = TypeAdapter(schemas.CourseRead)
+_teacher_list = TypeAdapter(List[schemas.TeacherRead])
+_track_list = TypeAdapter(List[schemas.TrackStepRead])
+_review_list = TypeAdapter(List[schemas.ReviewRead])
+_partner_list = TypeAdapter(List[schemas.PartnerRead])
+_blog_page = TypeAdapter(schemas.BlogPostPage)
+_blog_post = TypeAdapter(schemas.BlogPostRead)
+_static_page = TypeAdapter(schemas.StaticPageRead)
+_contact = TypeAdapter(schemas.ContactInfoRead)
+_home = TypeAdapter(schemas.HomeRead)
+_translations = TypeAdapter(schemas.TranslationList)
+
+# Быстрый путь (JSON_FAST_PATH): списки читаются колонками и кодируются orjson без моделей Pydantic
+_course_rows = fastjson.RowEncoder(schemas.CourseRead)
+_teacher_rows = fastjson.RowEncoder(schemas.TeacherRead)
+_track_rows = fastjson.RowEncoder(schemas.TrackStepRead)
+_review_rows = fastjson.RowEncoder(schemas.ReviewRead)
+_partner_rows = fastjson.RowEncoder(schemas.PartnerRead)
+_blog_rows = fastjson.RowEncoder(schemas.BlogPostSummary, paged=True)
+
+
+def _encode(adapter, data) -> bytes:
+    if isinstance(adapter, fastjson.RowEncoder):
+        return adapter.dump_json(data)
+    return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+
+def _locale(locale: str | None = Query(None, description="One of: " + ", ".join(LOCALES))) -> str | None:
+    # locale входит в ключ кеша: произвольные значения раздували бы его, не находя ни одной строки
+    if locale and locale not in LOCALES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown locale: {locale}")
+    return locale
+
+
+def _scope(model, locale: str | None, *criteria) -> Source:
     if locale:
-        return query.filter(model.locale == locale)
-    return query
+        criteria = (*criteria, model.locale == locale)
+    return model, criteria
+
+
+async def _aggregates(db: AsyncSession, sources: Sequence[Source]) -> List[Tuple[int, Any]]:
+    """
+    (count, max(updated_at)) for every source in one round trip, without loading rows.
+    """
+    selects = [
+        select(
+            literal(position).label("position"),
+            func.count().label("total"),
+            func.max(model.updated_at).label("latest"),
+        )
+        .select_from(model)
+        .where(*criteria)
+        for position, (model, criteria) in enumerate(sources)
+    ]
+    statement = selects[0] if len(selects) == 1 else union_all(*selects)
+    rows = sorted((await db.execute(statement)).all(), key=lambda row: row.position)
+    # с микросекундами: из них строится ETag; Last-Modified округляется до секунд отдельно
+    return [(row.total, as_utc(row.latest, precise=True)) for row in rows]
+
+
+async def _cached(
+    request: Request,
+    db: AsyncSession,
+    key: Hashable,
+    entities: Tuple[str, ...],
+    sources: Sequence[Source],
+    adapter: TypeAdapter | fastjson.RowEncoder,
+    load: Callable[[], Awaitable[Any]],
+    shared: bool = True,
+) -> Response:
+    """
+    Serve serialized JSON from the response cache with ETag/Last-Modified validators.
+    The worker's own cache is checked first, then the shared one in Redis (unless `shared` is off), then the database.
+    A conditional request is answered with 304 from the cached validators or from one aggregate query,
+    rows are loaded and serialized only when the client really needs the body.
+    """
+    entry = response_cache.get(key)
+    generations = None
+    if entry is not None:
+        body, etag, last_modified = entry.body, entry.etag, entry.last_modified
+    else:
+        versions = response_cache.versions(entities)
+        stored, generations = await shared_cache.get(key, entities) if shared else (None, None)
+        if stored is not None:
+            body, etag, last_modified = stored
+            response_cache.set(key, entities, versions, body, etag, last_modified)
+        else:
+            aggregates = await _aggregates(db, sources)
+            etag = make_etag(key, aggregates)
+            latest = [value for _, value in aggregates if value is not None]
+            last_modified = as_utc(max(latest)) if latest else None
+            body = None
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    if is_not_modified(request.headers, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if body is None:
+        body = _encode(adapter, await load())
+        response_cache.set(key, entities, versions, body, etag, last_modified)
+        await shared_cache.set(key, entities, generations, body, etag, last_modified)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.post("/applications", response_model=schemas.ApplicationRead, status_code=status.HTTP_201_CREATED)
-async def create_application(payload: schemas.ApplicationCreate, db: Session = Depends(get_db)):
+@limiter.limit(settings.rate_limit_applications)
+async def create_application(
+    request: Request, payload: schemas.ApplicationCreate, db: AsyncSession = Depends(get_async_db)
+):
     course_obj = None
     if payload.course_id:
-        course_obj = db.query(models.Course).filter(models.Course.id == payload.course_id).first()
+        course_obj = await db.get(models.Course, payload.course_id)
     elif payload.course:
-        course_obj = db.query(models.Course).filter(models.Course.name == payload.course).first()
-
-    application = models.Application(
-        name=payload.name,
-        phone=payload.phone,
-        tg_username=payload.tg_username,
-        course_id=course_obj.id if course_obj else None,
-        course_title=course_obj.name if course_obj else payload.course,
-    )
-    db.add(application)
-    db.commit()
-    db.refresh(application)
+        query = select(models.Course).where(models.Course.name == payload.course).limit(1)
+        course_obj = (await db.scalars(query)).first()
 
+    values = {
+        "name": payload.name,
+        "phone": payload.phone,
+        "tg_username": payload.tg_username,
+        "course_id": course_obj.id if course_obj else None,
+        "course_title": course_obj.name if course_obj else payload.course,
+    }
     message_lines = [
         "Новая заявка",
-        f"Имя: {application.name}",
-        f"Телефон: {application.phone}",
-        f"Telegram: {application.tg_username}",
-        f"Курс: {application.course_title or 'Не указан'}",
+        f"Имя: {escape(values['name'])}",
+        f"Телефон: {escape(values['phone'])}",
+        f"Telegram: {escape(values['tg_username'])}",
+        f"Курс: {escape(values['course_title'] or 'Не указан')}",
     ]
     if course_obj:
         message_lines.extend(
             [
-                f"Длительность: {course_obj.duration or '-'}",
-                f"Уровень: {course_obj.level or '-'}",
-                f"Язык: {course_obj.language or '-'}",
+                f"Длительность: {escape(course_obj.duration or '-')}",
+                f"Уровень: {escape(course_obj.level or '-')}",
+                f"Язык: {escape(course_obj.language or '-')}",
             ]
         )
-    await send_application_message("\n".join(message_lines))
+    text = "\n".join(message_lines)
+
+    if intake_batcher.running:
+        # соединение не держим, пока заявка ждёт общего COMMIT своей пачки
+        await db.close()
+        return await intake_batcher.submit(values, text)
+
+    application = models.Application(**values)
+    db.add(application)
+    # уведомление пишется в той же транзакции, отправляет его фоновый воркер
+    enqueue(db, text)
+    await db.commit()
+    await db.refresh(application)
+    outbox_worker.notify()
 
     return application
 
 
+def _translation_scope(model, slug: str) -> Source:
+    group = select(model.translation_group).where(model.slug == slug).scalar_subquery()
+    return model, (model.translation_group == group,)
+
+
+async def _query_translations(db: AsyncSession, model, title, visible, slug: str, not_found: str) -> dict:
+    """
+    Every site locale with the slug and title of its version of the entry; hidden versions are reported
+    as unavailable without their slug. One query: the group by the unique slug, then the group index.
+    """
+    _, criteria = _translation_scope(model, slug)
+    query = select(model.locale, model.slug, model.translation_group, title.label("title"), visible.label("visible"))
+    rows = (await db.execute(query.where(*criteria))).all()
+    current = next((row for row in rows if row.slug == slug), None)
+    if current is None or not current.visible:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+    versions = {row.locale: row for row in rows if row.visible}
+    items = [
+        {"locale": locale, "slug": versions[locale].slug, "title": versions[locale].title, "available": True}
+        if locale in versions
+        else {"locale": locale, "available": False}
+        for locale in LOCALES
+    ]
+    return {"translation_group": current.translation_group, "items": items}
+
+
+@router.get("/home", response_model=schemas.HomeRead)
+async def get_home(
+    request: Request,
+    locale: str | None = Depends(_locale),
+    sections: str | None = Query(None, description="Comma separated subset of: " + ", ".join(HOME_SECTIONS)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    requested = set(HOME_SECTIONS)
+    if sections:
+        requested = {name.strip() for name in sections.split(",") if name.strip()}
+        if not requested:
+            # «?sections=,» — ни одной секции: агрегатному запросу нечего объединять
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No sections requested")
+        unknown = requested - set(HOME_SECTIONS)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown sections: {', '.join(sorted(unknown))}"
+            )
+    names = tuple(name for name in HOME_SECTIONS if name in requested)
+
+    entities, sources, loaders = [], [], {}
+    for name in names:
+        entity, model, loader, localized = HOME_SECTIONS[name]
+        section_locale = locale if localized else None
+        entities.append(entity)
+        sources.append(_scope(model, section_locale))
+        loaders[name] = partial(loader, db, section_locale)
+
+    async def load():
+        # одна сессия — секции читаются последовательно, AsyncSession не допускает параллельных запросов
+        return {name: await loader() for name, loader in loaders.items()}
+
+    entities = tuple(entities)
+    return await _cached(request, db, ("home", locale, names), entities, sources, _home, load)
+
+
 @router.get("/courses", response_model=List[schemas.CourseRead])
-def list_courses(locale: str | None = Query(None), db: Session = Depends(get_db)):
-    query = db.query(models.Course).filter(models.Course.is_active.is_(True)).order_by(models.Course.created_at.desc())
-    query = _locale_filter(query, models.Course, locale)
-    return query.all()
+async def list_courses(
+    request: Request, locale: str | None = Depends(_locale), db: AsyncSession = Depends(get_async_db)
+):
+    fast = fastjson.enabled()
+    sources = [_scope(models.Course, locale)]
+    load = partial(query_courses, db, locale, fast)
+    adapter = _course_rows if fast else _course_list
+    return await _cached(request, db, ("courses", locale), ("courses",), sources, adapter, load)
 
 
 @router.get("/courses/{slug}", response_model=schemas.CourseRead)
-def get_course(slug: str, locale: str | None = Query(None), db: Session = Depends(get_db)):
-    query = db.query(models.Course).filter(models.Course.slug == slug)
-    query = _locale_filter(query, models.Course, locale)
-    course = query.first()
-    if not course:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
-    return course
+async def get_course(
+    request: Request, slug: str, locale: str | None = Depends(_locale), db: AsyncSession = Depends(get_async_db)
+):
+    async def load():
+        query = select(models.Course).where(models.Course.slug == slug)
+        query = locale_filter(query, models.Course, locale)
+        course = (await db.scalars(query.limit(1))).first()
+        if not course:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+        return course
+
+    sources = [_scope(models.Course, locale, models.Course.slug == slug)]
+    return await _cached(request, db, ("course", locale, slug), ("courses",), sources, _course, load)
+
+
+@router.get("/courses/{slug}/translations", response_model=schemas.TranslationList)
+async def get_course_translations(request: Request, slug: str, db: AsyncSession = Depends(get_async_db)):
+    model = models.Course
+    load = partial(_query_translations, db, model, model.name, model.is_active, slug, "Course not found")
+    sources = [_translation_scope(model, slug)]
+    return await _cached(request, db, ("course_translations", slug), ("courses",), sources, _translations, load)
 
 
 @router.get("/teachers", response_model=List[schemas.TeacherRead])
-def list_teachers(locale: str | None = Query(None), db: Session = Depends(get_db)):
-    query = db.query(models.Teacher).order_by(models.Teacher.created_at.desc())
-    query = _locale_filter(query, models.Teacher, locale)
-    return query.all()
+async def list_teachers(
+    request: Request, locale: str | None = Depends(_locale), db: AsyncSession = Depends(get_async_db)
+):
+    fast = fastjson.enabled()
+
+    async def load():
+        query = select(models.Teacher).order_by(models.Teacher.created_at.desc())
+        return await fetch(db, locale_filter(query, models.Teacher, locale), fast)
+
+    sources = [_scope(models.Teacher, locale)]
+    adapter = _teacher_rows if fast else _teacher_list
+    return await _cached(request, db, ("teachers", locale), ("teachers",), sources, adapter, load)
 
 
 @router.get("/track", response_model=List[schemas.TrackStepRead])
-def list_track(locale: str | None = Query(None), db: Session = Depends(get_db)):
-    query = db.query(models.TrackStep).order_by(models.TrackStep.order.asc())
-    query = _locale_filter(query, models.TrackStep, locale)
-    return query.all()
+async def list_track(
+    request: Request, locale: str | None = Depends(_locale), db: AsyncSession = Depends(get_async_db)
+):
+    fast = fastjson.enabled()
+    sources = [_scope(models.TrackStep, locale)]
+    load = partial(query_track, db, locale, fast)
+    adapter = _track_rows if fast else _track_list
+    return await _cached(request, db, ("track", locale), ("track",), sources, adapter, load)
 
 
 @router.get("/reviews", response_model=List[schemas.ReviewRead])
-def list_reviews(locale: str | None = Query(None), db: Session = Depends(get_db)):
-    query = db.query(models.Review).filter(models.Review.is_visible.is_(True)).order_by(models.Review.created_at.desc())
-    query = _locale_filter(query, models.Review, locale)
-    return query.all()
+async def list_reviews(
+    request: Request, locale: str | None = Depends(_locale), db: AsyncSession = Depends(get_async_db)
+):
+    fast = fastjson.enabled()
+    sources = [_scope(models.Review, locale)]
+    load = partial(query_reviews, db, locale, fast)
+    adapter = _review_rows if fast else _review_list
+    return await _cached(request, db, ("reviews", locale), ("reviews",), sources, adapter, load)
 
 
 @router.get("/partners", response_model=List[schemas.PartnerRead])
-def list_partners(locale: str | None = Query(None), db: Session = Depends(get_db)):
-    query = db.query(models.Partner).order_by(models.Partner.order.asc(), models.Partner.created_at.desc())
-    query = _locale_filter(query, models.Partner, locale)
-    return query.all()
+async def list_partners(
+    request: Request, locale: str | None = Depends(_locale), db: AsyncSession = Depends(get_async_db)
+):
+    fast = fastjson.enabled()
+    sources = [_scope(models.Partner, locale)]
+    load = partial(query_partners, db, locale, fast)
+    adapter = _partner_rows if fast else _partner_list
+    return await _cached(request, db, ("partners", locale), ("partners",), sources, adapter, load)
+
+
+@router.get("/blog", response_model=schemas.BlogPostPage)
+async def list_blog(
+    request: Request,
+    locale: str | None = Depends(_locale),
+    limit: int | None = Query(None, ge=1, le=settings.max_page_size),
+    cursor: str | None = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    limit = limit or settings.default_page_size
+    after = decode_cursor(cursor, (datetime, int)) if cursor else None
 
+    async def load():
+        rows = await query_blog(db, locale, limit + 1, after)
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = encode_cursor((last.published_at, last.id))
+        return {"items": rows[:limit], "next_cursor": next_cursor}
 
-@router.get("/blog", response_model=List[schemas.BlogPostRead])
-def list_blog(locale: str | None = Query(None), db: Session = Depends(get_db)):
-    query = db.query(models.BlogPost).filter(models.BlogPost.is_published.is_(True))
-    nulls_last_order = case((models.BlogPost.published_at.is_(None), 1), else_=0)
-    query = query.order_by(nulls_last_order, models.BlogPost.published_at.desc())
-    query = _locale_filter(query, models.BlogPost, locale)
-    return query.all()
+    sources = [_scope(models.BlogPost, locale)]
+    # строки блога и так выбираются колонками — быстрому пути остаётся только кодирование
+    adapter = _blog_rows if fastjson.enabled() else _blog_page
+    # курсор приходит от клиента: страницы после первой кешируются только в воркере (LRU), Redis ими не засоряется
+    key = ("blog", locale, limit, cursor)
+    return await _cached(request, db, key, ("blog",), sources, adapter, load, shared=cursor is None)
 
 
 @router.get("/blog/{slug}", response_model=schemas.BlogPostRead)
-def get_blog_post(slug: str, locale: str | None = Query(None), db: Session = Depends(get_db)):
-    query = db.query(models.BlogPost).filter(models.BlogPost.slug == slug, models.BlogPost.is_published.is_(True))
-    query = _locale_filter(query, models.BlogPost, locale)
-    post = query.first()
-    if not post:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
-    return post
+async def get_blog_post(
+    request: Request, slug: str, locale: str | None = Depends(_locale), db: AsyncSession = Depends(get_async_db)
+):
+    async def load():
+        query = select(models.BlogPost).where(models.BlogPost.slug == slug, models.BlogPost.is_published.is_(True))
+        query = locale_filter(query, models.BlogPost, locale)
+        post = (await db.scalars(query.limit(1))).first()
+        if not post:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+        return post
+
+    sources = [_scope(models.BlogPost, locale, models.BlogPost.slug == slug)]
+    return await _cached(request, db, ("blog_post", locale, slug), ("blog",), sources, _blog_post, load)
+
+
+@router.get("/blog/{slug}/translations", response_model=schemas.TranslationList)
+async def get_blog_translations(request: Request, slug: str, db: AsyncSession = Depends(get_async_db)):
+    model = models.BlogPost
+    load = partial(_query_translations, db, model, model.title, model.is_published, slug, "Post not found")
+    sources = [_translation_scope(model, slug)]
+    return await _cached(request, db, ("blog_translations", slug), ("blog",), sources, _translations, load)
 
 
 @router.get("/static/{slug}", response_model=schemas.StaticPageRead)
-def get_static(slug: str, locale: str | None = Query(None), db: Session = Depends(get_db)):
-    query = db.query(models.StaticPage).filter(models.StaticPage.slug == slug)
-    query = _locale_filter(query, models.StaticPage, locale)
-    page = query.first()
-    if not page:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Page not found")
-    return page
+async def get_static(
+    request: Request, slug: str, locale: str | None = Depends(_locale), db: AsyncSession = Depends(get_async_db)
+):
+    async def load():
+        query = select(models.StaticPage).where(models.StaticPage.slug == slug)
+        query = locale_filter(query, models.StaticPage, locale)
+        page = (await db.scalars(query.limit(1))).first()
+        if not page:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Page not found")
+        return page
+
+    sources = [_scope(models.StaticPage, locale, models.StaticPage.slug == slug)]
+    return await _cached(request, db, ("static", locale, slug), ("static",), sources, _static_page, load)
 
 
 @router.get("/contacts", response_model=schemas.ContactInfoRead)
-def get_contacts(locale: str | None = Query(None), db: Session = Depends(get_db)):
-    query = db.query(models.ContactInfo).order_by(models.ContactInfo.id.asc())
-    query = _locale_filter(query, models.ContactInfo, locale)
-    contact = query.first()
-    if not contact:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contacts not found")
-    return contact
+async def get_contacts(
+    request: Request, locale: str | None = Depends(_locale), db: AsyncSession = Depends(get_async_db)
+):
+    async def load():
+        contact = await query_contact(db, locale)
+        if not contact:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contacts not found")
+        return contact
+
+    sources = [_scope(models.ContactInfo, locale)]
+    return await _cached(request, db, ("contacts", locale), ("contacts",), sources, _contact, load)
+
+
+@router.get("/search", response_model=schemas.SearchResults)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    locale: str | None = Depends(_locale),
+    limit: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return {"items": await search_index.search(db, q, locale, limit)}
+
 
+@router.get("/assets/{asset_hash}", response_class=FileResponse)
+@limiter.exempt
+async def get_asset(asset_hash: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    if not HASH_RE.match(asset_hash):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found")
+    # содержимое адресуется хешем и никогда не меняется — кешируем навсегда
+    headers = {"ETag": f'"{asset_hash}"', "Cache-Control": "public, max-age=31536000, immutable"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    asset = await db.get(models.Asset, asset_hash)
+    path = asset_path(asset_hash)
+    if not asset or not path.exists():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found")
+    return FileResponse(path, media_type=asset.content_type, headers=headers)
@@ -1,9 +1,11 @@
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional
 import re
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, computed_field, field_validator, model_validator
+
+from .services.assets import asset_url
 
 
 class ApplicationStatus(str, Enum):
@@ -35,6 +37,7 @@ class CourseCreate(CourseBase):
 
 class CourseRead(CourseBase):
     id: int
+    translation_group: str
     created_at: datetime
     updated_at: datetime
 
@@ -83,10 +86,53 @@ class ApplicationRead(BaseModel):
         from_attributes = True
 
 
+class ApplicationFilter(BaseModel):
+    status: Optional[str] = None
+    course_id: Optional[int] = None
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    # префикс телефона или имени
+    q: Optional[str] = Field(None, min_length=1, max_length=100)
+
+
+class ApplicationPage(BaseModel):
+    items: List[ApplicationRead]
+    next_cursor: Optional[str] = None
+    # считается только для первой страницы; без фильтров на Postgres — оценка из статистики
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+
 class ApplicationStatusUpdate(BaseModel):
     status: ApplicationStatus
 
 
+class ApplicationBulkAction(str, Enum):
+    SET_STATUS = "set_status"
+    DELETE = "delete"
+
+
+class ApplicationBulkRequest(BaseModel):
+    action: ApplicationBulkAction
+    status: Optional[ApplicationStatus] = None
+    # либо явный список id, либо фильтр как у списка заявок
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=10000)
+    filter: Optional[ApplicationFilter] = None
+
+    @model_validator(mode='after')
+    def validate_target(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError('Укажите либо ids, либо filter')
+        if self.action == ApplicationBulkAction.SET_STATUS and self.status is None:
+            raise ValueError('Для set_status нужен status')
+        return self
+
+
+class ApplicationBulkResult(BaseModel):
+    action: ApplicationBulkAction
+    affected: int
+
+
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
@@ -97,24 +143,46 @@ class LoginRequest(BaseModel):
     password: str
 
 
+class ImageVariant(BaseModel):
+    hash: str
+    width: int
+    height: int
+
+    @computed_field
+    @property
+    def url(self) -> str:
+        return asset_url(self.hash)
+
+
 # Teachers
 class TeacherBase(BaseModel):
     name: str
     bio: Optional[str] = None
-    photo_base64: Optional[str] = None
     socials: Optional[List[str] | dict] = None
     locale: str = "ru"
 
 
 class TeacherCreate(TeacherBase):
-    pass
+    # новое изображение (base64 / data URL) либо hash уже загруженного, чтобы сохранить его при правке
+    photo_base64: Optional[str] = None
+    photo_hash: Optional[str] = None
 
 
 class TeacherRead(TeacherBase):
     id: int
+    photo_hash: Optional[str] = None
+    photo_width: Optional[int] = None
+    photo_height: Optional[int] = None
+    # thumb / card / full в WebP; появляются после фоновой нарезки
+    photo_variants: Optional[Dict[str, ImageVariant]] = None
     created_at: datetime
     updated_at: datetime
 
+    @computed_field
+    @property
+    def photo_url(self) -> Optional[str]:
+        return asset_url(self.photo_hash)
+
     class Config:
         from_attributes = True
 
@@ -167,20 +235,29 @@ class ReviewRead(ReviewBase):
 class PartnerBase(BaseModel):
     name: str
     url: Optional[str] = None
-    logo_base64: Optional[str] = None
     locale: str = "ru"
     order: int = 0
 
 
 class PartnerCreate(PartnerBase):
-    pass
+    logo_base64: Optional[str] = None
+    logo_hash: Optional[str] = None
 
 
 class PartnerRead(PartnerBase):
     id: int
+    logo_hash: Optional[str] = None
+    logo_width: Optional[int] = None
+    logo_height: Optional[int] = None
+    logo_variants: Optional[Dict[str, ImageVariant]] = None
     created_at: datetime
     updated_at: datetime
 
+    @computed_field
+    @property
+    def logo_url(self) -> Optional[str]:
+        return asset_url(self.logo_hash)
+
     class Config:
         from_attributes = True
 
@@ -191,7 +268,6 @@ class BlogPostBase(BaseModel):
     slug: str
     body: str
     excerpt: Optional[str] = None
-    cover_base64: Optional[str] = None
     locale: str = "ru"
     is_published: bool = False
     published_at: Optional[datetime] = None
@@ -200,18 +276,55 @@ class BlogPostBase(BaseModel):
 
 
 class BlogPostCreate(BlogPostBase):
-    pass
+    cover_base64: Optional[str] = None
+    cover_hash: Optional[str] = None
 
 
 class BlogPostRead(BlogPostBase):
     id: int
+    translation_group: str
+    cover_hash: Optional[str] = None
+    cover_width: Optional[int] = None
+    cover_height: Optional[int] = None
+    cover_variants: Optional[Dict[str, ImageVariant]] = None
     created_at: datetime
     updated_at: datetime
 
+    @computed_field
+    @property
+    def cover_url(self) -> Optional[str]:
+        return asset_url(self.cover_hash)
+
     class Config:
         from_attributes = True
 
 
+class BlogPostSummary(BaseModel):
+    id: int
+    title: str
+    slug: str
+    excerpt: Optional[str] = None
+    locale: str
+    published_at: Optional[datetime] = None
+    cover_hash: Optional[str] = None
+    cover_width: Optional[int] = None
+    cover_height: Optional[int] = None
+    cover_variants: Optional[Dict[str, ImageVariant]] = None
+
+    class Config:
+        from_attributes = True
+
+    @computed_field
+    @property
+    def cover_url(self) -> Optional[str]:
+        return asset_url(self.cover_hash)
+
+
+class BlogPostPage(BaseModel):
+    items: List[BlogPostSummary]
+    next_cursor: Optional[str] = None
+
+
 # Static pages
 class StaticPageBase(BaseModel):
     slug: str
@@ -255,4 +368,42 @@ class ContactInfoRead(ContactInfoBase):
         from_attributes = True
 
 
+# Translations
+class TranslationRead(BaseModel):
+    locale: str
+    # null, если версии на этом языке нет или она скрыта
+    slug: Optional[str] = None
+    title: Optional[str] = None
+    available: bool
+
+
+class TranslationList(BaseModel):
+    translation_group: str
+    items: List[TranslationRead]
+
+
+# Search
+class SearchHit(BaseModel):
+    entity: str  # "course" | "blog"
+    id: int
+    slug: str
+    locale: Optional[str] = None
+    title: str
+    # HTML: текст экранирован, совпадения обёрнуты в <mark>
+    snippet: str
+
+
+class SearchResults(BaseModel):
+    items: List[SearchHit]
+
+
+# Homepage
+class HomeRead(BaseModel):
+    """Sections that were not requested are returned as null."""
 
+    courses: Optional[List[CourseRead]] = None
+    track: Optional[List[TrackStepRead]] = None
+    reviews: Optional[List[ReviewRead]] = None
+    partners: Optional[List[PartnerRead]] = None
+    blog: Optional[List[BlogPostSummary]] = None
+    contacts: Optional[ContactInfoRead] = None
@@ -0,0 +1,104 @@
+import base64
+import binascii
+import hashlib
+import io
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import get_settings
+
+settings = get_settings()
+
+ASSET_URL_PREFIX = "/api/public/assets/"
+HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+CONTENT_TYPES = {
+    "PNG": "image/png",
+    "JPEG": "image/jpeg",
+    "GIF": "image/gif",
+    "WEBP": "image/webp",
+    "BMP": "image/bmp",
+    "ICO": "image/x-icon",
+}
+
+
+class InvalidImage(ValueError):
+    pass
+
+
+def asset_url(asset_hash: str | None) -> str | None:
+    return f"{ASSET_URL_PREFIX}{asset_hash}" if asset_hash else None
+
+
+def asset_path(asset_hash: str) -> Path:
+    # раскладываем по подпапкам, чтобы не держать тысячи файлов в одном каталоге
+    return Path(settings.media_dir) / asset_hash[:2] / asset_hash
+
+
+def decode_base64(data: str) -> bytes:
+    """
+    Accepts raw base64 or a data URL as produced by FileReader.readAsDataURL.
+    """
+    if data.startswith("data:"):
+        data = data.split(",", 1)[-1]
+    try:
+        return base64.b64decode(data, validate=False)
+    except (binascii.Error, ValueError) as exc:
+        raise InvalidImage("Invalid base64 image") from exc
+
+
+def inspect_image(raw: bytes) -> tuple[str, int, int]:
+    # Pillow нужен только при загрузке картинок из админки
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(io.BytesIO(raw)) as image:
+            image_format, (width, height) = image.format, image.size
+    except (UnidentifiedImageError, OSError) as exc:
+        raise InvalidImage("Unsupported image") from exc
+    content_type = CONTENT_TYPES.get(image_format or "")
+    if not content_type:
+        raise InvalidImage(f"Unsupported image format: {image_format}")
+    return content_type, width, height
+
+
+def write_blob(asset_hash: str, raw: bytes) -> None:
+    path = asset_path(asset_hash)
+    if path.exists():
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # пишем во временный файл и переименовываем — читатель никогда не увидит половину файла
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(raw)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def store_bytes(db: Session, raw: bytes) -> models.Asset:
+    """
+    Store image bytes once by content hash; repeated uploads of the same file reuse the row.
+    The caller commits.
+    """
+    content_type, width, height = inspect_image(raw)
+    asset_hash = hashlib.sha256(raw).hexdigest()
+    write_blob(asset_hash, raw)
+    asset = db.get(models.Asset, asset_hash)
+    if asset is None:
+        asset = models.Asset(
+            hash=asset_hash, content_type=content_type, size=len(raw), width=width, height=height
+        )
+        db.add(asset)
+    return asset
+
+
+def store_base64(db: Session, data: str) -> models.Asset:
+    return store_bytes(db, decode_base64(data))
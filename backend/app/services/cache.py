@@ -0,0 +1,393 @@
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Hashable, Iterable, Sequence, Tuple
+
+from redis.exceptions import RedisError
+
+from ..config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedEntry:
+    body: bytes
+    etag: str
+    last_modified: datetime | None
+    entities: Tuple[str, ...]
+    versions: Tuple[int, ...]
+    expires_at: float
+
+
+class ResponseCache:
+    """
+    Per-worker cache of already-serialized public responses.
+
+    Every entry remembers the content versions of the entity types it was built from;
+    admin writes bump the version of one entity type, which drops only its entries.
+    Versions live in process memory: without the shared cache relaying bumps, TTL bounds staleness between workers.
+    At most `max_entries` responses are kept, least recently used go first; expired ones are swept once per TTL.
+    """
+
+    def __init__(self, ttl: float, enabled: bool = True, max_entries: int = 2000) -> None:
+        self.ttl = ttl
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._versions: dict[str, int] = defaultdict(int)
+        self._entries: OrderedDict[Hashable, CachedEntry] = OrderedDict()
+        self._next_sweep = time.monotonic() + ttl
+        # общий кеш в Redis (SharedCache): через него bump доходит до остальных воркеров
+        self.shared: "SharedCache | None" = None
+
+    def versions(self, entities: Iterable[str]) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self._versions[entity] for entity in entities)
+
+    def get(self, key: Hashable) -> CachedEntry | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                current = tuple(self._versions[entity] for entity in entry.entities)
+                if current == entry.versions and entry.expires_at > time.monotonic():
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    return entry
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(
+        self,
+        key: Hashable,
+        entities: Tuple[str, ...],
+        versions: Tuple[int, ...],
+        body: bytes,
+        etag: str,
+        last_modified: datetime | None,
+    ) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            # версия могла смениться, пока строили ответ — тогда не кешируем устаревшие данные
+            if tuple(self._versions[entity] for entity in entities) != versions:
+                return
+            now = time.monotonic()
+            self._entries[key] = CachedEntry(body, etag, last_modified, entities, versions, now + self.ttl)
+            self._entries.move_to_end(key)
+            if now >= self._next_sweep:
+                # просроченные записи иначе удаляются, только когда их ключ запросят снова
+                for stale in [cached for cached, entry in self._entries.items() if entry.expires_at <= now]:
+                    del self._entries[stale]
+                self._next_sweep = now + self.ttl
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def bump(self, *entities: str) -> None:
+        """Drop entries of these entity types here and, with the shared cache on, in every worker."""
+        self.bump_local(*entities)
+        if self.shared is not None:
+            self.shared.invalidate(entities)
+
+    def bump_local(self, *entities: str) -> None:
+        with self._lock:
+            for entity in entities:
+                self._versions[entity] += 1
+            stale = [key for key, entry in self._entries.items() if set(entry.entities) & set(entities)]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            stats = {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "evictions": self.evictions,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "versions": dict(self._versions),
+            }
+        if self.shared is not None:
+            stats["shared"] = self.shared.stats()
+        return stats
+
+
+class SharedCache:
+    """
+    Second-level cache of serialized public responses in Redis, shared by all workers and hosts.
+
+    An entry lives in the namespace of its first entity type ("pubcache:courses:<digest>") and stores
+    the generations of all entity types it was built from. A write INCRs their generations and publishes
+    the names, so every worker drops its local entries as well. On any Redis error the cache steps aside
+    for `retry_after` seconds and requests go to the database.
+    """
+
+    prefix = "pubcache"
+
+    def __init__(self, local: ResponseCache, url: str, ttl: float, enabled: bool = True, retry_after: float = 5.0):
+        self.local = local
+        self.url = url
+        self.ttl = ttl
+        self.enabled = enabled
+        self.retry_after = retry_after
+        self.channel = f"{self.prefix}:invalidate"
+        # свои сообщения об инвалидации воркер уже применил локально
+        self.origin = uuid.uuid4().hex
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._client = None
+        self._sync_client = None
+        self._task: asyncio.Task | None = None
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+        # сущности, чью инвалидацию не удалось отправить: досылаются при переподключении
+        self._pending: set[str] = set()
+
+    @property
+    def available(self) -> bool:
+        return self._client is not None and time.monotonic() >= self._down_until
+
+    def start(self, client=None, sync_client=None) -> None:
+        """Connect and subscribe to invalidations; clients can be passed in (e.g. an in-process fake)."""
+        if not self.enabled or self._task is not None:
+            return
+        if client is None:
+            from redis import Redis
+            from redis.asyncio import Redis as AsyncRedis
+
+            options = {"socket_connect_timeout": 0.5, "socket_timeout": 0.5, "health_check_interval": 30}
+            client = AsyncRedis.from_url(self.url, **options)
+            sync_client = Redis.from_url(self.url, **options)
+        self._client, self._sync_client = client, sync_client
+        self._down_until = 0.0
+        self._task = asyncio.create_task(self._listen(), name="public-cache-invalidation")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        client, sync_client = self._client, self._sync_client
+        self._client = self._sync_client = None
+        if client is not None:
+            await client.aclose()
+            sync_client.close()
+
+    def _key(self, key: Hashable, entities: Tuple[str, ...]) -> str:
+        # repr ключа одинаков во всех процессах: в ключах только строки, числа и None
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return f"{self.prefix}:{entities[0]}:{digest}"
+
+    def _generation_keys(self, entities: Iterable[str]) -> list[str]:
+        return [f"{self.prefix}:{entity}:generation" for entity in entities]
+
+    def _failed(self, exc: Exception) -> None:
+        if time.monotonic() >= self._down_until:
+            logger.warning("Shared cache: Redis unavailable (%s), using the database for %ss", exc, self.retry_after)
+        self.errors += 1
+        self._down_until = time.monotonic() + self.retry_after
+
+    async def get(
+        self, key: Hashable, entities: Tuple[str, ...]
+    ) -> Tuple[Tuple[bytes, str, datetime | None] | None, Tuple[int, ...] | None]:
+        """
+        ((body, etag, last_modified) or None, generations) in one round trip.
+        Generations are None when Redis is not used; `set` then stores nothing.
+        """
+        if not self.available:
+            return None, None
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                pipe.mget(self._generation_keys(entities))
+                pipe.get(self._key(key, entities))
+                generations, raw = await pipe.execute()
+        except RedisError as exc:
+            self._failed(exc)
+            return None, None
+        generations = tuple(int(generation or 0) for generation in generations)
+        if raw is not None:
+            header, _, body = raw.partition(b"\n")
+            meta = json.loads(header)
+            # запись собрана до последней правки одной из сущностей — это промах
+            if tuple(meta["generations"]) == generations:
+                self.hits += 1
+                last_modified = datetime.fromisoformat(meta["last_modified"]) if meta["last_modified"] else None
+                return (body, meta["etag"], last_modified), generations
+        self.misses += 1
+        return None, generations
+
+    async def set(
+        self,
+        key: Hashable,
+        entities: Tuple[str, ...],
+        generations: Tuple[int, ...] | None,
+        body: bytes,
+        etag: str,
+        last_modified: datetime | None,
+    ) -> None:
+        if generations is None or not self.available:
+            return
+        meta = {
+            "etag": etag,
+            "last_modified": last_modified.isoformat() if last_modified else None,
+            "generations": list(generations),
+        }
+        try:
+            await self._client.set(
+                self._key(key, entities), json.dumps(meta).encode() + b"\n" + body, px=int(self.ttl * 1000)
+            )
+        except RedisError as exc:
+            self._failed(exc)
+
+    def _invalidation(self, pipe, entities: Sequence[str]):
+        # INCR и PUBLISH в одной транзакции: к моменту сообщения старые записи уже не читаются
+        for generation_key in self._generation_keys(entities):
+            pipe.incr(generation_key)
+        pipe.publish(self.channel, f"{self.origin} {','.join(entities)}")
+        return pipe
+
+    def invalidate(self, entities: Iterable[str]) -> None:
+        """Called from sync code (admin handlers, image callbacks) after the write is committed."""
+        if self._sync_client is None:
+            return
+        with self._lock:
+            self._pending.update(entities)
+            entities = sorted(self._pending)
+        if not self.available:
+            return
+        try:
+            self._invalidation(self._sync_client.pipeline(), entities).execute()
+        except RedisError as exc:
+            self._failed(exc)
+            return
+        with self._lock:
+            self._pending.difference_update(entities)
+
+    async def _flush_pending(self) -> None:
+        with self._lock:
+            entities = sorted(self._pending)
+        if entities:
+            await self._invalidation(self._client.pipeline(), entities).execute()
+            with self._lock:
+                self._pending.difference_update(entities)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self._client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    await self._flush_pending()
+                    # пока подписки не было, чужие сообщения могли потеряться
+                    self.local.clear()
+                    self._down_until = 0.0
+                    while True:
+                        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=5.0)
+                        if message is None:
+                            if self._pending:
+                                await self._flush_pending()
+                            continue
+                        origin, _, entities = message["data"].decode().partition(" ")
+                        if origin != self.origin and entities:
+                            self.local.bump_local(*entities.split(","))
+            except RedisError as exc:
+                self._failed(exc)
+                await asyncio.sleep(self.retry_after)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "available": self.available,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "errors": self.errors,
+            "pending_invalidations": sorted(self._pending),
+        }
+
+
+def make_etag(key: Hashable, aggregates: Sequence[Tuple[int, datetime | None]]) -> str:
+    """
+    Strong ETag from (row count, max updated_at) of every source the response is built from.
+    The count catches deletes, max(updated_at) catches inserts and edits; updated_at must keep its
+    microseconds, or two edits within one second would share an ETag.
+    """
+    state = "|".join(f"{count}:{latest.isoformat() if latest else '-'}" for count, latest in aggregates)
+    digest = hashlib.sha1(f"{key!r}|{state}".encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def as_utc(value: datetime | None, precise: bool = False) -> datetime | None:
+    """Aware UTC datetime; whole seconds (HTTP-date precision) unless `precise`."""
+    if value is None:
+        return None
+    # SQLite отдаёт naive datetime, все даты в БД пишутся в UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    value = value.astimezone(timezone.utc)
+    return value if precise else value.replace(microsecond=0)
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value, usegmt=True)
+
+
+def is_not_modified(headers, etag: str, last_modified: datetime | None) -> bool:
+    """
+    RFC 9110 precedence: If-None-Match wins, If-Modified-Since is only checked without it.
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified <= since
+    return False
+
+
+response_cache = ResponseCache(
+    ttl=settings.public_cache_ttl,
+    enabled=settings.public_cache_enabled,
+    max_entries=settings.public_cache_max_entries,
+)
+shared_cache = SharedCache(
+    response_cache,
+    url=settings.redis_url,
+    ttl=settings.public_cache_shared_ttl,
+    enabled=settings.public_cache_enabled and settings.public_cache_shared,
+)
+response_cache.shared = shared_cache
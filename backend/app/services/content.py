@@ -0,0 +1,90 @@
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..config import get_settings
+
+settings = get_settings()
+
+
+async def fetch(db: AsyncSession, query, rows: bool = False):
+    """
+    ORM objects of the query's entity, or with `rows` plain row mappings of its table columns
+    (no identity map, no attribute instrumentation).
+    """
+    if not rows:
+        return (await db.scalars(query)).all()
+    table = query.column_descriptions[0]["entity"].__table__
+    return (await db.execute(query.with_only_columns(*table.columns))).mappings().all()
+
+
+def locale_filter(query, model, locale: str | None):
+    if locale:
+        return query.filter(model.locale == locale)
+    return query
+
+
+async def query_courses(db: AsyncSession, locale: str | None, rows: bool = False):
+    query = select(models.Course).where(models.Course.is_active.is_(True)).order_by(models.Course.created_at.desc())
+    return await fetch(db, locale_filter(query, models.Course, locale), rows)
+
+
+async def query_track(db: AsyncSession, locale: str | None, rows: bool = False):
+    query = select(models.TrackStep).order_by(models.TrackStep.order.asc())
+    return await fetch(db, locale_filter(query, models.TrackStep, locale), rows)
+
+
+async def query_reviews(db: AsyncSession, locale: str | None, rows: bool = False):
+    query = select(models.Review).where(models.Review.is_visible.is_(True)).order_by(models.Review.created_at.desc())
+    return await fetch(db, locale_filter(query, models.Review, locale), rows)
+
+
+async def query_partners(db: AsyncSession, locale: str | None, rows: bool = False):
+    query = select(models.Partner).order_by(models.Partner.order.asc(), models.Partner.created_at.desc())
+    return await fetch(db, locale_filter(query, models.Partner, locale), rows)
+
+
+# Только колонки карточки блога: размер списка не зависит от длины body
+BLOG_SUMMARY_COLUMNS = (
+    models.BlogPost.id,
+    models.BlogPost.title,
+    models.BlogPost.slug,
+    models.BlogPost.excerpt,
+    models.BlogPost.locale,
+    models.BlogPost.published_at,
+    models.BlogPost.cover_hash,
+    models.BlogPost.cover_width,
+    models.BlogPost.cover_height,
+    models.BlogPost.cover_variants,
+)
+
+
+async def query_blog(db: AsyncSession, locale: str | None, limit: int | None = None, after: list | None = None):
+    """
+    Published post summaries in (published_at, id) descending keyset order.
+    """
+    query = select(*BLOG_SUMMARY_COLUMNS).where(
+        models.BlogPost.is_published.is_(True), models.BlogPost.published_at.isnot(None)
+    )
+    query = locale_filter(query, models.BlogPost, locale)
+    if after:
+        query = query.where(tuple_(models.BlogPost.published_at, models.BlogPost.id) < tuple_(*after))
+    query = query.order_by(models.BlogPost.published_at.desc(), models.BlogPost.id.desc())
+    return (await db.execute(query.limit(limit or settings.default_page_size))).all()
+
+
+async def query_contact(db: AsyncSession, locale: str | None):
+    query = select(models.ContactInfo).order_by(models.ContactInfo.id.asc())
+    return (await db.scalars(locale_filter(query, models.ContactInfo, locale).limit(1))).first()
+
+
+# Секции главной: сущность кеша, модель, загрузчик и учитывается ли locale.
+# Партнёры и контакты главная всегда запрашивала без locale — поведение сохраняем.
+HOME_SECTIONS = {
+    "courses": ("courses", models.Course, query_courses, True),
+    "track": ("track", models.TrackStep, query_track, True),
+    "reviews": ("reviews", models.Review, query_reviews, True),
+    "partners": ("partners", models.Partner, query_partners, False),
+    "blog": ("blog", models.BlogPost, query_blog, True),
+    "contacts": ("contacts", models.ContactInfo, query_contact, False),
+}
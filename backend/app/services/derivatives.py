@@ -0,0 +1,180 @@
+import argparse
+import hashlib
+import io
+import logging
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import get_settings
+from ..database import SessionLocal
+from . import prerender
+from .assets import asset_path, write_blob
+from .cache import response_cache
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Максимальная сторона каждого варианта; меньшие исходники не увеличиваем
+VARIANT_SIZES = {"thumb": 160, "card": 640, "full": 1600}
+WEBP_QUALITY = 80
+
+# (модель, префикс колонок, сущность кеша) — где могут использоваться изображения
+IMAGE_OWNERS = [
+    (models.Teacher, "photo", "teachers"),
+    (models.Partner, "logo", "partners"),
+    (models.BlogPost, "cover", "blog"),
+]
+
+_executor: ProcessPoolExecutor | None = None
+_pending: set[str] = set()
+_lock = threading.Lock()
+
+
+def render_variants(asset_hash: str) -> dict:
+    """
+    Runs in a worker process: resize the original into every variant, store each as its own WebP blob.
+    Returns {name: {hash, width, height, size}}.
+    """
+    from PIL import Image, ImageOps
+
+    variants = {}
+    with Image.open(asset_path(asset_hash)) as source:
+        image = ImageOps.exif_transpose(source)
+        has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+        image = image.convert("RGBA" if has_alpha else "RGB")
+        for name, size in VARIANT_SIZES.items():
+            resized = image.copy()
+            resized.thumbnail((size, size), Image.LANCZOS)
+            buffer = io.BytesIO()
+            resized.save(buffer, "WEBP", quality=WEBP_QUALITY, method=4)
+            raw = buffer.getvalue()
+            variant_hash = hashlib.sha256(raw).hexdigest()
+            write_blob(variant_hash, raw)
+            variants[name] = {"hash": variant_hash, "width": resized.width, "height": resized.height, "size": len(raw)}
+    return variants
+
+
+def save_variants(db: Session, asset_hash: str, variants: dict) -> set[str]:
+    """
+    Register variant blobs as assets and copy the variant map onto every row using the original.
+    Returns the cache entities that changed.
+    """
+    # маленький исходник даёт одинаковые варианты — регистрируем каждый blob один раз
+    unique = {variant["hash"]: variant for variant in variants.values()}
+    for variant in unique.values():
+        if db.get(models.Asset, variant["hash"]) is None:
+            db.add(
+                models.Asset(
+                    hash=variant["hash"],
+                    content_type="image/webp",
+                    size=variant["size"],
+                    width=variant["width"],
+                    height=variant["height"],
+                )
+            )
+    public = {name: {k: v[k] for k in ("hash", "width", "height")} for name, v in variants.items()}
+    asset = db.get(models.Asset, asset_hash)
+    if asset is not None:
+        asset.variants = public
+    changed = set()
+    for model, prefix, entity in IMAGE_OWNERS:
+        result = db.execute(
+            update(model)
+            .where(getattr(model, f"{prefix}_hash") == asset_hash)
+            .values({f"{prefix}_variants": public})
+        )
+        if result.rowcount:
+            changed.add(entity)
+    db.commit()
+    return changed
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=settings.image_workers)
+        return _executor
+
+
+def pages_using(db: Session, asset_hash: str, changed: set[str]) -> list[prerender.Page]:
+    """
+    Prerendered pages that show the image: posts with this cover (their own page and the home of their locale),
+    every home for a partner logo. Teachers are not prerendered, courses have no images.
+    """
+    pages = []
+    if "blog" in changed:
+        posts = db.query(models.BlogPost.locale, models.BlogPost.slug).filter(models.BlogPost.cover_hash == asset_hash)
+        pages += prerender.pages_for("blog", posts)
+    if "partners" in changed:
+        pages += prerender.homes()
+    return pages
+
+
+def _on_done(asset_hash: str, future: Future) -> None:
+    try:
+        variants = future.result()
+        db = SessionLocal()
+        try:
+            changed = save_variants(db, asset_hash, variants)
+            pages = pages_using(db, asset_hash, changed)
+        finally:
+            db.close()
+        if changed:
+            response_cache.bump(*changed)
+            prerender.prerender_worker.schedule(*pages)
+    except Exception:
+        logger.exception("Image variants failed for %s", asset_hash)
+    finally:
+        with _lock:
+            _pending.discard(asset_hash)
+
+
+def schedule(asset_hash: str | None) -> None:
+    """
+    Queue variant rendering for an uploaded original; returns immediately.
+    """
+    if not asset_hash or not settings.image_variants_enabled:
+        return
+    with _lock:
+        if asset_hash in _pending:
+            return
+        _pending.add(asset_hash)
+    future = _get_executor().submit(render_variants, asset_hash)
+    future.add_done_callback(lambda done: _on_done(asset_hash, done))
+
+
+def shutdown() -> None:
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def main() -> None:
+    """Render variants synchronously for every original that has none yet (e.g. after migration)."""
+    parser = argparse.ArgumentParser(description="Render missing image variants")
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        hashes = set()
+        for model, prefix, _ in IMAGE_OWNERS:
+            column = getattr(model, f"{prefix}_hash")
+            rows = db.query(column).filter(column.isnot(None), getattr(model, f"{prefix}_variants").is_(None))
+            hashes.update(value for (value,) in rows)
+        for asset_hash in sorted(hashes)[: args.limit]:
+            save_variants(db, asset_hash, render_variants(asset_hash))
+            print(asset_hash)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+from typing import Any, Iterable
+
+from pydantic import BaseModel
+
+from ..config import get_settings
+from .assets import asset_url
+
+try:
+    import orjson
+except ImportError:  # необязательная зависимость: без неё работает обычный путь через Pydantic
+    orjson = None
+
+settings = get_settings()
+
+
+def enabled() -> bool:
+    return settings.json_fast_path and orjson is not None
+
+
+class RowEncoder:
+    """
+    JSON for rows of a flat Read schema straight from row mappings: no model instances, no validation pass.
+    Computed `<image>_url` fields and variant URLs are filled in the same way the schema computes them.
+    With `paged` the input is a page dict whose "items" are the rows.
+    """
+
+    def __init__(self, schema: type[BaseModel], paged: bool = False) -> None:
+        self.fields = tuple(schema.model_fields)
+        self.images = tuple(name[: -len("_url")] for name in schema.model_computed_fields if name.endswith("_url"))
+        unsupported = set(schema.model_computed_fields) - {f"{prefix}_url" for prefix in self.images}
+        unsupported |= {f"{prefix}_hash" for prefix in self.images} - set(self.fields)
+        if unsupported:
+            # новое вычисляемое поле в схеме нужно поддержать и здесь, иначе ответы разойдутся
+            raise TypeError(f"{schema.__name__}: unsupported fields {sorted(unsupported)}")
+        self.paged = paged
+
+    def row(self, item: Any) -> dict:
+        # Row из select(колонки) и RowMapping из .mappings() — оба дают доступ по имени колонки
+        mapping = getattr(item, "_mapping", item)
+        data = {name: mapping[name] for name in self.fields}
+        for prefix in self.images:
+            data[f"{prefix}_url"] = asset_url(data[f"{prefix}_hash"])
+            variants = data.get(f"{prefix}_variants")
+            if variants:
+                data[f"{prefix}_variants"] = {
+                    name: {
+                        "hash": variant["hash"],
+                        "width": variant["width"],
+                        "height": variant["height"],
+                        "url": asset_url(variant["hash"]),
+                    }
+                    for name, variant in variants.items()
+                }
+        return data
+
+    def rows(self, items: Iterable[Any]) -> list[dict]:
+        return [self.row(item) for item in items]
+
+    def dump_json(self, data: Any) -> bytes:
+        if self.paged:
+            return orjson.dumps({**data, "items": self.rows(data["items"])})
+        return orjson.dumps(self.rows(data))
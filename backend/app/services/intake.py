@@ -0,0 +1,142 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from .. import models
+from ..config import get_settings
+from ..database import AsyncSessionLocal
+from .outbox import enqueue_many, outbox_worker
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Pending:
+    values: dict
+    text: str
+    future: asyncio.Future
+
+
+class ApplicationBatcher:
+    """
+    Group commit for application intake: requests that arrive within one window are written
+    as one multi-row INSERT ... RETURNING (plus their outbox rows) in one transaction.
+    A request is answered only after the COMMIT of its batch, so durability is the same as
+    committing every application on its own.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        window: float = 0.005,
+        max_batch: int = 200,
+    ) -> None:
+        self.session_factory = session_factory
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.applications = 0
+        self._queue: list[_Pending] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._stopping
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="application-intake")
+
+    async def stop(self) -> None:
+        """Write what is already queued, then stop; new requests go the per-request path meanwhile."""
+        task = self._task
+        if task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await task
+        self._task = None
+
+    async def submit(self, values: dict, text: str) -> dict:
+        """
+        Queue one application with its notification text; returns the inserted row.
+        After `stop` nobody drains the queue: the application is then written on its own.
+        """
+        future = asyncio.get_running_loop().create_future()
+        if not self.running:
+            # запрос проверил running до остановки батчера (create_application закрывает сессию между ними)
+            (row,) = await self._write([_Pending(values, text, future)])
+            outbox_worker.notify()
+            return row
+        self._queue.append(_Pending(values, text, future))
+        self._wakeup.set()
+        # shield: отключившийся клиент не отменяет запись, которая уже в очереди
+        return await asyncio.shield(future)
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if len(self._queue) < self.max_batch and not self._stopping:
+                # окно: заявки, пришедшие за эти миллисекунды, уходят тем же коммитом
+                await asyncio.sleep(self.window)
+            while self._queue:
+                batch, self._queue = self._queue[: self.max_batch], self._queue[self.max_batch :]
+                await self._flush(batch)
+            if self._stopping:
+                return
+
+    async def _flush(self, batch: list[_Pending]) -> None:
+        try:
+            rows = await self._write(batch)
+        except Exception:
+            if len(batch) == 1:
+                logger.exception("Application intake failed")
+                _resolve(batch[0].future, error=RuntimeError("Application was not saved"))
+                return
+            # одна плохая строка не должна ронять всю пачку — пишем по одной
+            logger.warning("Application batch of %s failed, retrying one by one", len(batch), exc_info=True)
+            for pending in batch:
+                await self._flush([pending])
+            return
+        self.batches += 1
+        self.applications += len(rows)
+        for pending, row in zip(batch, rows):
+            _resolve(pending.future, row)
+        outbox_worker.notify()
+
+    async def _write(self, batch: list[_Pending]) -> list[dict]:
+        table = models.Application.__table__
+        async with self.session_factory() as db:
+            # sort_by_parameter_order: строки RETURNING в порядке заявок, даже если INSERT разбит на части
+            result = await db.execute(
+                insert(table).returning(*table.columns, sort_by_parameter_order=True),
+                [pending.values for pending in batch],
+            )
+            rows = [dict(row) for row in result.mappings()]
+            await enqueue_many(db, [pending.text for pending in batch])
+            await db.commit()
+        return rows
+
+
+def _resolve(future: asyncio.Future, row: dict | None = None, error: Exception | None = None) -> None:
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(row)
+
+
+intake_batcher = ApplicationBatcher(
+    window=settings.application_batch_window_ms / 1000,
+    max_batch=settings.application_batch_max,
+)
@@ -0,0 +1,131 @@
+import bisect
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+# Метрики живут в памяти процесса: при нескольких воркерах uvicorn каждый отдаёт свои.
+# Границы бакетов в секундах: от быстрых кешированных ответов до медленных экспортов
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+
+
+# Статистика SQL текущего запроса; заполняется событиями движка в database.py
+current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+
+def record_query(seconds: float) -> None:
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += seconds
+
+
+class Histogram:
+    def __init__(self, buckets: tuple) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = defaultdict(int)
+        self.in_progress = 0
+        self.latency = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+        self.db_time = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+        self.db_queries = defaultdict(lambda: Histogram(QUERY_COUNT_BUCKETS))
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: QueryStats) -> None:
+        with self._lock:
+            self.requests[(method, route, status)] += 1
+            self.latency[(method, route)].observe(seconds)
+            self.db_time[(method, route)].observe(stats.seconds)
+            self.db_queries[(method, route)].observe(stats.count)
+
+    def render(self) -> str:
+        with self._lock:
+            lines = [
+                "# HELP http_requests_total Handled HTTP requests.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route, status), value in sorted(self.requests.items()):
+                lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {value}")
+            lines += [
+                "# HELP http_requests_in_progress Requests currently being handled.",
+                "# TYPE http_requests_in_progress gauge",
+                f"http_requests_in_progress {self.in_progress}",
+            ]
+            for name, help_text, histograms in (
+                ("http_request_duration_seconds", "Request latency including serialization.", self.latency),
+                ("http_request_db_seconds", "Time spent in SQL statements per request.", self.db_time),
+                ("http_request_db_queries", "SQL statements executed per request.", self.db_queries),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (method, route), histogram in sorted(histograms.items()):
+                    cumulative = 0
+                    for bound, count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+                        cumulative += count
+                        labels = _labels(method=method, route=route, le=bound)
+                        lines.append(f"{name}_bucket{labels} {cumulative}")
+                    labels = _labels(method=method, route=route)
+                    lines.append(f"{name}_sum{labels} {histogram.total:.6f}")
+                    lines.append(f"{name}_count{labels} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware: times each HTTP request and attributes SQL statements to its route template.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        registry.in_progress += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            registry.in_progress -= 1
+            current_query_stats.reset(token)
+            # шаблон пути ("/api/public/courses/{slug}"), а не сам путь — иначе метки не ограничены
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            registry.observe(scope["method"], route, status_code, time.perf_counter() - started, stats)
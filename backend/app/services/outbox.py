@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
+
+from .. import models
+from ..config import get_settings
+from ..database import AsyncSessionLocal
+from . import telegram
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Сколько строка принадлежит воркеру, который её взял; после — её может забрать другой процесс.
+# Продлевается перед отправкой каждого сообщения, поэтому должна покрывать одну отправку (таймаут клиента 5 + 10 с)
+LEASE = timedelta(seconds=60)
+
+
+def _now() -> datetime:
+    # колонки DateTime без таймзоны, храним UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def enqueue(db, text: str, channel: str = "telegram") -> models.NotificationOutbox:
+    """
+    Add a notification to the caller's transaction; it is sent only if that transaction commits.
+    """
+    message = models.NotificationOutbox(channel=channel, payload={"text": text}, next_attempt_at=_now())
+    db.add(message)
+    return message
+
+
+async def enqueue_many(db: AsyncSession, texts: list[str], channel: str = "telegram") -> None:
+    """
+    Same as `enqueue` for a batch of notifications, as one multi-row INSERT in the caller's transaction.
+    """
+    now = _now()
+    await db.execute(
+        insert(models.NotificationOutbox),
+        [{"channel": channel, "payload": {"text": text}, "next_attempt_at": now} for text in texts],
+    )
+
+
+def backoff(attempts: int) -> float:
+    delay = min(settings.outbox_backoff_max, settings.outbox_backoff_base * 2 ** (attempts - 1))
+    # разброс, чтобы после сбоя Telegram очередь не повторялась одной пачкой
+    return delay * random.uniform(0.8, 1.2)
+
+
+class OutboxWorker:
+    """
+    Drains notification_outbox with a single pooled HTTP client.
+    Delivery is at-least-once: a row is marked sent only after Telegram accepted it.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker = AsyncSessionLocal) -> None:
+        self.session_factory = session_factory
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._client = None
+
+    def notify(self) -> None:
+        """Wake the worker right after a commit instead of waiting for the next poll."""
+        self._wakeup.set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._client = telegram.make_client()
+            self._task = asyncio.create_task(self._run(), name="notification-outbox")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                sent = await self.drain()
+            except Exception:
+                logger.exception("Outbox drain failed")
+                sent = 0
+            if sent:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.outbox_poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def drain(self) -> int:
+        """
+        Process one batch of due messages; returns how many were handled.
+        """
+        async with self.session_factory() as db:
+            claimed = await self._claim(db)
+            for message in claimed:
+                # пачка отправляется дольше одной аренды — продлеваем её перед каждым сообщением;
+                # если строку уже забрал другой воркер (наша аренда истекла), не шлём её второй раз
+                if await self._lease(db, message, message.next_attempt_at):
+                    await db.commit()
+                    await self._deliver(db, message)
+            return len(claimed)
+
+    async def _lease(self, db: AsyncSession, message: models.NotificationOutbox, expected) -> bool:
+        """
+        Conditional UPDATE of next_attempt_at: succeeds only while the row still holds `expected`,
+        so exactly one worker owns it. Updates `message.next_attempt_at` to the new lease.
+        """
+        until = _now() + LEASE
+        result = await db.execute(
+            update(models.NotificationOutbox)
+            .where(
+                models.NotificationOutbox.id == message.id,
+                models.NotificationOutbox.next_attempt_at == expected,
+            )
+            .values(next_attempt_at=until)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            return False
+        set_committed_value(message, "next_attempt_at", until)
+        return True
+
+    async def _claim(self, db: AsyncSession) -> list[models.NotificationOutbox]:
+        now = _now()
+        due = (
+            await db.scalars(
+                select(models.NotificationOutbox)
+                .where(models.NotificationOutbox.next_attempt_at <= now)
+                .order_by(models.NotificationOutbox.next_attempt_at, models.NotificationOutbox.id)
+                .limit(settings.outbox_batch_size)
+            )
+        ).all()
+        # условный UPDATE: строку забирает только один из воркеров (по процессу на uvicorn worker)
+        claimed = [message for message in due if await self._lease(db, message, message.next_attempt_at)]
+        await db.commit()
+        return claimed
+
+    async def _deliver(self, db: AsyncSession, message: models.NotificationOutbox) -> None:
+        attempts = message.attempts + 1
+        try:
+            await telegram.send_message(self._client, message.payload["text"])
+        except Exception as exc:
+            # любая ошибка (не только ответ Telegram, но и битый payload) — это попытка: иначе строка
+            # повторялась бы вечно и держала очередь за собой
+            if isinstance(exc, telegram.TelegramError):
+                permanent, retry_after, error = exc.permanent, exc.retry_after, str(exc)
+            else:
+                permanent, retry_after, error = False, None, f"{type(exc).__name__}: {exc}"
+            give_up = permanent or attempts >= settings.outbox_max_attempts
+            delay = retry_after if retry_after is not None else backoff(attempts)
+            values = {
+                "attempts": attempts,
+                "last_error": error,
+                "next_attempt_at": None if give_up else _now() + timedelta(seconds=delay),
+            }
+            if give_up:
+                logger.error("Outbox message %s dropped after %s attempts: %s", message.id, attempts, error)
+            elif isinstance(exc, telegram.TelegramError):
+                logger.warning("Outbox message %s failed (attempt %s), retry in %.1fs: %s", message.id, attempts, delay, error)
+            else:
+                logger.exception("Outbox message %s failed (attempt %s), retry in %.1fs", message.id, attempts, delay)
+        else:
+            values = {"attempts": attempts, "last_error": None, "next_attempt_at": None, "sent_at": _now()}
+        await db.execute(
+            update(models.NotificationOutbox)
+            .where(models.NotificationOutbox.id == message.id)
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+
+outbox_worker = OutboxWorker()
@@ -0,0 +1,512 @@
+import argparse
+import asyncio
+import html
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from .. import models, schemas
+from ..config import get_settings
+from ..database import AsyncSessionLocal, async_engine
+from ..locales import LOCALES
+from .content import HOME_SECTIONS
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# (вид страницы, локаль, slug): ("home", "ru", None), ("course", "en", "python-en"), ("blog", "uz", "news-uz")
+Page = Tuple[str, str, str | None]
+
+SECTION_DIRS = {"course": "courses", "blog": "blog"}
+# slug становится именем каталога — ничего, кроме букв, цифр, "_" и "-"
+_SAFE_SLUG = re.compile(r"^[\w-]+$")
+DATE_FORMATS = {"ru": "%d.%m.%Y", "uz": "%d.%m.%Y", "en": "%m/%d/%Y", "ja": "%Y/%m/%d"}
+
+_I18N_TEXT = re.compile(r'(<(\w+)\b[^>]*\bdata-i18n="(\w+)"[^>]*>)([^<]*)(</\2>)')
+_I18N_PLACEHOLDER = re.compile(r'<[^>]*\bdata-i18n-placeholder="(\w+)"[^>]*>')
+_LANG_BUTTON = re.compile(r'class="([^"]*)"(\s+data-lang="(\w+)")')
+_LOCAL_LINK = re.compile(r'\b(src|href)="(?:\./)?([\w.-]+\.(?:css|js|html))"')
+
+
+def home(locale: str) -> Page:
+    return ("home", locale, None)
+
+
+def homes(*locales: str) -> list[Page]:
+    """Home pages of the given locales, of every locale when none are given."""
+    return [home(locale) for locale in locales or LOCALES]
+
+
+def pages_for(kind: str, rows: Iterable) -> list[Page]:
+    """
+    Pages that show the given courses/blog posts: their own page and the home page of their locale.
+    Collect them before a delete or a slug change, the worker removes pages whose row is gone.
+    """
+    pages = []
+    for row in rows:
+        pages += [home(row.locale), (kind, row.locale, row.slug)]
+    return pages
+
+
+def page_path(root: Path, page: Page) -> Path | None:
+    kind, locale, slug = page
+    if locale not in LOCALES:
+        return None
+    if kind == "home":
+        return root / locale / "index.html"
+    if not slug or not _SAFE_SLUG.match(slug):
+        return None
+    return root / locale / SECTION_DIRS[kind] / slug / "index.html"
+
+
+def page_url(page: Page) -> str:
+    kind, locale, slug = page
+    if kind == "home":
+        return f"/{locale}/"
+    return f"/{locale}/{SECTION_DIRS[kind]}/{slug}/"
+
+
+# Templates: the same shells the browser gets, filled in place
+def load_templates() -> dict:
+    source = Path(settings.prerender_template_dir)
+    i18n = (source / "i18n.js").read_text(encoding="utf-8")
+    # i18n.js — ES-модуль, но сам объект записан строгим JSON
+    strings = json.loads(i18n.split("export const i18n =", 1)[1].strip().rstrip(";"))
+    return {
+        "index": (source / "index.html").read_text(encoding="utf-8"),
+        "post": (source / "blog.html").read_text(encoding="utf-8"),
+        "i18n": strings,
+    }
+
+
+def _e(value) -> str:
+    return html.escape("" if value is None else str(value))
+
+
+def _fill(document: str, element_id: str, inner: str) -> str:
+    pattern = re.compile(rf'(<(\w+)\b[^>]*\bid="{re.escape(element_id)}"[^>]*>)(.*?)(</\2>)', re.S)
+    return pattern.sub(lambda match: match.group(1) + inner + match.group(4), document, count=1)
+
+
+def _translate(document: str, strings: dict) -> str:
+    def text(match):
+        value = strings.get(match.group(3))
+        return match.group(1) + (_e(value) if value else match.group(4)) + match.group(5)
+
+    def placeholder(match):
+        value = strings.get(match.group(1))
+        if not value:
+            return match.group(0)
+        return re.sub(r'placeholder="[^"]*"', lambda _: f'placeholder="{_e(value)}"', match.group(0))
+
+    document = _I18N_TEXT.sub(text, document)
+    return _I18N_PLACEHOLDER.sub(placeholder, document)
+
+
+def _page(document: str, locale: str, title: str, description: str | None, data: dict) -> str:
+    """
+    Locale-specific head, root-relative asset links (the page lives at /<locale>/...) and the embedded data.
+    """
+    def lang_button(match):
+        classes = [name for name in match.group(1).split() if name != "active"]
+        if match.group(3) == locale:
+            classes.append("active")
+        return f'class="{" ".join(classes)}"{match.group(2)}'
+
+    def local_link(match):
+        target = f"/{locale}/" if match.group(2) == "index.html" else f"/{match.group(2)}"
+        return f'{match.group(1)}="{target}"'
+
+    document = re.sub(r'<html lang="[^"]*"', f'<html lang="{locale}"', document, count=1)
+    head = f"<title>{_e(title)}</title>"
+    if description:
+        head += f'\n  <meta name="description" content="{_e(description)}" />'
+    document = re.sub(r"<title>.*?</title>", lambda _: head, document, count=1, flags=re.S)
+    document = _LANG_BUTTON.sub(lang_button, document)
+    document = _LOCAL_LINK.sub(local_link, document)
+    # "</" внутри строк JSON закрыл бы тег script раньше времени
+    payload = json.dumps({"locale": locale, **data}, ensure_ascii=False).replace("</", "<\\/")
+    script = f"<script>window.__PRERENDERED__ = {payload}</script>\n  "
+    return document.replace('<script type="module"', script + '<script type="module"', 1)
+
+
+# Home sections, the same markup as main.js renders
+def _courses_html(courses: list, strings: dict) -> str:
+    if not courses:
+        return f'<p class="text-slate-500">{_e(strings["empty_courses"])}</p>'
+    cards = []
+    for course in courses:
+        url = page_url(("course", course["locale"], course["slug"]))
+        badge = "bg-emerald-100 text-emerald-700" if course["is_active"] else "bg-slate-100 text-slate-500"
+        status = strings["course_active"] if course["is_active"] else strings["course_hidden"]
+        advantages = "".join(
+            f'<li class="flex gap-2 items-start"><span class="text-primary-500">•</span>{_e(item)}</li>'
+            for item in course["advantages"] or []
+        )
+        cards.append(
+            f"""
+      <article class="glass rounded-2xl p-5 shadow-md border border-slate-100 bg-white/90 reveal">
+        <div>
+          <div class="flex items-start justify-between gap-3 mb-2">
+            <div>
+              <h3 class="text-xl font-semibold text-slate-900"><a href="{_e(url)}" class="hover:text-primary-600">{_e(course["name"])}</a></h3>
+              <p class="text-sm text-slate-500">{_e(course["language"])} · {_e(course["level"])}</p>
+            </div>
+            <span class="px-2 py-1 text-xs rounded {badge}">{_e(status)}</span>
+          </div>
+          <div class="flex gap-2 text-sm text-slate-700 mb-2">
+            <span class="px-3 py-1 bg-primary-50 text-primary-700 rounded-full">{_e(course["price"])}</span>
+            <span class="px-3 py-1 bg-slate-100 text-slate-700 rounded-full">{_e(course["duration"])}</span>
+          </div>
+          <p class="text-sm text-slate-600 mb-3">{_e(course["description"])}</p>
+          <ul class="text-sm text-slate-700 space-y-1">{advantages}</ul>
+        </div>
+        <button class="btn-primary w-full mt-3" data-choose-course="{_e(course["name"])}">{_e(strings["btn_choose"])}</button>
+      </article>"""
+        )
+    return "".join(cards)
+
+
+def _track_html(steps: list, strings: dict) -> str:
+    if not steps:
+        return f'<p class="text-slate-500">{_e(strings["empty_track"])}</p>'
+    return "".join(
+        f"""
+      <div class="glass rounded-2xl p-5 border border-slate-100 bg-white/90 reveal">
+        <div class="text-primary-600 font-semibold mb-1">#{_e(step["order"] or 0)}</div>
+        <div class="text-lg font-semibold text-slate-900 mb-2">{_e(step["title"])}</div>
+        <p class="text-sm text-slate-600">{_e(step["body"])}</p>
+      </div>"""
+        for step in steps
+    )
+
+
+def _reviews_html(reviews: list, strings: dict) -> str:
+    if not reviews:
+        return f'<p class="text-slate-500">{_e(strings["empty_reviews"])}</p>'
+    return "".join(
+        f"""
+      <article class="glass rounded-2xl p-5 border border-slate-100 bg-white/90 reveal">
+        <p class="text-slate-700 italic">“{_e(review["quote"])}”</p>
+        <div class="mt-3 font-semibold text-slate-900">{_e(review["name"])}</div>
+        <div class="text-sm text-slate-500">{_e(review["role"])}</div>
+      </article>"""
+        for review in reviews
+    )
+
+
+def _blog_html(posts: list, strings: dict, locale: str) -> str:
+    if not posts:
+        return f'<p class="text-slate-500">{_e(strings["empty_blog"])}</p>'
+    cards = []
+    # карточка кликабельна целиком через растянутую ссылку: без onclick адрес не попадает в JS-строку
+    for post in posts:
+        url = page_url(("blog", post["locale"], post["slug"]))
+        published = post["published_at"]
+        date = datetime.fromisoformat(published).strftime(DATE_FORMATS.get(locale, "%Y-%m-%d")) if published else ""
+        cards.append(
+            f"""
+      <article class="relative glass rounded-2xl p-5 border border-slate-100 bg-white/90 reveal">
+        <div class="text-xs text-primary-600 mb-1">{_e(post["locale"])}</div>
+        <h3 class="text-lg font-semibold text-slate-900">
+          <a href="{_e(url)}" class="hover:text-primary-600 after:absolute after:inset-0">{_e(post["title"])}</a>
+        </h3>
+        <p class="text-sm text-slate-600 mb-2">{_e(post["excerpt"])}</p>
+        <div class="text-xs text-slate-500">{_e(date)}</div>
+      </article>"""
+        )
+    return "".join(cards)
+
+
+def _partners_html(partners: list, strings: dict) -> str:
+    if not partners:
+        return f'<div class="text-slate-500 px-4 py-2">{_e(strings["empty_partners"])}</div>'
+    items = []
+    for partner in partners:
+        thumb = (partner["logo_variants"] or {}).get("thumb") or {}
+        image = ""
+        if partner["logo_url"]:
+            width = thumb.get("width") or partner["logo_width"]
+            height = thumb.get("height") or partner["logo_height"]
+            image = (
+                f'<img src="{_e(thumb.get("url") or partner["logo_url"])}" alt="{_e(partner["name"])}" '
+                f'width="{_e(width)}" height="{_e(height)}" loading="lazy" '
+                'style="max-height: 80px; width:auto; object-fit:contain; margin:0 auto;" />'
+            )
+        items.append(f'<div class="partner-card">{image}</div>')
+    return "".join(items)
+
+
+def _contacts_html(contact: dict | None, strings: dict) -> str:
+    if not contact:
+        return f'<p class="text-slate-500">{_e(strings["empty_contacts"])}</p>'
+    socials = contact["socials"]
+    if isinstance(socials, dict):
+        socials = ", ".join(f"{key}: {value}" for key, value in socials.items())
+    rows = [
+        (strings["contact_address"], contact["address"]),
+        (strings["contact_phone"], contact["phone"]),
+        (strings["contact_email"], contact["email"]),
+        (strings["contact_socials"], socials),
+    ]
+    return "".join(f"\n    <div><strong>{_e(label)}:</strong> {_e(value or '—')}</div>" for label, value in rows)
+
+
+def _course_options(courses: list, strings: dict) -> str:
+    options = [f'<option value="">{_e(strings["ph_course"])}</option>']
+    options += [
+        f'<option value="{_e(course["name"])}">{_e(course["name"])}</option>' for course in courses if course["is_active"]
+    ]
+    return "".join(options)
+
+
+def render_home(templates: dict, locale: str, data: dict) -> str:
+    """Home page of one locale from the /api/public/home payload."""
+    strings = templates["i18n"].get(locale) or templates["i18n"]["ru"]
+    courses = data["courses"] or []
+    document = _translate(templates["index"], strings)
+    document = _fill(document, "courses-list", _courses_html(courses, strings))
+    document = _fill(document, "course-select", _course_options(courses, strings))
+    document = _fill(document, "track-list", _track_html(data["track"] or [], strings))
+    document = _fill(document, "reviews-list", _reviews_html(data["reviews"] or [], strings))
+    document = _fill(document, "blog-list", _blog_html(data["blog"] or [], strings, locale))
+    partners = _partners_html(data["partners"] or [], strings)
+    document = _fill(document, "partners-track", partners)
+    document = _fill(document, "partners-track2", partners if data["partners"] else "")
+    document = _fill(document, "contacts-card", _contacts_html(data["contacts"], strings))
+    title = f"{strings['hero_title']} — Educational Center"
+    return _page(document, locale, title, strings.get("hero_subtitle"), {"home": data})
+
+
+def _entry(templates: dict, locale: str, section: str, meta: str, title: str, excerpt: str, body: str) -> str:
+    strings = templates["i18n"].get(locale) or templates["i18n"]["ru"]
+    document = _fill(templates["post"], "post-section", _e(strings[section]))
+    document = _fill(document, "post-meta", _e(meta))
+    document = _fill(document, "post-title", _e(title))
+    document = _fill(document, "post-excerpt", _e(excerpt))
+    return _fill(document, "post-body", body)
+
+
+def render_post(templates: dict, post: dict, translations: dict) -> str:
+    locale = post["locale"]
+    strings = templates["i18n"].get(locale) or templates["i18n"]["ru"]
+    # тело поста — HTML из редактора, blog.js тоже вставляет его как есть
+    meta = f"{locale.upper()} · {strings['post_published']}"
+    document = _entry(templates, locale, "nav_blog", meta, post["title"], post["excerpt"], post["body"])
+    description = post["seo_description"] or post["excerpt"]
+    return _page(document, locale, post["seo_title"] or post["title"], description, {"translations": translations})
+
+
+def render_course(templates: dict, course: dict, translations: dict) -> str:
+    locale = course["locale"]
+    strings = templates["i18n"].get(locale) or templates["i18n"]["ru"]
+    chips = "".join(
+        f'<span class="px-3 py-1 bg-primary-50 text-primary-700 rounded-full">{_e(value)}</span>'
+        for value in (course["price"], course["discount"], course["duration"])
+        if value
+    )
+    advantages = "".join(
+        f'<li class="flex gap-2 items-start"><span class="text-primary-500">•</span>{_e(item)}</li>'
+        for item in course["advantages"] or []
+    )
+    body = (
+        f'<div class="flex flex-wrap gap-2 text-sm mb-4">{chips}</div>'
+        f'<ul class="space-y-1 mb-6">{advantages}</ul>'
+        f'<a href="/{locale}/#apply" class="btn-primary">{_e(strings["cta_apply"])}</a>'
+    )
+    meta = " · ".join(value for value in (course["language"], course["level"]) if value)
+    document = _entry(templates, locale, "nav_courses", meta, course["name"], course["description"], body)
+    return _page(document, locale, course["name"], course["description"], {"translations": translations})
+
+
+# Data: the same queries and schemas as the public API
+_ENTRY_MODELS = {
+    "course": (models.Course, models.Course.is_active, schemas.CourseRead),
+    "blog": (models.BlogPost, models.BlogPost.is_published, schemas.BlogPostRead),
+}
+
+
+async def load_home(db: AsyncSession, locale: str) -> dict:
+    data = {}
+    for name, (_, _, loader, localized) in HOME_SECTIONS.items():
+        data[name] = await loader(db, locale if localized else None)
+    return schemas.HomeRead.model_validate(data, from_attributes=True).model_dump(mode="json")
+
+
+async def _siblings(db: AsyncSession, kind: str, slug: str, visible_only: bool) -> list[Tuple[str, str]]:
+    """(locale, slug) of every translation of the entry, the entry itself included."""
+    model, visible, _ = _ENTRY_MODELS[kind]
+    group = select(model.translation_group).where(model.slug == slug).scalar_subquery()
+    query = select(model.locale, model.slug).where(model.translation_group == group)
+    if visible_only:
+        query = query.where(visible.is_(True))
+    return (await db.execute(query)).all()
+
+
+async def _render(db: AsyncSession, templates: dict, page: Page) -> str | None:
+    """Document for the page, or None when it should not exist (hidden, unpublished or deleted)."""
+    kind, locale, slug = page
+    if kind == "home":
+        return render_home(templates, locale, await load_home(db, locale))
+    model, visible, schema = _ENTRY_MODELS[kind]
+    row = (
+        await db.scalars(select(model).where(model.slug == slug, model.locale == locale, visible.is_(True)).limit(1))
+    ).first()
+    if row is None:
+        return None
+    entry = schema.model_validate(row).model_dump(mode="json")
+    translations = {}
+    for sibling_locale, sibling_slug in await _siblings(db, kind, slug, visible_only=True):
+        translations.setdefault(sibling_locale, page_url((kind, sibling_locale, sibling_slug)))
+    render = render_course if kind == "course" else render_post
+    return render(templates, entry, translations)
+
+
+def _write(path: Path, document: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # nginx не должен увидеть наполовину записанный файл
+    descriptor, temporary = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+    with os.fdopen(descriptor, "w", encoding="utf-8") as handle:
+        handle.write(document)
+    os.chmod(temporary, 0o644)
+    os.replace(temporary, path)
+
+
+def _remove(path: Path) -> None:
+    path.unlink(missing_ok=True)
+    try:
+        path.parent.rmdir()
+    except OSError:
+        pass
+
+
+async def render_pages(db: AsyncSession, pages: Iterable[Page], root: Path | None = None) -> int:
+    """
+    Write (or remove) the given pages; course and blog pages pull in their translations,
+    whose language links change with them. Returns how many pages were written.
+    """
+    root = root or Path(settings.prerender_dir)
+    pages = set(pages)
+    for kind, _, slug in list(pages):
+        if kind != "home" and slug:
+            pages.update((kind, locale, sibling) for locale, sibling in await _siblings(db, kind, slug, False))
+    templates = load_templates()
+    written = 0
+    for page in sorted(pages, key=lambda page: (page[0], page[1], page[2] or "")):
+        path = page_path(root, page)
+        if path is None:
+            continue
+        document = await _render(db, templates, page)
+        if document is None:
+            _remove(path)
+        else:
+            _write(path, document)
+            written += 1
+    return written
+
+
+async def rebuild(session_factory: async_sessionmaker = AsyncSessionLocal) -> int:
+    """Render every page from scratch and delete pages of entries that no longer exist."""
+    root = Path(settings.prerender_dir)
+    async with session_factory() as db:
+        pages = homes()
+        for kind, (model, visible, _) in _ENTRY_MODELS.items():
+            rows = await db.execute(select(model.locale, model.slug).where(visible.is_(True), model.locale.in_(LOCALES)))
+            pages += [(kind, locale, slug) for locale, slug in rows.all()]
+        written = await render_pages(db, pages, root)
+    keep = {page_path(root, page) for page in pages}
+    for locale in LOCALES:
+        for section in SECTION_DIRS.values():
+            for path in (root / locale / section).glob("*/index.html"):
+                if path not in keep:
+                    _remove(path)
+    return written
+
+
+class PrerenderWorker:
+    """
+    Regenerates pages touched by admin writes in the background, one batch at a time.
+    Pages scheduled while a batch renders are coalesced into the next one.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker = AsyncSessionLocal) -> None:
+        self.session_factory = session_factory
+        self._pending: set[Page] = set()
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    def schedule(self, *pages: Page) -> None:
+        """Thread-safe: admin handlers run in the thread pool."""
+        if self._task is None:
+            return
+        with self._lock:
+            self._pending.update(pages)
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            # цикл уже закрыт — приложение останавливается
+            pass
+
+    def start(self) -> None:
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="prerender")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            with self._lock:
+                pages, self._pending = self._pending, set()
+            if not pages:
+                continue
+            try:
+                async with self.session_factory() as db:
+                    written = await render_pages(db, pages)
+                logger.info("Prerendered %s of %s scheduled pages", written, len(pages))
+            except Exception:
+                # страницы не теряются насовсем: полная пересборка (CLI) их восстановит
+                logger.exception("Prerender failed for %s pages", len(pages))
+
+
+prerender_worker = PrerenderWorker()
+
+
+def main() -> None:
+    """Full rebuild of the prerendered pages."""
+    argparse.ArgumentParser(description="Render every public page into PRERENDER_DIR").parse_args()
+    if not settings.prerender_dir:
+        raise SystemExit("PRERENDER_DIR is not set")
+
+    async def run() -> int:
+        try:
+            return await rebuild()
+        finally:
+            await async_engine.dispose()
+
+    print(f"rendered {asyncio.run(run())} pages into {settings.prerender_dir}")
+
+
+if __name__ == "__main__":
+    main()
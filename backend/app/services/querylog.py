@@ -0,0 +1,136 @@
+import logging
+import re
+import time
+import traceback
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ..config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+APP_DIR = str(Path(__file__).resolve().parent.parent)
+# слушатель событий, middleware и этот модуль в стеке неинтересны
+SKIP_FILES = {
+    str(Path(__file__).resolve()),
+    str(Path(APP_DIR) / "database.py"),
+    str(Path(APP_DIR) / "services" / "metrics.py"),
+}
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"\?|%\(\w+\)s|%s|\$\d+|:\w+")
+_IN_LIST = re.compile(r"IN \((?:\?, )*\?\)", re.IGNORECASE)
+
+
+def normalize(statement: str) -> str:
+    """
+    Reduce a statement to its shape: literals and every placeholder style become ?, IN lists collapse.
+    """
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _STRING.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _PLACEHOLDER.sub("?", shape)
+    return _IN_LIST.sub("IN (...)", shape)
+
+
+@dataclass
+class StatementStats:
+    count: int = 0
+    seconds: float = 0.0
+    origin: list[str] = field(default_factory=list)
+
+
+@dataclass
+class RequestLog:
+    statements: dict[str, StatementStats] = field(default_factory=dict)
+    total: int = 0
+    seconds: float = 0.0
+
+
+current_log: ContextVar[RequestLog | None] = ContextVar("current_query_log", default=None)
+
+
+def _app_frames(frames) -> list[str]:
+    return [
+        f"{Path(frame.filename).relative_to(Path(APP_DIR).parent)}:{frame.lineno} in {frame.name}"
+        for frame in frames
+        if frame.filename.startswith(APP_DIR) and frame.filename not in SKIP_FILES
+    ]
+
+
+def _origin() -> list[str]:
+    origin = _app_frames(traceback.extract_stack())
+    if not origin:
+        # AsyncSession выполняет SQL в дочернем greenlet — код приложения лежит в стеке родителя
+        try:
+            import greenlet
+
+            parent = greenlet.getcurrent().parent
+            if parent is not None and parent.gr_frame is not None:
+                origin = _app_frames(traceback.extract_stack(parent.gr_frame))
+        except ImportError:
+            pass
+    return origin[-settings.query_log_stack_depth:]
+
+
+def record(statement: str, seconds: float) -> None:
+    log = current_log.get()
+    if log is None:
+        return
+    shape = normalize(statement)
+    stats = log.statements.get(shape)
+    if stats is None:
+        # стек снимаем один раз на форму запроса — этого хватает, чтобы найти источник
+        stats = log.statements[shape] = StatementStats(origin=_origin())
+    stats.count += 1
+    stats.seconds += seconds
+    log.total += 1
+    log.seconds += seconds
+
+
+def report(method: str, path: str, elapsed: float, log: RequestLog) -> str | None:
+    """
+    Text report when the request crossed a threshold, otherwise None.
+    """
+    threshold = settings.query_log_repeat_threshold
+    repeated = {shape for shape, stats in log.statements.items() if stats.count >= threshold}
+    too_many = log.total >= settings.query_log_max_queries
+    too_slow = elapsed * 1000 >= settings.query_log_slow_ms
+    if not (repeated or too_many or too_slow):
+        return None
+    lines = [
+        f"{method} {path}: {log.total} statements, {log.seconds * 1000:.1f} ms in SQL, {elapsed * 1000:.1f} ms total",
+    ]
+    for shape, stats in sorted(log.statements.items(), key=lambda item: item[1].seconds, reverse=True):
+        marker = "  [suspected N+1]" if shape in repeated else ""
+        lines.append(f"  x{stats.count} {stats.seconds * 1000:.1f} ms{marker}: {shape}")
+        lines.extend(f"      at {frame}" for frame in stats.origin)
+    return "\n".join(lines)
+
+
+class QueryLogMiddleware:
+    """
+    Opt-in ASGI middleware: logs requests that run too many or too slow statements, or repeat one shape.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        log = RequestLog()
+        token = current_log.set(log)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_log.reset(token)
+            text = report(scope["method"], scope["path"], time.perf_counter() - started, log)
+            if text:
+                logger.warning(text)
@@ -0,0 +1,140 @@
+import argparse
+import html
+import re
+from typing import Iterable
+
+from sqlalchemy import delete, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..database import SessionLocal
+
+# Маркеры подсветки: СУБД вставляет их в фрагмент, мы экранируем текст и превращаем их в <mark>
+MARK_START, MARK_END = "⟦", "⟧"
+MAX_TERMS = 8
+
+_TAG = re.compile(r"<[^>]+>")
+_SPACES = re.compile(r"\s+")
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def plain_text(*parts: str | None) -> str:
+    # тело поста может прийти из редактора с HTML — в индекс кладём только текст
+    joined = " ".join(html.unescape(_TAG.sub(" ", part)) for part in parts if part)
+    return _SPACES.sub(" ", joined).strip()
+
+
+def _document(entity: str, row) -> dict | None:
+    if entity == "course":
+        if not row.is_active:
+            return None
+        return {"title": row.name, "body": plain_text(row.description)}
+    if not row.is_published:
+        return None
+    return {"title": row.title, "body": plain_text(row.excerpt, row.body)}
+
+
+def index_rows(db: Session, entity: str, rows: Iterable) -> None:
+    """
+    Replace the search documents of the given courses/blog posts; hidden rows are dropped from the index.
+    The caller commits, so the index changes in the same transaction as the content.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    remove(db, entity, [row.id for row in rows])
+    for row in rows:
+        document = _document(entity, row)
+        if document is not None:
+            db.add(models.SearchDocument(entity=entity, entity_id=row.id, locale=row.locale, slug=row.slug, **document))
+
+
+def remove(db: Session, entity: str, ids: Iterable[int]) -> None:
+    ids = list(ids)
+    if ids:
+        db.execute(
+            delete(models.SearchDocument).where(
+                models.SearchDocument.entity == entity, models.SearchDocument.entity_id.in_(ids)
+            )
+        )
+        # новые документы с теми же (entity, entity_id) вставляются в этой же сессии
+        db.flush()
+
+
+def terms(query: str) -> list[str]:
+    return _TERM.findall(query.lower())[:MAX_TERMS]
+
+
+_SQLITE_SEARCH = text(
+    f"""
+    SELECT d.entity, d.entity_id AS id, d.slug, d.locale, d.title,
+           snippet(search_documents_fts, -1, '{MARK_START}', '{MARK_END}', '…', 24) AS snippet
+    FROM search_documents_fts
+    JOIN search_documents AS d ON d.id = search_documents_fts.rowid
+    WHERE search_documents_fts MATCH :query AND (:locale IS NULL OR d.locale = :locale)
+    ORDER BY bm25(search_documents_fts, 5.0, 1.0)
+    LIMIT :limit
+    """
+)
+
+# WHERE повторяет выражение GIN-индекса дословно, иначе Postgres его не использует
+_POSTGRES_SEARCH = text(
+    f"""
+    SELECT d.entity, d.entity_id AS id, d.slug, d.locale, d.title,
+           ts_headline('simple', coalesce(d.body, ''), q.query,
+                       'StartSel={MARK_START}, StopSel={MARK_END}, MaxWords=35, MinWords=15, MaxFragments=2') AS snippet
+    FROM search_documents AS d, to_tsquery('simple', :query) AS q(query)
+    WHERE to_tsvector('simple', coalesce(d.title, '') || ' ' || coalesce(d.body, '')) @@ q.query
+      AND (CAST(:locale AS varchar) IS NULL OR d.locale = :locale)
+    ORDER BY ts_rank_cd(
+        setweight(to_tsvector('simple', coalesce(d.title, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(d.body, '')), 'D'),
+        q.query
+    ) DESC
+    LIMIT :limit
+    """
+)
+
+
+def _highlight(snippet: str | None) -> str:
+    escaped = html.escape(snippet or "")
+    return escaped.replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+
+
+async def search(db: AsyncSession, query: str, locale: str | None, limit: int) -> list[dict]:
+    """
+    Ranked matches for every word of the query (prefix match on each word); snippets are HTML-safe.
+    """
+    words = terms(query)
+    if not words:
+        return []
+    if db.bind.dialect.name == "postgresql":
+        statement, match = _POSTGRES_SEARCH, " & ".join(f"{word}:*" for word in words)
+    else:
+        statement, match = _SQLITE_SEARCH, " ".join(f'"{word}"*' for word in words)
+    result = await db.execute(statement, {"query": match, "locale": locale, "limit": limit})
+    return [{**row, "snippet": _highlight(row["snippet"])} for row in result.mappings()]
+
+
+def reindex(db: Session) -> int:
+    db.execute(delete(models.SearchDocument))
+    db.flush()
+    index_rows(db, "course", db.query(models.Course).all())
+    index_rows(db, "blog", db.query(models.BlogPost).all())
+    db.commit()
+    return db.query(models.SearchDocument).count()
+
+
+def main() -> None:
+    """Rebuild the search index from courses and blog posts."""
+    argparse.ArgumentParser(description="Rebuild the full-text search index").parse_args()
+    db = SessionLocal()
+    try:
+        print(f"indexed {reindex(db)} documents")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,59 @@
 import logging
-
-import httpx
+from typing import TYPE_CHECKING
 
 from ..config import get_settings
 
+if TYPE_CHECKING:
+    import httpx
+
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
 
-async def send_application_message(text: str) -> None:
+class TelegramError(Exception):
+    def __init__(self, message: str, retry_after: float | None = None, permanent: bool = False) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.permanent = permanent
+
+
+def is_configured() -> bool:
+    return bool(settings.telegram_bot_token and settings.telegram_chat_id)
+
+
+def make_client() -> "httpx.AsyncClient":
     """
-    Send text to Telegram; logs issues instead of failing silently.
+    One keep-alive client for the outbox worker; connections are reused between sends.
     """
-    if not settings.telegram_bot_token or not settings.telegram_chat_id:
-        logger.warning("Telegram: token/chat_id not configured, message not sent")
-        return
-    url = f"https://api.telegram.org/bot{settings.telegram_bot_token}/sendMessage"
-    payload = {"chat_id": settings.telegram_chat_id, "text": text, "parse_mode": "HTML"}
-    try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.post(url, json=payload)
-            if resp.status_code != 200:
-                logger.error("Telegram send failed: %s %s", resp.status_code, resp.text)
-    except Exception as exc:  # pragma: no cover
-        logger.exception("Telegram send error: %s", exc)
+    # httpx импортируем только когда воркер реально отправляет — это заметная часть холодного старта
+    import httpx
+
+    return httpx.AsyncClient(
+        base_url=settings.telegram_api_base,
+        timeout=httpx.Timeout(10, connect=5),
+        limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+    )
 
 
+async def send_message(client: "httpx.AsyncClient", text: str) -> None:
+    """
+    Send text to the configured chat; raises TelegramError so the caller can retry.
+    """
+    import httpx
+
+    payload = {"chat_id": settings.telegram_chat_id, "text": text, "parse_mode": "HTML"}
+    try:
+        resp = await client.post(f"/bot{settings.telegram_bot_token}/sendMessage", json=payload)
+    except httpx.HTTPError as exc:
+        raise TelegramError(f"{type(exc).__name__}: {exc}") from exc
+    if resp.status_code == 200:
+        return
+    retry_after = None
+    if resp.status_code == 429:
+        try:
+            retry_after = float(resp.json()["parameters"]["retry_after"])
+        except (ValueError, KeyError, TypeError):
+            retry_after = None
+    # 4xx кроме 429 — ошибка запроса (чат, токен, разметка), повтор не поможет
+    permanent = 400 <= resp.status_code < 500 and resp.status_code != 429
+    raise TelegramError(f"{resp.status_code} {resp.text[:500]}", retry_after=retry_after, permanent=permanent)
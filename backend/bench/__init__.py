@@ -0,0 +1 @@
+"""Benchmarks and load scripts; run against a live server, e.g. `python -m bench.async_tail_latency`."""
@@ -0,0 +1,100 @@
+"""
+Tail latency of public GETs while application POSTs are in flight.
+
+A blocking DB call inside an async handler stalls the event loop for every request on the worker,
+so the interesting number is the GET p99 with and without concurrent writers.
+
+    uvicorn app.main:app --port 8000 &
+    python -m bench.async_tail_latency --base-url http://127.0.0.1:8000 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summary(latencies: list[float], elapsed: float) -> dict:
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+    }
+
+
+async def _reader(client: httpx.AsyncClient, path: str, deadline: float, latencies: list[float]) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+
+
+async def _writer(client: httpx.AsyncClient, deadline: float, latencies: list[float], worker: int) -> None:
+    counter = 0
+    while time.perf_counter() < deadline:
+        counter += 1
+        payload = {
+            "name": f"Bench {worker}",
+            "phone": f"+99890{worker:03d}{counter % 10000:04d}",
+            "tg_username": f"@bench_{worker}",
+        }
+        started = time.perf_counter()
+        response = await client.post("/api/public/applications", json=payload)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(base_url: str, path: str, readers: int, writers: int, duration: float) -> dict:
+    limits = httpx.Limits(max_connections=readers + writers, max_keepalive_connections=readers + writers)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        await client.get(path)  # прогрев кеша и пула соединений
+        results = {}
+        for phase, phase_writers in (("reads_only", 0), ("reads_with_writes", writers)):
+            get_latencies: list[float] = []
+            post_latencies: list[float] = []
+            started = time.perf_counter()
+            deadline = started + duration
+            tasks = [_reader(client, path, deadline, get_latencies) for _ in range(readers)]
+            tasks += [_writer(client, deadline, post_latencies, worker) for worker in range(phase_writers)]
+            await asyncio.gather(*tasks)
+            elapsed = time.perf_counter() - started
+            results[phase] = {"get": summary(get_latencies, elapsed)}
+            if phase_writers:
+                results[phase]["post"] = summary(post_latencies, elapsed)
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--path", default="/api/public/courses?locale=ru")
+    parser.add_argument("--readers", type=int, default=20)
+    parser.add_argument("--writers", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.base_url, args.path, args.readers, args.writers, args.duration))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Cold start of the API: `import app.main` and the lifespan startup, each run in a fresh interpreter.
+
+The database is migrated once up front (python -m app.migrate), so startup only checks the revision.
+The report also lists which heavy optional modules got imported before the first request.
+
+    python -m bench.cold_start --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# тяжёлые модули, которые не нужны до первого запроса соответствующего типа
+HEAVY_MODULES = ("alembic", "httpx", "passlib", "PIL")
+
+
+def child() -> None:
+    import asyncio
+    import time
+
+    started = time.perf_counter()
+    from app.main import app
+
+    imported = time.perf_counter()
+
+    async def startup() -> None:
+        async with app.router.lifespan_context(app):
+            pass
+
+    asyncio.run(startup())
+    finished = time.perf_counter()
+    print(
+        json.dumps(
+            {
+                "import_ms": (imported - started) * 1000,
+                # включает остановку воркеров и dispose пулов — это доли миллисекунды
+                "startup_ms": (finished - imported) * 1000,
+                "loaded": [name for name in HEAVY_MODULES if name in sys.modules],
+            }
+        )
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="fresh processes to start")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return
+
+    workdir = tempfile.mkdtemp(prefix="cold-start-")
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{workdir}/bench.db",
+        "RATE_LIMIT_ENABLED": "false",
+        "OUTBOX_ENABLED": "false",
+    }
+    subprocess.run([sys.executable, "-m", "app.migrate"], env=env, check=True, capture_output=True)
+    samples = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, "-m", "bench.cold_start", "--child"],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    report = {"runs": args.runs}
+    for key in ("import_ms", "startup_ms"):
+        values = [sample[key] for sample in samples]
+        report[key] = {"median": round(statistics.median(values), 1), "min": round(min(values), 1)}
+    report["heavy_modules_loaded"] = sorted({name for sample in samples for name in sample["loaded"]})
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Query plan regression check for the public and admin list routes.
+
+Every route is requested in-process with the response cache off; each SELECT it runs is EXPLAINed on the
+same connection with the same parameters. A plan fails when a table is read by a full scan or rows are
+sorted after reading, i.e. the index no longer covers filter + ORDER BY. Unfiltered reads (counts over a
+whole table, the first contacts row) may scan. Exit code 1 on failure.
+
+On Postgres seq scans and sorts are disabled for the EXPLAIN, so a Seq Scan or Sort node in the plan means
+no index can serve the query at any table size. SQLite plans by rules, so it only needs a seeded database.
+
+    python -m app.migrate && python -m bench.seed --reset --no-variants
+    python -m bench.explain            # --verbose prints every plan
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+
+# (имя, путь); {…} подставляются из данных, найденных bench.load.discover
+ROUTES = [
+    ("home", "/api/public/home?locale={locale}"),
+    ("courses", "/api/public/courses?locale={locale}"),
+    ("course_detail", "/api/public/courses/{course_slug}?locale={locale}"),
+    ("course_translations", "/api/public/courses/{course_slug}/translations"),
+    ("teachers", "/api/public/teachers?locale={locale}"),
+    ("track", "/api/public/track?locale={locale}"),
+    ("reviews", "/api/public/reviews?locale={locale}"),
+    ("partners", "/api/public/partners?locale={locale}"),
+    ("blog", "/api/public/blog?locale={locale}"),
+    ("blog_page_2", "/api/public/blog?locale={locale}&cursor={blog_cursor}"),
+    ("blog_detail", "/api/public/blog/{post_slug}"),
+    ("blog_translations", "/api/public/blog/{post_slug}/translations"),
+    ("contacts", "/api/public/contacts?locale={locale}"),
+    ("static", "/api/public/static/about?locale={locale}"),
+    ("admin_applications", "/api/admin/applications?limit=50"),
+    ("admin_applications_status", "/api/admin/applications?limit=50&status=new"),
+    ("admin_applications_course", "/api/admin/applications?limit=50&course_id={course_id}"),
+    ("admin_applications_page_2", "/api/admin/applications?limit=50&cursor={applications_cursor}"),
+]
+
+
+@dataclass
+class Plan:
+    statement: str
+    lines: list[str]
+    problems: list[str] = field(default_factory=list)
+
+
+def filtered(statement: str, table: str) -> bool:
+    """Whether the statement has a WHERE on its FROM `table` part; reading all of an unfiltered table is fine."""
+    return re.search(rf"\bFROM {table}\b(?:(?!\bFROM\b).)*\bWHERE\b", statement, re.DOTALL) is not None
+
+
+def sqlite_plan(cursor, statement: str, parameters) -> list[str]:
+    cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return [row[-1] for row in cursor.fetchall()]
+
+
+def sqlite_problems(statement: str, lines: list[str], tables: set[str]) -> list[str]:
+    problems = []
+    for line in lines:
+        words = line.split()
+        # "SCAN courses" — чтение всей таблицы; "SCAN t USING INDEX ..." — обход индекса, уже упорядоченный
+        if words[:1] == ["SCAN"] and len(words) > 1 and words[1] in tables and "INDEX" not in line \
+                and filtered(statement, words[1]):
+            problems.append(f"full scan of {words[1]}")
+        if "USE TEMP B-TREE FOR" in line and "ORDER BY" in line:
+            problems.append("sort after read")
+    return problems
+
+
+def postgres_plan(cursor, statement: str, parameters) -> dict:
+    # запрещаем seq scan и сортировку: если они всё равно в плане, подходящего индекса нет
+    cursor.execute("SET enable_seqscan = off")
+    cursor.execute("SET enable_sort = off")
+    try:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        plan = cursor.fetchall()[0][0]
+    finally:
+        cursor.execute("RESET enable_seqscan")
+        cursor.execute("RESET enable_sort")
+    return (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+
+
+def postgres_lines(node: dict, depth: int = 0) -> list[str]:
+    label = node["Node Type"]
+    if "Relation Name" in node:
+        label += f" on {node['Relation Name']}"
+    if "Index Name" in node:
+        label += f" using {node['Index Name']}"
+    if "Sort Key" in node:
+        label += f" by {', '.join(node['Sort Key'])}"
+    lines = ["  " * depth + label]
+    for child in node.get("Plans", []):
+        lines += postgres_lines(child, depth + 1)
+    return lines
+
+
+def postgres_problems(statement: str, node: dict, tables: set[str]) -> list[str]:
+    problems = []
+    relation = node.get("Relation Name")
+    if node["Node Type"] == "Seq Scan" and relation in tables and filtered(statement, relation):
+        problems.append(f"full scan of {node['Relation Name']}")
+    if node["Node Type"] in ("Sort", "Incremental Sort"):
+        problems.append("sort after read")
+    for child in node.get("Plans", []):
+        problems += postgres_problems(statement, child, tables)
+    return problems
+
+
+class PlanRecorder:
+    """Listens on both engines and EXPLAINs every SELECT with the parameters it was executed with."""
+
+    def __init__(self, tables: set[str]) -> None:
+        self.tables = tables
+        self.plans: list[Plan] = []
+        self.active = False
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if not self.active or not statement.lstrip().upper().startswith("SELECT"):
+            return
+        # отдельный курсор того же соединения: результат основного запроса не трогаем
+        explain_cursor = conn.connection.cursor()
+        try:
+            if conn.dialect.name == "postgresql":
+                node = postgres_plan(explain_cursor, statement, parameters)
+                plan = Plan(statement, postgres_lines(node), postgres_problems(statement, node, self.tables))
+            else:
+                lines = sqlite_plan(explain_cursor, statement, parameters)
+                plan = Plan(statement, lines, sqlite_problems(statement, lines, self.tables))
+        finally:
+            explain_cursor.close()
+        # служебные запросы (pg_class для оценки числа заявок) нас не интересуют
+        if any(table in statement for table in self.tables):
+            self.plans.append(plan)
+
+
+async def check(args: argparse.Namespace) -> dict:
+    import httpx
+    from sqlalchemy import event
+
+    from app.database import Base, async_engine, engine
+    from app.main import app
+
+    from .load import discover
+
+    tables = set(Base.metadata.tables) - {"alembic_version"}
+    recorder = PlanRecorder(tables)
+    for target in (engine, async_engine.sync_engine):
+        event.listen(target, "after_cursor_execute", recorder)
+
+    report = {"database": engine.dialect.name, "routes": {}}
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                login = {"login": args.admin_login, "password": args.admin_password}
+                token = (await client.post("/api/auth/login", json=login)).raise_for_status().json()["access_token"]
+                client.headers["Authorization"] = f"Bearer {token}"
+                ctx = await discover(client, [args.locale])
+                values = {
+                    "locale": args.locale,
+                    "course_slug": (ctx.course_slugs.get(args.locale) or [None])[0],
+                    "post_slug": (ctx.post_slugs.get(args.locale) or [None])[0],
+                    "blog_cursor": ctx.blog_cursors.get(args.locale),
+                    "course_id": (ctx.course_ids or [None])[0],
+                    "applications_cursor": ctx.applications_cursor,
+                }
+                for name, path in ROUTES:
+                    try:
+                        url = path.format(**{key: value for key, value in values.items() if value is not None})
+                    except KeyError as exc:
+                        # в базе нет данных для маршрута — засеять её bench.seed
+                        report["routes"][name] = {"skipped": f"no {exc.args[0]} in the database"}
+                        continue
+                    recorder.plans, recorder.active = [], True
+                    response = await client.get(url)
+                    recorder.active = False
+                    report["routes"][name] = {
+                        "status": response.status_code,
+                        "plans": [plan.__dict__ for plan in recorder.plans],
+                    }
+    finally:
+        await async_engine.dispose()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--locale", default="ru")
+    parser.add_argument("--admin-login", default=os.getenv("ADMIN_LOGIN", "admin"))
+    parser.add_argument("--admin-password", default=os.getenv("ADMIN_PASSWORD", "admin123"))
+    parser.add_argument("--verbose", action="store_true", help="print every statement and its plan")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    # настройки читаются при импорте приложения: без кеша ответов каждый запрос доходит до БД
+    os.environ["PUBLIC_CACHE_ENABLED"] = "false"
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    report = asyncio.run(check(args))
+
+    failed = 0
+    print(f"database: {report['database']}")
+    for name, result in report["routes"].items():
+        if "skipped" in result:
+            print(f"SKIP {name}: {result['skipped']}")
+            continue
+        problems = sorted({problem for plan in result["plans"] for problem in plan["problems"]})
+        failed += bool(problems)
+        print(f"{'FAIL' if problems else 'ok  '} {name} ({len(result['plans'])} queries){': ' if problems else ''}"
+              f"{'; '.join(problems)}")
+        for plan in result["plans"]:
+            if args.verbose or plan["problems"]:
+                print(f"    {' '.join(plan['statement'].split())}")
+                for line in plan["lines"]:
+                    print(f"      {line}")
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
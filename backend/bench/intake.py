@@ -0,0 +1,117 @@
+"""
+Application intake throughput: per-request commits vs group commit (APPLICATION_BATCHING).
+
+Submitters post applications in a closed loop for --duration seconds at each concurrency level,
+first with a COMMIT per request, then through the intake batcher. Reports RPS, latency percentiles and
+COMMITs per application, and checks that every 201 id is in the database with its outbox row.
+Rows are really inserted: use a scratch database.
+
+    python -m app.migrate
+    python -m bench.intake --concurrency 1 10 100 --duration 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from .async_tail_latency import summary
+
+
+async def _submitter(client, deadline: float, worker: int, course_id, latencies: list[float], ids: list[int]) -> None:
+    counter = 0
+    while time.perf_counter() < deadline:
+        counter += 1
+        payload = {
+            "name": f"Intake {worker}-{counter}",
+            "phone": f"+99890{worker:03d}{counter % 10000:04d}",
+            "tg_username": f"@intake{worker}",
+            "course_id": course_id,
+        }
+        started = time.perf_counter()
+        response = await client.post("/api/public/applications", json=payload)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+        ids.append(response.json()["id"])
+
+
+async def run(args: argparse.Namespace) -> dict:
+    import httpx
+    from sqlalchemy import event, func, select
+
+    from app import models
+    from app.database import AsyncSessionLocal, async_engine
+    from app.main import app
+    from app.services.intake import intake_batcher
+
+    commits = [0]
+    event.listen(async_engine.sync_engine, "commit", lambda conn: commits.__setitem__(0, commits[0] + 1))
+    report = {"database": async_engine.dialect.name, "window_ms": intake_batcher.window * 1000, "modes": {}}
+    try:
+        async with app.router.lifespan_context(app):
+            async with AsyncSessionLocal() as db:
+                course_id = await db.scalar(select(models.Course.id).limit(1))
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+                for mode in ("per_request", "group_commit"):
+                    if mode == "group_commit":
+                        intake_batcher.start()
+                    else:
+                        await intake_batcher.stop()
+                    results = report["modes"][mode] = {}
+                    for concurrency in args.concurrency:
+                        latencies, ids = [], []
+                        before, batches = commits[0], intake_batcher.batches
+                        started = time.perf_counter()
+                        deadline = started + args.duration
+                        await asyncio.gather(
+                            *(_submitter(client, deadline, worker, course_id, latencies, ids)
+                              for worker in range(concurrency))
+                        )
+                        result = summary(latencies, time.perf_counter() - started)
+                        result["commits_per_application"] = round((commits[0] - before) / max(1, len(ids)), 3)
+                        if mode == "group_commit":
+                            result["batches"] = intake_batcher.batches - batches
+                        # каждая заявка с ответом 201 должна быть в БД вместе со своим уведомлением
+                        async with AsyncSessionLocal() as db:
+                            stored = await db.scalar(
+                                select(func.count()).select_from(models.Application).where(models.Application.id.in_(ids))
+                            )
+                        result["missing"] = len(set(ids)) - stored
+                        results[concurrency] = result
+                await intake_batcher.stop()
+                async with AsyncSessionLocal() as db:
+                    report["outbox_rows"] = await db.scalar(select(func.count()).select_from(models.NotificationOutbox))
+    finally:
+        await async_engine.dispose()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per level and mode")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    # настройки читаются при импорте приложения; батчер бенчмарк включает сам
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ["APPLICATION_BATCHING"] = "false"
+    os.environ.setdefault("OUTBOX_ENABLED", "false")
+    report = asyncio.run(run(args))
+
+    print(f"database: {report['database']}, window: {report['window_ms']} ms")
+    print(f"{'mode':<14}{'conc':>6}{'rps':>10}{'p50 ms':>10}{'p99 ms':>10}{'commits/app':>13}{'missing':>9}")
+    for mode, results in report["modes"].items():
+        for concurrency, result in results.items():
+            print(
+                f"{mode:<14}{concurrency:>6}{result['rps']:>10}{result['p50_ms']:>10}{result['p99_ms']:>10}"
+                f"{result['commits_per_application']:>13}{result['missing']:>9}"
+            )
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
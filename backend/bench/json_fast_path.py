@@ -0,0 +1,154 @@
+"""
+Serialization throughput of public list endpoints with and without JSON_FAST_PATH.
+
+Each mode runs in its own process (settings are read at import) against the same seeded SQLite file,
+with the public response cache off so every request loads and serializes the rows.
+Requests go through the ASGI app in-process, so the numbers are handler + serialization cost, no network.
+
+    python -m bench.json_fast_path --rows 200 --requests 300
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ENDPOINTS = {
+    "list_blog": "/api/public/blog?locale=ru&limit=100",
+    "list_teachers": "/api/public/teachers?locale=ru",
+}
+
+
+def seed(rows: int) -> None:
+    from app import models
+    from app.database import Base, SessionLocal, engine
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        variants = {name: {"hash": f"{name:0<64}", "width": 640, "height": 480} for name in ("thumb", "card", "full")}
+        started = datetime(2024, 1, 1)
+        for index in range(rows):
+            db.add(
+                models.Teacher(
+                    name=f"Teacher {index}",
+                    bio="Опытный преподаватель. " * 20,
+                    socials={"telegram": f"@teacher{index}", "instagram": f"teacher{index}"},
+                    locale="ru",
+                    photo_hash=f"{index:064x}",
+                    photo_width=1200,
+                    photo_height=900,
+                    photo_variants=variants,
+                )
+            )
+            db.add(
+                models.BlogPost(
+                    title=f"Post {index}",
+                    slug=f"post-{index}-ru",
+                    body="<p>" + "Текст поста. " * 200 + "</p>",
+                    excerpt="Короткое описание поста " * 4,
+                    locale="ru",
+                    is_published=True,
+                    published_at=started + timedelta(hours=index),
+                    cover_hash=f"{index + rows:064x}",
+                    cover_width=1600,
+                    cover_height=900,
+                    cover_variants=variants,
+                )
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def measure(requests: int) -> dict:
+    import httpx
+
+    from app.database import async_engine
+    from app.main import app
+
+    results = {}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, path in ENDPOINTS.items():
+                sample = (await client.get(path)).json()  # прогрев пула и адаптеров
+                latencies = []
+                started = time.perf_counter()
+                for _ in range(requests):
+                    request_started = time.perf_counter()
+                    response = await client.get(path)
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - request_started)
+                elapsed = time.perf_counter() - started
+                results[name] = {
+                    "rps": round(requests / elapsed, 1),
+                    "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+                    "p95_ms": round(sorted(latencies)[int(len(latencies) * 0.95) - 1] * 1000, 2),
+                    "bytes": len(response.content),
+                    "sample": sample,
+                }
+    finally:
+        await async_engine.dispose()
+    return results
+
+
+def child(args: argparse.Namespace) -> None:
+    if args.seed:
+        seed(args.rows)
+        return
+    print(json.dumps(asyncio.run(measure(args.requests)), ensure_ascii=False))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200, help="teachers and blog posts to seed")
+    parser.add_argument("--requests", type=int, default=300, help="requests per endpoint and mode")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--seed", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args)
+        return
+
+    workdir = tempfile.mkdtemp(prefix="json-bench-")
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{workdir}/bench.db",
+        "PUBLIC_CACHE_ENABLED": "false",
+        "RATE_LIMIT_ENABLED": "false",
+        "METRICS_ENABLED": "false",
+    }
+    command = [sys.executable, "-m", "bench.json_fast_path", "--child", "--rows", str(args.rows)]
+    subprocess.run([*command, "--seed"], env=env, check=True)
+    modes = {}
+    for mode, flag in (("pydantic", "false"), ("fast_path", "true")):
+        output = subprocess.run(
+            [*command, "--requests", str(args.requests)],
+            env={**env, "JSON_FAST_PATH": flag},
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        modes[mode] = json.loads(output.strip().splitlines()[-1])
+
+    report = {"rows": args.rows, "requests": args.requests}
+    for name in ENDPOINTS:
+        before, after = modes["pydantic"][name], modes["fast_path"][name]
+        report[name] = {
+            "pydantic": {key: value for key, value in before.items() if key != "sample"},
+            "fast_path": {key: value for key, value in after.items() if key != "sample"},
+            "speedup": round(after["rps"] / before["rps"], 2),
+            # порядок ключей может отличаться, содержимое — нет
+            "same_payload": before["sample"] == after["sample"],
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
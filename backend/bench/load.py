@@ -0,0 +1,318 @@
+"""
+Scripted load on the public and admin API with a per-route latency report.
+
+Workers pick routes from a weighted mix (same --seed, same sequence) against a database filled by
+bench.seed. The report (p50/p95/p99 and requests/sec per route and overall) is written as JSON so runs
+on different commits or databases can be compared with --compare.
+
+    python -m bench.load --duration 20 --output runs/$(git rev-parse --short HEAD)-sqlite.json
+    # against a running server (start it with RATE_LIMIT_ENABLED=false):
+    python -m bench.load --base-url http://127.0.0.1:8000 --database postgresql --output pg.json
+    python -m bench.load --compare runs/old.json runs/new.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+from urllib.parse import quote
+
+import httpx
+
+from .async_tail_latency import summary
+
+
+@dataclass
+class Route:
+    name: str
+    group: str
+    weight: int
+    # (метод, путь, json) из контекста, собранного при разведке
+    build: Callable[["Context", random.Random], tuple[str, str, dict | None]]
+
+
+@dataclass
+class Context:
+    locales: list[str]
+    course_slugs: dict[str, list[str]]
+    post_slugs: dict[str, list[str]]
+    blog_cursors: dict[str, str]
+    asset_urls: list[str]
+    course_ids: list[int]
+    application_ids: list[int]
+    applications_cursor: str | None
+    search_terms: dict[str, list[str]]
+
+
+STATUSES = ("new", "in_progress", "contacted", "enrolled", "rejected", "cancelled")
+
+
+def _pick(rng: random.Random, values: dict[str, list], locale: str) -> str:
+    return rng.choice(values.get(locale) or [value for items in values.values() for value in items])
+
+
+def _get(path: str):
+    return lambda ctx, rng: ("GET", path.format(locale=rng.choice(ctx.locales)), None)
+
+
+def _application(ctx: Context, rng: random.Random):
+    number = rng.randrange(10 ** 7)
+    payload = {"name": f"Load {number}", "phone": f"+99891{number:07d}", "tg_username": f"@load{number}"}
+    if ctx.course_ids:
+        payload["course_id"] = rng.choice(ctx.course_ids)
+    return "POST", "/api/public/applications", payload
+
+
+def _course_detail(ctx: Context, rng: random.Random):
+    locale = rng.choice(ctx.locales)
+    return "GET", f"/api/public/courses/{_pick(rng, ctx.course_slugs, locale)}?locale={locale}", None
+
+
+def _blog_page_2(ctx: Context, rng: random.Random):
+    locale = rng.choice(sorted(ctx.blog_cursors))
+    return "GET", f"/api/public/blog?locale={locale}&cursor={ctx.blog_cursors[locale]}", None
+
+
+def _blog_detail(ctx: Context, rng: random.Random):
+    return "GET", f"/api/public/blog/{_pick(rng, ctx.post_slugs, rng.choice(ctx.locales))}", None
+
+
+def _search(ctx: Context, rng: random.Random):
+    locale = rng.choice(ctx.locales)
+    return "GET", f"/api/public/search?q={quote(_pick(rng, ctx.search_terms, locale))}&locale={locale}", None
+
+
+ROUTES = [
+    Route("home", "public", 20, _get("/api/public/home?locale={locale}")),
+    Route("courses", "public", 10, _get("/api/public/courses?locale={locale}")),
+    Route("course_detail", "public", 10, _course_detail),
+    Route("teachers", "public", 5, _get("/api/public/teachers?locale={locale}")),
+    Route("reviews", "public", 3, _get("/api/public/reviews?locale={locale}")),
+    Route("partners", "public", 3, _get("/api/public/partners?locale={locale}")),
+    Route("track", "public", 3, _get("/api/public/track?locale={locale}")),
+    Route("contacts", "public", 3, _get("/api/public/contacts?locale={locale}")),
+    Route("blog", "public", 12, _get("/api/public/blog?locale={locale}")),
+    Route("blog_page_2", "public", 4, _blog_page_2),
+    Route("blog_detail", "public", 12, _blog_detail),
+    Route("search", "public", 5, _search),
+    Route("asset", "public", 5, lambda ctx, rng: ("GET", rng.choice(ctx.asset_urls), None)),
+    Route("create_application", "public", 2, _application),
+    Route("admin_applications", "admin", 10, _get("/api/admin/applications?limit=50")),
+    Route(
+        "admin_applications_status",
+        "admin",
+        5,
+        lambda ctx, rng: ("GET", f"/api/admin/applications?limit=50&status={rng.choice(STATUSES)}", None),
+    ),
+    Route(
+        "admin_applications_search",
+        "admin",
+        4,
+        lambda ctx, rng: ("GET", f"/api/admin/applications?limit=50&q=%2B99890{rng.randrange(100):02d}", None),
+    ),
+    Route(
+        "admin_applications_page_2",
+        "admin",
+        3,
+        lambda ctx, rng: ("GET", f"/api/admin/applications?limit=50&cursor={ctx.applications_cursor}", None),
+    ),
+    Route(
+        "admin_application_status",
+        "admin",
+        3,
+        lambda ctx, rng: (
+            "PATCH",
+            f"/api/admin/applications/{rng.choice(ctx.application_ids)}",
+            {"status": rng.choice(STATUSES)},
+        ),
+    ),
+    Route("admin_courses", "admin", 2, _get("/api/admin/courses")),
+    Route("admin_blog", "admin", 2, _get("/api/admin/blog")),
+]
+
+
+async def discover(client: httpx.AsyncClient, locales: list[str]) -> Context:
+    """Collect slugs, ids and cursors from the API so routes only hit rows that exist."""
+    course_slugs, post_slugs, blog_cursors, search_terms = {}, {}, {}, {}
+    course_ids, asset_urls = [], []
+    for locale in locales:
+        courses = (await client.get(f"/api/public/courses?locale={locale}")).raise_for_status().json()
+        course_slugs[locale] = [course["slug"] for course in courses]
+        course_ids += [course["id"] for course in courses]
+        page = (await client.get(f"/api/public/blog?locale={locale}&limit=100")).raise_for_status().json()
+        post_slugs[locale] = [post["slug"] for post in page["items"]]
+        if page["next_cursor"]:
+            first = (await client.get(f"/api/public/blog?locale={locale}")).json()
+            if first["next_cursor"]:
+                blog_cursors[locale] = first["next_cursor"]
+        # слова из заголовков — поиск с совпадениями, а не пустые ответы
+        search_terms[locale] = sorted({word for post in page["items"] for word in post["title"].split()[:2]})[:20]
+        for post in page["items"]:
+            variants = post.get("cover_variants") or {}
+            asset_urls += [variant["url"] for variant in variants.values()] or [post["cover_url"]]
+    applications = (await client.get("/api/admin/applications?limit=100")).raise_for_status().json()
+    return Context(
+        locales=locales,
+        course_slugs=course_slugs,
+        post_slugs=post_slugs,
+        blog_cursors=blog_cursors,
+        asset_urls=sorted({url for url in asset_urls if url}),
+        course_ids=course_ids,
+        application_ids=[item["id"] for item in applications["items"]],
+        applications_cursor=applications["next_cursor"],
+        search_terms=search_terms,
+    )
+
+
+def usable_routes(ctx: Context, groups: set[str]) -> list[Route]:
+    # пустая база или выключенный раздел — маршрут выпадает из смеси, а не сыплет ошибками
+    missing = {
+        "course_detail": not any(ctx.course_slugs.values()),
+        "blog_detail": not any(ctx.post_slugs.values()),
+        "blog_page_2": not ctx.blog_cursors,
+        "search": not any(ctx.search_terms.values()),
+        "asset": not ctx.asset_urls,
+        "admin_applications_page_2": not ctx.applications_cursor,
+        "admin_application_status": not ctx.application_ids,
+    }
+    return [route for route in ROUTES if route.group in groups and not missing.get(route.name)]
+
+
+async def _worker(client, ctx, routes, rng, deadline, samples, errors) -> None:
+    weights = [route.weight for route in routes]
+    while time.perf_counter() < deadline:
+        route = rng.choices(routes, weights)[0]
+        method, path, payload = route.build(ctx, rng)
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, path, json=payload)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        elapsed = time.perf_counter() - started
+        if ok:
+            samples.setdefault(route.name, []).append(elapsed)
+        else:
+            errors[route.name] = errors.get(route.name, 0) + 1
+
+
+async def run(client: httpx.AsyncClient, args: argparse.Namespace) -> dict:
+    login = {"login": args.admin_login, "password": args.admin_password}
+    token = (await client.post("/api/auth/login", json=login)).raise_for_status().json()["access_token"]
+    client.headers["Authorization"] = f"Bearer {token}"
+    ctx = await discover(client, args.locales)
+    routes = usable_routes(ctx, set(args.groups))
+
+    results = {}
+    for phase, duration in (("warmup", args.warmup), ("measure", args.duration)):
+        samples: dict[str, list[float]] = {}
+        errors: dict[str, int] = {}
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(
+            *(
+                _worker(client, ctx, routes, random.Random(f"{args.seed}-{phase}-{index}"), deadline, samples, errors)
+                for index in range(args.concurrency)
+            )
+        )
+        results = {"elapsed": time.perf_counter() - started, "samples": samples, "errors": errors}
+
+    elapsed, samples, errors = results["elapsed"], results["samples"], results["errors"]
+    every = [value for values in samples.values() for value in values]
+    return {
+        "overall": {**summary(every, elapsed), "errors": sum(errors.values())},
+        "routes": {
+            route.name: {**summary(samples.get(route.name, []), elapsed), "errors": errors.get(route.name, 0)}
+            for route in routes
+        },
+    }
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def measure(args: argparse.Namespace) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    meta = {
+        "label": args.label,
+        "commit": _commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "groups": args.groups,
+        "seed": args.seed,
+    }
+    if args.base_url:
+        meta.update(target=args.base_url, database=args.database)
+        async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30) as client:
+            return {"meta": meta, **await run(client, args)}
+
+    # в процессе: ASGI без сети, настройки окружения читаются при импорте приложения
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    from app.database import async_engine, engine
+    from app.main import app
+
+    meta.update(target="asgi", database=engine.dialect.name)
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=30) as client:
+                return {"meta": meta, **await run(client, args)}
+    finally:
+        await async_engine.dispose()
+
+
+def compare(before_path: str, after_path: str) -> None:
+    before, after = (json.loads(Path(path).read_text()) for path in (before_path, after_path))
+    print(f"{'route':32} {'p50 ms':>17} {'p95 ms':>17} {'p99 ms':>17} {'rps':>15}")
+    rows = [("overall", before["overall"], after["overall"])]
+    rows += [(name, before["routes"][name], stats) for name, stats in after["routes"].items() if name in before["routes"]]
+    for name, old, new in rows:
+        cells = [f"{old[key]:>7.1f} → {new[key]:<7.1f}" for key in ("p50_ms", "p95_ms", "p99_ms", "rps")]
+        print(f"{name:32} " + " ".join(cells))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="running server; default is the app in-process over ASGI")
+    parser.add_argument("--database", default="unknown", help="database label for --base-url runs")
+    parser.add_argument("--groups", type=lambda value: value.split(","), default=["public", "admin"])
+    parser.add_argument("--locales", type=lambda value: value.split(","), default=["ru", "uz", "en", "ja"])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds before measuring (caches, pools)")
+    parser.add_argument("--seed", type=int, default=42, help="route mix seed")
+    parser.add_argument("--admin-login", default=os.getenv("ADMIN_LOGIN", "admin"))
+    parser.add_argument("--admin-password", default=os.getenv("ADMIN_PASSWORD", "admin123"))
+    parser.add_argument("--label", help="free-form name of the run")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="print the difference of two reports")
+    args = parser.parse_args()
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = asyncio.run(measure(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(text)
+
+
+if __name__ == "__main__":
+    main()
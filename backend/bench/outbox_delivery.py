@@ -0,0 +1,123 @@
+"""
+Outbox delivery against a local fake Telegram API.
+
+The fake server answers slowly and fails the first requests (500, then 429 with retry_after),
+so the run shows that intake latency does not depend on Telegram and that every message
+is eventually delivered.
+
+    python -m bench.outbox_delivery --messages 20 --delay 2 --failures 3
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeTelegram(BaseHTTPRequestHandler):
+    delay = 0.0
+    failures = 0
+    received: list[str] = []
+    lock = threading.Lock()
+
+    def do_POST(self) -> None:  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.delay)
+        with self.lock:
+            cls = type(self)
+            if cls.failures > 1:
+                cls.failures -= 1
+                self._reply(500, {"ok": False, "description": "Internal Server Error"})
+                return
+            if cls.failures == 1:
+                cls.failures -= 1
+                self._reply(429, {"ok": False, "parameters": {"retry_after": 1}})
+                return
+            cls.received.append(body["text"])
+        self._reply(200, {"ok": True})
+
+    def _reply(self, code: int, payload: dict) -> None:
+        raw = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+async def run(args: argparse.Namespace) -> dict:
+    # приложение читает настройки при импорте, поэтому импортируем после настройки окружения
+    import httpx
+
+    from app.database import Base, async_engine, engine
+    from app.main import app
+    from app.services.outbox import outbox_worker
+
+    Base.metadata.create_all(bind=engine)
+    outbox_worker.start()
+    intake = []
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for index in range(args.messages):
+                payload = {"name": f"Outbox {index}", "phone": f"+99890000{index:04d}", "tg_username": "@outbox"}
+                started = time.perf_counter()
+                response = await client.post("/api/public/applications", json=payload)
+                response.raise_for_status()
+                intake.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        while len(FakeTelegram.received) < args.messages and time.perf_counter() - started < args.timeout:
+            await asyncio.sleep(0.2)
+        drained = time.perf_counter() - started
+    finally:
+        await outbox_worker.stop()
+        # пул aiosqlite держит поток соединения, без dispose процесс не завершится
+        await async_engine.dispose()
+    return {
+        "messages": args.messages,
+        "delivered": len(set(FakeTelegram.received)),
+        "duplicates": len(FakeTelegram.received) - len(set(FakeTelegram.received)),
+        "intake_max_ms": round(max(intake) * 1000, 2),
+        "intake_mean_ms": round(sum(intake) / len(intake) * 1000, 2),
+        "telegram_delay_s": args.delay,
+        "drain_s": round(drained, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=1.0, help="fake Telegram response time, seconds")
+    parser.add_argument("--failures", type=int, default=3, help="failed responses before the fake API recovers")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    FakeTelegram.delay = args.delay
+    FakeTelegram.failures = args.failures
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeTelegram)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    workdir = tempfile.mkdtemp(prefix="outbox-bench-")
+    os.environ.update(
+        DATABASE_URL=f"sqlite:///{workdir}/bench.db",
+        TELEGRAM_API_BASE=f"http://127.0.0.1:{server.server_port}",
+        TELEGRAM_BOT_TOKEN="bench",
+        TELEGRAM_CHAT_ID="1",
+        RATE_LIMIT_ENABLED="false",
+        OUTBOX_BACKOFF_BASE="0.5",
+        OUTBOX_POLL_INTERVAL="1",
+    )
+    try:
+        print(json.dumps(asyncio.run(run(args)), indent=2))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
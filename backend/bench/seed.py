@@ -0,0 +1,297 @@
+"""
+Fill a migrated database with synthetic content for load tests.
+
+Volumes are configurable; every locale gets its own courses, posts and home blocks, and translations
+share a base slug ("<base>-<locale>") the way the admin creates them. The same --seed gives the same data,
+so runs on different commits (or on SQLite and Postgres) see identical rows.
+
+    python -m app.migrate
+    python -m bench.seed --applications 10000 --posts 500 --reset
+"""
+import argparse
+import io
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert
+
+# Словари для текстов по языкам; японский пишется без пробелов
+WORDS = {
+    "ru": "курс язык урок грамматика практика разговор экзамен словарь произношение группа занятие "
+    "преподаватель уровень студент домашнее задание аудирование чтение письмо носитель".split(),
+    "uz": "kurs til dars grammatika amaliyot suhbat imtihon lugat talaffuz guruh mashgulot "
+    "oqituvchi daraja talaba uy vazifa tinglash oqish yozish".split(),
+    "en": "course language lesson grammar practice conversation exam vocabulary pronunciation group class "
+    "teacher level student homework listening reading writing native".split(),
+    "ja": "講座 言語 授業 文法 練習 会話 試験 語彙 発音 グループ 教室 先生 レベル 学生 宿題 聴解 読解 作文".split(),
+}
+LANGUAGES = ("english", "japanese", "korean", "german", "chinese", "turkish")
+LEVELS = ("A1", "A2", "B1", "B2", "C1", "IELTS", "JLPT N5", "JLPT N3")
+# веса статусов примерно как в живом инбоксе: большинство заявок новые или обработанные
+STATUSES = {"new": 40, "in_progress": 15, "contacted": 20, "enrolled": 15, "rejected": 5, "cancelled": 5}
+# (ширина, высота, формат) — размеры как у реальных загрузок из админки
+IMAGE_KINDS = {"cover": (1600, 900, "JPEG"), "photo": (800, 800, "JPEG"), "logo": (400, 200, "PNG")}
+
+
+def text(rng: random.Random, locale: str, words: int) -> str:
+    separator = "" if locale == "ja" else " "
+    return separator.join(rng.choice(WORDS[locale]) for _ in range(words))
+
+
+def paragraphs(rng: random.Random, locale: str, min_bytes: int, max_bytes: int) -> str:
+    target, parts = rng.randint(min_bytes, max_bytes), []
+    while sum(len(part.encode()) for part in parts) < target:
+        parts.append(f"<p>{text(rng, locale, rng.randint(30, 90))}.</p>")
+    return "\n".join(parts)
+
+
+def make_image(rng: random.Random, kind: str) -> bytes:
+    from PIL import Image, ImageDraw
+
+    width, height, image_format = IMAGE_KINDS[kind]
+    # растянутый мелкий шум сжимается примерно как фотография, а не как однотонная заливка
+    small = (width // 8, height // 8)
+    image = Image.frombytes("RGB", small, rng.randbytes(small[0] * small[1] * 3)).resize((width, height), Image.BICUBIC)
+    draw = ImageDraw.Draw(image, "RGBA")
+    for _ in range(12):
+        x, y = rng.randrange(width), rng.randrange(height)
+        radius = rng.randint(width // 10, width // 3)
+        color = tuple(rng.randrange(256) for _ in range(3)) + (110,)
+        draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=color)
+    buffer = io.BytesIO()
+    image.save(buffer, image_format, quality=82)
+    return buffer.getvalue()
+
+
+def store_images(db, rng: random.Random, kind: str, count: int, variants: bool) -> list[dict]:
+    """Store `count` distinct images; returns image column values for rows to reuse."""
+    from app.services.assets import store_bytes
+    from app.services.derivatives import render_variants, save_variants
+
+    images = []
+    for _ in range(count):
+        asset = store_bytes(db, make_image(rng, kind))
+        db.commit()
+        image = {"hash": asset.hash, "width": asset.width, "height": asset.height, "variants": None}
+        if variants:
+            rendered = render_variants(asset.hash)
+            save_variants(db, asset.hash, rendered)
+            image["variants"] = {name: {k: v[k] for k in ("hash", "width", "height")} for name, v in rendered.items()}
+        images.append(image)
+    return images
+
+
+def image_columns(prefix: str, image: dict | None) -> dict:
+    if image is None:
+        return {}
+    return {f"{prefix}_{key}": value for key, value in image.items()}
+
+
+def reset(db) -> None:
+    from app import models
+
+    # порядок — от зависимых таблиц к тем, на которые ссылаются
+    for model in (
+        models.Application,
+        models.SearchDocument,
+        models.NotificationOutbox,
+        models.Teacher,
+        models.Partner,
+        models.BlogPost,
+        models.TrackStep,
+        models.Review,
+        models.Course,
+        models.StaticPage,
+        models.ContactInfo,
+        models.Asset,
+    ):
+        db.execute(delete(model))
+    db.commit()
+
+
+def seed(db, args: argparse.Namespace) -> dict:
+    from app import models
+    from app.services import search
+
+    rng = random.Random(args.seed)
+    locales = args.locales
+    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    counts = {}
+
+    covers = store_images(db, rng, "cover", args.images, args.variants) if args.images else []
+    photos = store_images(db, rng, "photo", max(1, args.images // 4), args.variants) if args.images else []
+    logos = store_images(db, rng, "logo", max(1, args.images // 8), args.variants) if args.images else []
+    counts["images"] = len(covers) + len(photos) + len(logos)
+
+    courses = []
+    for index in range(args.courses):
+        locale = locales[index % len(locales)]
+        course = models.Course(
+            name=f"{rng.choice(LANGUAGES).title()} {rng.choice(LEVELS)} — {text(rng, locale, 3)}",
+            language=rng.choice(LANGUAGES),
+            level=rng.choice(LEVELS),
+            price=f"{rng.randrange(400, 1500, 50)} 000",
+            discount=rng.choice([None, "10%", "20%"]),
+            duration=f"{rng.choice([2, 3, 4, 6])} months",
+            advantages=[text(rng, locale, 4) for _ in range(rng.randint(3, 6))],
+            is_active=rng.random() > 0.1,
+            slug=f"course-{index // len(locales)}-{locale}",
+            description=paragraphs(rng, locale, 800, 3000),
+            locale=locale,
+        )
+        courses.append(course)
+    db.add_all(courses)
+    db.flush()
+    search.index_rows(db, "course", courses)
+    counts["courses"] = len(courses)
+
+    posts = []
+    for index in range(args.posts):
+        locale = locales[index % len(locales)]
+        published = rng.random() > 0.1
+        posts.append(
+            models.BlogPost(
+                title=text(rng, locale, rng.randint(4, 9)).capitalize(),
+                slug=f"post-{index // len(locales)}-{locale}",
+                body=paragraphs(rng, locale, 3000, 15000),
+                excerpt=text(rng, locale, 30),
+                locale=locale,
+                is_published=published,
+                published_at=now - timedelta(hours=rng.randint(1, 24 * 365)) if published else None,
+                seo_title=text(rng, locale, 6),
+                seo_description=text(rng, locale, 20),
+                **image_columns("cover", rng.choice(covers) if covers else None),
+            )
+        )
+    db.add_all(posts)
+    db.flush()
+    search.index_rows(db, "blog", posts)
+    counts["posts"] = len(posts)
+
+    for locale in locales:
+        for index in range(args.teachers):
+            db.add(
+                models.Teacher(
+                    name=f"Teacher {index} {locale}",
+                    bio=text(rng, locale, rng.randint(40, 120)),
+                    socials={"telegram": f"@teacher{index}", "instagram": f"teacher_{index}"},
+                    locale=locale,
+                    **image_columns("photo", rng.choice(photos) if photos else None),
+                )
+            )
+        for index in range(args.reviews):
+            db.add(
+                models.Review(
+                    name=f"Student {index}",
+                    role=text(rng, locale, 2),
+                    quote=text(rng, locale, rng.randint(20, 60)),
+                    is_visible=rng.random() > 0.2,
+                    locale=locale,
+                )
+            )
+        for index in range(args.partners):
+            db.add(
+                models.Partner(
+                    name=f"Partner {index}",
+                    url=f"https://partner{index}.example.com",
+                    locale=locale,
+                    order=index,
+                    **image_columns("logo", rng.choice(logos) if logos else None),
+                )
+            )
+        for index in range(6):
+            db.add(
+                models.TrackStep(
+                    title=text(rng, locale, 3),
+                    body=text(rng, locale, 40),
+                    order=index,
+                    course_links=[course.slug for course in rng.sample(courses, min(2, len(courses)))],
+                    locale=locale,
+                )
+            )
+        db.add(
+            models.ContactInfo(
+                locale=locale,
+                address=text(rng, locale, 5),
+                phone="+998 90 000 00 00",
+                email="info@example.com",
+                socials={"telegram": "@center", "instagram": "center"},
+                map_embed="<iframe src=\"https://maps.example.com/embed\"></iframe>",
+            )
+        )
+        db.add(models.StaticPage(slug="about", locale=locale, body={"html": paragraphs(rng, locale, 2000, 4000)}))
+    counts.update(
+        teachers=args.teachers * len(locales),
+        reviews=args.reviews * len(locales),
+        partners=args.partners * len(locales),
+    )
+    db.commit()
+
+    # заявки вставляем пачками одним INSERT ... VALUES — ORM-объекты на 10k строк заметно медленнее
+    statuses, weights = list(STATUSES), list(STATUSES.values())
+    batch = []
+    for index in range(args.applications):
+        course = rng.choice(courses) if courses and rng.random() > 0.15 else None
+        batch.append(
+            {
+                "name": f"{rng.choice(['Ali', 'Aziza', 'Bekzod', 'Dilnoza', 'Ivan', 'Maria', 'Kenji'])} {index}",
+                "phone": f"+99890{rng.randrange(10 ** 7):07d}",
+                "tg_username": f"@user{index}",
+                "course_id": course.id if course else None,
+                "course_title": course.name if course else None,
+                "status": rng.choices(statuses, weights)[0],
+                "created_at": now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600)),
+            }
+        )
+        if len(batch) == 1000:
+            db.execute(insert(models.Application), batch)
+            batch = []
+    if batch:
+        db.execute(insert(models.Application), batch)
+    db.commit()
+    counts["applications"] = args.applications
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--applications", type=int, default=10000)
+    parser.add_argument("--posts", type=int, default=500, help="blog posts across all locales")
+    parser.add_argument("--courses", type=int, default=40, help="courses across all locales")
+    parser.add_argument("--teachers", type=int, default=12, help="per locale")
+    parser.add_argument("--reviews", type=int, default=20, help="per locale")
+    parser.add_argument("--partners", type=int, default=10, help="per locale")
+    parser.add_argument("--images", type=int, default=24, help="distinct cover images; photos and logos are fewer")
+    parser.add_argument("--no-variants", dest="variants", action="store_false", help="skip WebP variants")
+    parser.add_argument("--locales", type=lambda value: value.split(","), default=None, help="default: all")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--reset", action="store_true", help="delete existing content first (admins are kept)")
+    args = parser.parse_args()
+
+    from app import migrate
+    from app.database import SessionLocal, engine
+    from app.locales import LOCALES
+
+    args.locales = args.locales or list(LOCALES)
+    try:
+        migrate.check(engine)
+    except migrate.SchemaMismatch as exc:
+        raise SystemExit(str(exc)) from exc
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        if args.reset:
+            reset(db)
+        counts = seed(db, args)
+    finally:
+        db.close()
+    counts["database"] = engine.dialect.name
+    counts["seconds"] = round(time.perf_counter() - started, 1)
+    print(json.dumps(counts, indent=2))
+
+
+if __name__ == "__main__":
+    main()
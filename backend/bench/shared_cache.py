@@ -0,0 +1,177 @@
+"""
+Shared (Redis) response cache check: cold workers, pub/sub invalidation and a Redis outage.
+
+Runs the app in-process against a real Redis (--redis-url) or, by default, an in-process fake
+(fakeredis from requirements-dev.txt, not an app dependency). Reports:
+
+- cold: SQL statements the first worker runs to fill the public routes, and what a second worker with
+  an empty local cache runs after it (with the shared cache: none, everything comes from Redis);
+- invalidation: an admin write on this worker must drop the entries of a peer worker subscribed to the
+  same Redis, and the next read must show the new row;
+- outage: with Redis unreachable every route still answers 200 from the database.
+
+    python -m app.migrate && python -m bench.seed --reset --no-variants
+    python -m bench.shared_cache                     # --redis-url redis://localhost:6379/15
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+# публичные маршруты из bench.explain; {…} подставляются из данных, найденных bench.load.discover
+ROUTES = [
+    ("home", "/api/public/home?locale={locale}"),
+    ("courses", "/api/public/courses?locale={locale}"),
+    ("course_detail", "/api/public/courses/{course_slug}?locale={locale}"),
+    ("teachers", "/api/public/teachers?locale={locale}"),
+    ("track", "/api/public/track?locale={locale}"),
+    ("reviews", "/api/public/reviews?locale={locale}"),
+    ("partners", "/api/public/partners?locale={locale}"),
+    ("blog", "/api/public/blog?locale={locale}"),
+    ("blog_detail", "/api/public/blog/{post_slug}"),
+    ("contacts", "/api/public/contacts?locale={locale}"),
+]
+
+
+def make_clients(url: str | None):
+    """(async client, sync client) for one "worker"; without a URL both talk to one in-process fake server."""
+    if url:
+        from redis import Redis
+        from redis.asyncio import Redis as AsyncRedis
+
+        return lambda: (AsyncRedis.from_url(url), Redis.from_url(url))
+    try:
+        import fakeredis
+    except ImportError:
+        raise SystemExit("no --redis-url given and fakeredis is not installed (pip install -r requirements-dev.txt)")
+    server = fakeredis.FakeServer()
+    return lambda: (fakeredis.aioredis.FakeRedis(server=server), fakeredis.FakeRedis(server=server))
+
+
+class StatementCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, *args) -> None:
+        self.count += 1
+
+
+async def run(args: argparse.Namespace) -> dict:
+    import httpx
+    from sqlalchemy import event
+
+    from app.database import async_engine
+    from app.main import app
+    from app.services.cache import ResponseCache, SharedCache, response_cache, shared_cache
+
+    from .load import discover
+
+    clients = make_clients(args.redis_url)
+    counter = StatementCounter()
+    event.listen(async_engine.sync_engine, "after_cursor_execute", counter)
+    # второй воркер: свой локальный кеш, тот же Redis; данные он не читает, только слушает инвалидации
+    peer = SharedCache(ResponseCache(ttl=60), url="", ttl=shared_cache.ttl)
+    report = {}
+    try:
+        shared_cache.start(*clients())
+        peer.start(*clients())
+        # lifespan не подключается второй раз: клиенты уже переданы
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                login = {"login": args.admin_login, "password": args.admin_password}
+                token = (await client.post("/api/auth/login", json=login)).raise_for_status().json()["access_token"]
+                admin = {"Authorization": f"Bearer {token}"}
+                client.headers.update(admin)
+                ctx = await discover(client, [args.locale])
+                del client.headers["Authorization"]
+                values = {"locale": args.locale}
+                if ctx.course_slugs.get(args.locale):
+                    values["course_slug"] = ctx.course_slugs[args.locale][0]
+                if ctx.post_slugs.get(args.locale):
+                    values["post_slug"] = ctx.post_slugs[args.locale][0]
+                urls = []
+                for _, path in ROUTES:
+                    try:
+                        urls.append(path.format(**values))
+                    except KeyError:
+                        # в базе нет данных для маршрута — засеять её bench.seed
+                        continue
+
+                async def cold_pass() -> dict:
+                    # новый воркер: локальный кеш пуст
+                    response_cache.clear()
+                    before, statuses = counter.count, []
+                    for url in urls:
+                        statuses.append((await client.get(url)).status_code)
+                    return {"statements": counter.count - before, "non_200": [s for s in statuses if s != 200]}
+
+                # Redis без записей этого прогона
+                await shared_cache._client.flushdb()
+                report["cold"] = {"routes": len(urls), "first_worker": await cold_pass()}
+                report["cold"]["next_worker"] = await cold_pass()
+                report["cold"]["shared"] = shared_cache.stats()
+
+                reviews_url = f"/api/public/reviews?locale={args.locale}"
+                key = ("reviews", args.locale)
+                peer.local.set(key, ("reviews",), peer.local.versions(("reviews",)), b"[]", '"peer"', None)
+
+                quote = f"shared cache check {time.time()}"
+                started = time.perf_counter()
+                review = (await client.post(
+                    "/api/admin/reviews", json={"name": "bench", "quote": quote, "locale": args.locale}, headers=admin
+                )).raise_for_status().json()
+                while peer.local.get(key) is not None and time.perf_counter() - started < 2:
+                    await asyncio.sleep(0.005)
+                dropped = peer.local.get(key) is None
+                report["invalidation"] = {
+                    "peer_dropped": dropped,
+                    "peer_seconds": round(time.perf_counter() - started, 4) if dropped else None,
+                    "new_row_visible": quote in (await client.get(reviews_url)).text,
+                }
+                await client.delete(f"/api/admin/reviews/{review['id']}", headers=admin)
+                report["invalidation"]["deleted_row_gone"] = quote not in (await client.get(reviews_url)).text
+
+                # Redis пропал: запросы идут в БД, кеш отключается на retry_after
+                await shared_cache.stop()
+                shared_cache.url = "redis://127.0.0.1:1"
+                shared_cache.start()
+                report["outage"] = await cold_pass()
+                report["outage"]["shared"] = shared_cache.stats()
+    finally:
+        await peer.stop()
+        await async_engine.dispose()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", help="real Redis (a spare database: it is flushed); default: in-process fake")
+    parser.add_argument("--locale", default="ru")
+    parser.add_argument("--admin-login", default=os.getenv("ADMIN_LOGIN", "admin"))
+    parser.add_argument("--admin-password", default=os.getenv("ADMIN_PASSWORD", "admin123"))
+    args = parser.parse_args()
+
+    # настройки читаются при импорте приложения
+    os.environ["PUBLIC_CACHE_ENABLED"] = "true"
+    os.environ["PUBLIC_CACHE_SHARED"] = "true"
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+
+    cold, invalidation, outage = report["cold"], report["invalidation"], report["outage"]
+    ok = (
+        not cold["first_worker"]["non_200"]
+        and cold["next_worker"]["statements"] == 0
+        and all(invalidation.values())
+        and not outage["non_200"]
+        and outage["statements"] > 0
+    )
+    print("ok" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -30,6 +30,12 @@ if config.config_file_name is not None:
 # Metadata for autogenerate.
 target_metadata = Base.metadata
 
+
+def include_name(name, type_, parent_names) -> bool:
+    # служебные таблицы FTS5 создаёт сама SQLite, в моделях их нет
+    return not (type_ == "table" and name.startswith("search_documents_fts"))
+
+
 # Inject DB url from settings.
 config.set_main_option("sqlalchemy.url", settings.database_url)
 database_url = config.get_main_option("sqlalchemy.url")
@@ -52,6 +58,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -78,6 +85,7 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             render_as_batch=is_sqlite,
+            include_name=include_name,
         )
 
         with context.begin_transaction():
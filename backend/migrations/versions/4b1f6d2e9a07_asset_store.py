@@ -0,0 +1,186 @@
+"""move base64 images to content-addressed asset store
+
+Revision ID: 4b1f6d2e9a07
+Revises: c0406f8291c1
+Create Date: 2026-10-18 13:10:00.000000
+
+"""
+import base64
+import binascii
+import hashlib
+import io
+import os
+import tempfile
+from pathlib import Path
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '4b1f6d2e9a07'
+down_revision: Union[str, None] = 'c0406f8291c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (таблица, старая base64-колонка, префикс новых колонок)
+IMAGE_COLUMNS = [
+    ('teachers', 'photo_base64', 'photo'),
+    ('partners', 'logo_base64', 'logo'),
+    ('blog_posts', 'cover_base64', 'cover'),
+]
+# строк с картинками за один SELECT: base64 бывает по несколько мегабайт
+BATCH_SIZE = 100
+
+# правила app.services.assets на момент миграции, зафиксированные здесь
+MEDIA_DIR = Path(os.getenv('MEDIA_DIR', str(Path(__file__).resolve().parents[2] / 'media')))
+CONTENT_TYPES = {
+    'PNG': 'image/png',
+    'JPEG': 'image/jpeg',
+    'GIF': 'image/gif',
+    'WEBP': 'image/webp',
+    'BMP': 'image/bmp',
+    'ICO': 'image/x-icon',
+}
+
+
+class InvalidImage(ValueError):
+    pass
+
+
+def asset_path(asset_hash):
+    return MEDIA_DIR / asset_hash[:2] / asset_hash
+
+
+def decode_base64(data):
+    if data.startswith('data:'):
+        data = data.split(',', 1)[-1]
+    try:
+        return base64.b64decode(data, validate=False)
+    except (binascii.Error, ValueError) as exc:
+        raise InvalidImage('Invalid base64 image') from exc
+
+
+def inspect_image(raw):
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(io.BytesIO(raw)) as image:
+            image_format, (width, height) = image.format, image.size
+    except (UnidentifiedImageError, OSError) as exc:
+        raise InvalidImage('Unsupported image') from exc
+    content_type = CONTENT_TYPES.get(image_format or '')
+    if not content_type:
+        raise InvalidImage(f'Unsupported image format: {image_format}')
+    return content_type, width, height
+
+
+def write_blob(asset_hash, raw):
+    path = asset_path(asset_hash)
+    if path.exists():
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix='.upload-')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(raw)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def _image_rows(bind, table, column):
+    """(id, base64) rows with an image, read in batches by id instead of all at once."""
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                f'SELECT id, {column} FROM {table} '
+                f'WHERE id > :last_id AND {column} IS NOT NULL AND {column} != \'\' ORDER BY id LIMIT :limit'
+            ),
+            {'last_id': last_id, 'limit': BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            return
+        yield from rows
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    op.create_table('assets',
+    sa.Column('hash', sa.String(length=64), nullable=False),
+    sa.Column('content_type', sa.String(length=100), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('width', sa.Integer(), nullable=True),
+    sa.Column('height', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('hash')
+    )
+    for table, _, prefix in IMAGE_COLUMNS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column(f'{prefix}_hash', sa.String(length=64), nullable=True))
+            batch_op.add_column(sa.Column(f'{prefix}_width', sa.Integer(), nullable=True))
+            batch_op.add_column(sa.Column(f'{prefix}_height', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(f'fk_{table}_{prefix}_hash_assets', 'assets', [f'{prefix}_hash'], ['hash'])
+
+    bind = op.get_bind()
+    assets = sa.table(
+        'assets',
+        sa.column('hash', sa.String),
+        sa.column('content_type', sa.String),
+        sa.column('size', sa.Integer),
+        sa.column('width', sa.Integer),
+        sa.column('height', sa.Integer),
+        sa.column('created_at', sa.DateTime),
+    )
+    known = set()
+    for table, old_column, prefix in IMAGE_COLUMNS:
+        for row_id, encoded in _image_rows(bind, table, old_column):
+            try:
+                raw = decode_base64(encoded)
+                content_type, width, height = inspect_image(raw)
+            except InvalidImage:
+                # битые картинки не переносим — строка останется без изображения
+                continue
+            asset_hash = hashlib.sha256(raw).hexdigest()
+            write_blob(asset_hash, raw)
+            if asset_hash not in known:
+                exists = bind.execute(sa.text('SELECT 1 FROM assets WHERE hash = :h'), {'h': asset_hash}).first()
+                if not exists:
+                    bind.execute(assets.insert().values(
+                        hash=asset_hash, content_type=content_type, size=len(raw), width=width, height=height,
+                        created_at=sa.func.current_timestamp(),
+                    ))
+                known.add(asset_hash)
+            bind.execute(
+                sa.text(f'UPDATE {table} SET {prefix}_hash = :h, {prefix}_width = :w, {prefix}_height = :ht WHERE id = :id'),
+                {'h': asset_hash, 'w': width, 'ht': height, 'id': row_id},
+            )
+
+    for table, old_column, _ in IMAGE_COLUMNS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column(old_column)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for table, old_column, prefix in IMAGE_COLUMNS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column(old_column, sa.Text(), nullable=True))
+        rows = bind.execute(
+            sa.text(f'SELECT id, {prefix}_hash FROM {table} WHERE {prefix}_hash IS NOT NULL')
+        ).fetchall()
+        for row_id, asset_hash in rows:
+            path = asset_path(asset_hash)
+            if not path.exists():
+                continue
+            encoded = base64.b64encode(path.read_bytes()).decode()
+            bind.execute(sa.text(f'UPDATE {table} SET {old_column} = :v WHERE id = :id'), {'v': encoded, 'id': row_id})
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(f'fk_{table}_{prefix}_hash_assets', type_='foreignkey')
+            batch_op.drop_column(f'{prefix}_height')
+            batch_op.drop_column(f'{prefix}_width')
+            batch_op.drop_column(f'{prefix}_hash')
+    op.drop_table('assets')
@@ -0,0 +1,38 @@
+"""applications inbox indexes
+
+Revision ID: 5f8b2d9e0c13
+Revises: e2a7c4f81d36
+Create Date: 2026-10-18 15:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '5f8b2d9e0c13'
+down_revision: Union[str, None] = 'e2a7c4f81d36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_applications_created_at_id', 'applications', ['created_at', 'id'], unique=False)
+    op.create_index('ix_applications_status_created_at_id', 'applications', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_applications_course_id_created_at_id', 'applications', ['course_id', 'created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_applications_phone_prefix', 'applications', ['phone'], unique=False,
+        postgresql_ops={'phone': 'varchar_pattern_ops'},
+    )
+    # на Postgres LIKE 'abc%' использует индекс только с pattern_ops (при не-C локали)
+    name_ops = ' varchar_pattern_ops' if op.get_bind().dialect.name == 'postgresql' else ''
+    op.create_index('ix_applications_name_lower_prefix', 'applications', [sa.text(f'lower(name){name_ops}')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_applications_name_lower_prefix', table_name='applications')
+    op.drop_index('ix_applications_phone_prefix', table_name='applications')
+    op.drop_index('ix_applications_course_id_created_at_id', table_name='applications')
+    op.drop_index('ix_applications_status_created_at_id', table_name='applications')
+    op.drop_index('ix_applications_created_at_id', table_name='applications')
@@ -0,0 +1,36 @@
+"""image variants
+
+Revision ID: 9d3e5a1c7b24
+Revises: 4b1f6d2e9a07
+Create Date: 2026-10-18 14:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3e5a1c7b24'
+down_revision: Union[str, None] = '4b1f6d2e9a07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+IMAGE_COLUMNS = [('teachers', 'photo'), ('partners', 'logo'), ('blog_posts', 'cover')]
+
+
+def upgrade() -> None:
+    # варианты для уже загруженных изображений: python -m app.services.derivatives
+    with op.batch_alter_table('assets') as batch_op:
+        batch_op.add_column(sa.Column('variants', sa.JSON(), nullable=True))
+    for table, prefix in IMAGE_COLUMNS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column(f'{prefix}_variants', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    for table, prefix in IMAGE_COLUMNS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column(f'{prefix}_variants')
+    with op.batch_alter_table('assets') as batch_op:
+        batch_op.drop_column('variants')
@@ -0,0 +1,44 @@
+"""composite indexes for public list queries
+
+Revision ID: a4c2e8f61b07
+Revises: f1c9a7e3d5b8
+Create Date: 2026-10-18 21:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c2e8f61b07'
+down_revision: Union[str, None] = 'f1c9a7e3d5b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # фильтр locale + флаг и сортировка списка — индекс отдаёт строки в порядке выдачи, без сортировки
+    op.create_index('ix_courses_locale_is_active_created_at', 'courses', ['locale', 'is_active', 'created_at'], unique=False)
+    op.create_index('ix_teachers_locale_created_at', 'teachers', ['locale', 'created_at'], unique=False)
+    op.create_index('ix_track_steps_locale_order', 'track_steps', ['locale', 'order'], unique=False)
+    op.create_index('ix_reviews_locale_is_visible_created_at', 'reviews', ['locale', 'is_visible', 'created_at'], unique=False)
+    # партнёры сортируются order ASC, created_at DESC — направление колонки в индексе то же
+    op.create_index(
+        'ix_partners_locale_order_created_at', 'partners', ['locale', 'order', sa.text('created_at DESC')], unique=False
+    )
+    op.create_index('ix_partners_order_created_at', 'partners', ['order', sa.text('created_at DESC')], unique=False)
+    op.create_index(
+        'ix_blog_posts_locale_is_published_published_at_id', 'blog_posts',
+        ['locale', 'is_published', 'published_at', 'id'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_blog_posts_locale_is_published_published_at_id', table_name='blog_posts')
+    op.drop_index('ix_partners_order_created_at', table_name='partners')
+    op.drop_index('ix_partners_locale_order_created_at', table_name='partners')
+    op.drop_index('ix_reviews_locale_is_visible_created_at', table_name='reviews')
+    op.drop_index('ix_track_steps_locale_order', table_name='track_steps')
+    op.drop_index('ix_teachers_locale_created_at', table_name='teachers')
+    op.drop_index('ix_courses_locale_is_active_created_at', table_name='courses')
@@ -0,0 +1,115 @@
+"""full-text search documents
+
+Revision ID: b3d8f2a6c471
+Revises: 7a6c3e1d9b52
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+import html
+import re
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d8f2a6c471'
+down_revision: Union[str, None] = '7a6c3e1d9b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_DDL = {
+    'sqlite': [
+        "CREATE VIRTUAL TABLE search_documents_fts USING fts5("
+        "title, body, content='search_documents', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER search_documents_ai AFTER INSERT ON search_documents BEGIN "
+        "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+        "CREATE TRIGGER search_documents_ad AFTER DELETE ON search_documents BEGIN "
+        "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) "
+        "VALUES ('delete', old.id, old.title, old.body); END",
+        "CREATE TRIGGER search_documents_au AFTER UPDATE ON search_documents BEGIN "
+        "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) "
+        "VALUES ('delete', old.id, old.title, old.body); "
+        "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    ],
+    'postgresql': [
+        "CREATE INDEX ix_search_documents_tsv ON search_documents USING gin "
+        "(to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(body, '')))",
+    ],
+}
+DROP_DDL = {
+    'sqlite': [
+        'DROP TRIGGER IF EXISTS search_documents_au',
+        'DROP TRIGGER IF EXISTS search_documents_ad',
+        'DROP TRIGGER IF EXISTS search_documents_ai',
+        'DROP TABLE IF EXISTS search_documents_fts',
+    ],
+    'postgresql': ['DROP INDEX IF EXISTS ix_search_documents_tsv'],
+}
+
+
+# правило app.services.search.plain_text на момент миграции, зафиксированное здесь
+_TAG = re.compile(r'<[^>]+>')
+_SPACES = re.compile(r'\s+')
+
+
+def plain_text(*parts):
+    joined = ' '.join(html.unescape(_TAG.sub(' ', part)) for part in parts if part)
+    return _SPACES.sub(' ', joined).strip()
+
+
+def upgrade() -> None:
+    op.create_table('search_documents',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('locale', sa.String(length=10), nullable=True),
+    sa.Column('slug', sa.String(length=255), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('body', sa.Text(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('entity', 'entity_id', name='uq_search_documents_entity')
+    )
+    op.create_index(op.f('ix_search_documents_locale'), 'search_documents', ['locale'], unique=False)
+    bind = op.get_bind()
+    for statement in INDEX_DDL.get(bind.dialect.name, []):
+        op.execute(statement)
+
+    # наполняем индекс уже опубликованным контентом; дальше его обновляет админка
+    documents = sa.table(
+        'search_documents',
+        sa.column('entity', sa.String),
+        sa.column('entity_id', sa.Integer),
+        sa.column('locale', sa.String),
+        sa.column('slug', sa.String),
+        sa.column('title', sa.String),
+        sa.column('body', sa.Text),
+        sa.column('updated_at', sa.DateTime),
+    )
+    courses = bind.execute(sa.text(
+        'SELECT id, locale, slug, name, description FROM courses WHERE is_active = :yes'
+    ), {'yes': True}).fetchall()
+    posts = bind.execute(sa.text(
+        'SELECT id, locale, slug, title, excerpt, body FROM blog_posts WHERE is_published = :yes'
+    ), {'yes': True}).fetchall()
+    rows = [
+        {'entity': 'course', 'entity_id': row_id, 'locale': locale, 'slug': slug, 'title': name,
+         'body': plain_text(description)}
+        for row_id, locale, slug, name, description in courses
+    ] + [
+        {'entity': 'blog', 'entity_id': row_id, 'locale': locale, 'slug': slug, 'title': title,
+         'body': plain_text(excerpt, body)}
+        for row_id, locale, slug, title, excerpt, body in posts
+    ]
+    if rows:
+        now = datetime.now(timezone.utc)
+        op.bulk_insert(documents, [dict(row, updated_at=now) for row in rows])
+
+
+def downgrade() -> None:
+    for statement in DROP_DDL.get(op.get_bind().dialect.name, []):
+        op.execute(statement)
+    op.drop_index(op.f('ix_search_documents_locale'), table_name='search_documents')
+    op.drop_table('search_documents')
@@ -0,0 +1,46 @@
+"""casefolded application name for prefix search
+
+Revision ID: c5e1f7a93d20
+Revises: d7b3a91e5c42
+Create Date: 2026-10-18 23:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e1f7a93d20'
+down_revision: Union[str, None] = 'd7b3a91e5c42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # индекс по выражению batch-режим SQLite не переносит при пересоздании таблицы — удаляем до него
+    op.drop_index('ix_applications_name_lower_prefix', table_name='applications')
+    with op.batch_alter_table('applications') as batch_op:
+        batch_op.add_column(sa.Column('name_search', sa.String(length=255), nullable=True))
+    # lower() в SQLite не трогает кириллицу — значение считается в Python (str.casefold, как в app.models)
+    rows = bind.execute(sa.text('SELECT id, name FROM applications')).fetchall()
+    if rows:
+        bind.execute(
+            sa.text('UPDATE applications SET name_search = :name_search WHERE id = :id'),
+            [{'id': row_id, 'name_search': name.casefold()} for row_id, name in rows],
+        )
+    with op.batch_alter_table('applications') as batch_op:
+        batch_op.alter_column('name_search', existing_type=sa.String(length=255), nullable=False)
+    op.create_index(
+        'ix_applications_name_search', 'applications', ['name_search'], unique=False,
+        postgresql_ops={'name_search': 'varchar_pattern_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_applications_name_search', table_name='applications')
+    with op.batch_alter_table('applications') as batch_op:
+        batch_op.drop_column('name_search')
+    name_ops = ' varchar_pattern_ops' if op.get_bind().dialect.name == 'postgresql' else ''
+    op.create_index('ix_applications_name_lower_prefix', 'applications', [sa.text(f'lower(name){name_ops}')], unique=False)
@@ -0,0 +1,52 @@
+"""translation_group on courses and blog posts
+
+Revision ID: d7b3a91e5c42
+Revises: a4c2e8f61b07
+Create Date: 2026-10-18 22:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7b3a91e5c42'
+down_revision: Union[str, None] = 'a4c2e8f61b07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['courses', 'blog_posts']
+# языки на момент миграции — правило app.locales.base_slug, зафиксированное здесь
+LOCALES = ('ru', 'uz', 'en', 'ja')
+
+
+def base_slug(slug: str) -> str:
+    parts = slug.split('-')
+    if parts[-1] in LOCALES:
+        return '-'.join(parts[:-1]) or slug
+    return slug
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('translation_group', sa.String(length=255), nullable=True))
+        # переводы раньше находились по slug "<base>-<locale>" — та же группировка, но один раз
+        rows = bind.execute(sa.text(f'SELECT id, slug FROM {table}')).fetchall()
+        if rows:
+            bind.execute(
+                sa.text(f'UPDATE {table} SET translation_group = :group WHERE id = :id'),
+                [{'id': row_id, 'group': base_slug(slug)} for row_id, slug in rows],
+            )
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('translation_group', existing_type=sa.String(length=255), nullable=False)
+            batch_op.create_index(f'ix_{table}_translation_group', ['translation_group'], unique=False)
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_index(f'ix_{table}_translation_group')
+            batch_op.drop_column('translation_group')
@@ -0,0 +1,32 @@
+"""backfill published_at for published posts
+
+Revision ID: e2a7c4f81d36
+Revises: 9d3e5a1c7b24
+Create Date: 2026-10-18 14:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7c4f81d36'
+down_revision: Union[str, None] = '9d3e5a1c7b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # keyset-пагинация блога идёт по (published_at, id) — даты нужны у всех опубликованных постов
+    op.get_bind().execute(
+        sa.text(
+            'UPDATE blog_posts SET published_at = COALESCE(created_at, CURRENT_TIMESTAMP) '
+            'WHERE is_published = :published AND published_at IS NULL'
+        ),
+        {'published': True},
+    )
+
+
+def downgrade() -> None:
+    pass
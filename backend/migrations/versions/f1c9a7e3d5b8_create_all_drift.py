@@ -0,0 +1,52 @@
+"""admins table and single-column indexes that only create_all used to make
+
+Revision ID: f1c9a7e3d5b8
+Revises: b3d8f2a6c471
+Create Date: 2026-10-18 19:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c9a7e3d5b8'
+down_revision: Union[str, None] = 'b3d8f2a6c471'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Таблицу admins и индексы с index=True начальная миграция не создала; раньше их досоздавал create_all при старте.
+# IF NOT EXISTS — в базах, поднятых через create_all, они уже есть.
+INDEXES = [
+    ('ix_applications_status', 'applications', 'status'),
+    ('ix_blog_posts_is_published', 'blog_posts', 'is_published'),
+    ('ix_courses_is_active', 'courses', 'is_active'),
+    ('ix_reviews_is_visible', 'reviews', 'is_visible'),
+]
+
+
+def upgrade() -> None:
+    op.create_table('admins',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(length=100), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    if_not_exists=True
+    )
+    op.create_index(op.f('ix_admins_id'), 'admins', ['id'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_admins_username'), 'admins', ['username'], unique=True, if_not_exists=True)
+    for name, table, column in INDEXES:
+        op.create_index(name, table, [column], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
+    op.drop_index(op.f('ix_admins_username'), table_name='admins', if_exists=True)
+    op.drop_index(op.f('ix_admins_id'), table_name='admins', if_exists=True)
+    op.drop_table('admins', if_exists=True)
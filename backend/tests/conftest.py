@@ -0,0 +1,38 @@
+import os
+import tempfile
+
+import pytest
+
+# настройки читаются при импорте приложения: своя временная база, счётчики лимитов в памяти, без внешних сервисов
+_TMP = tempfile.mkdtemp(prefix="educ-center-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP}/test.db"
+os.environ["MEDIA_DIR"] = f"{_TMP}/media"
+os.environ["RATE_LIMIT_ENABLED"] = "true"
+os.environ["RATE_LIMIT_STORAGE_URI"] = "memory://"
+os.environ["TRUST_PROXY_HEADERS"] = "true"
+os.environ["PUBLIC_CACHE_ENABLED"] = "false"
+os.environ["PUBLIC_CACHE_SHARED"] = "false"
+os.environ["OUTBOX_ENABLED"] = "false"
+os.environ["APPLICATION_BATCHING"] = "false"
+os.environ["PRERENDER_DIR"] = ""
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """The temporary database, migrated to head once per run."""
+    from alembic import command
+
+    from app import migrate
+
+    command.upgrade(migrate._alembic_config(), "head")
+    yield
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,28 @@
+from concurrent.futures import Future
+
+from app import models
+from app.database import SessionLocal
+from app.services import derivatives, prerender
+
+ORIGINAL = "a" * 64
+VARIANT = "b" * 64
+
+
+def test_variants_reprerender_the_post_pages_using_the_cover(monkeypatch):
+    with SessionLocal() as db:
+        db.add(models.Asset(hash=ORIGINAL, content_type="image/png", size=1, width=1, height=1))
+        db.add(models.BlogPost(title="Cover", slug="cover-post-uz", body="", locale="uz", cover_hash=ORIGINAL))
+        db.commit()
+
+    scheduled = []
+    monkeypatch.setattr(prerender.prerender_worker, "schedule", lambda *pages: scheduled.extend(pages))
+    done = Future()
+    done.set_result({"card": {"hash": VARIANT, "width": 1, "height": 1, "size": 1}})
+    derivatives._pending.add(ORIGINAL)
+    derivatives._on_done(ORIGINAL, done)
+
+    assert ("blog", "uz", "cover-post-uz") in scheduled
+    assert prerender.home("uz") in scheduled
+    with SessionLocal() as db:
+        post = db.query(models.BlogPost).filter_by(slug="cover-post-uz").one()
+        assert post.cover_variants["card"]["hash"] == VARIANT
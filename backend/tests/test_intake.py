@@ -0,0 +1,34 @@
+import asyncio
+
+from sqlalchemy import func, select
+
+from app import models
+from app.database import AsyncSessionLocal, async_engine
+from app.services.intake import ApplicationBatcher
+
+
+def _values(name: str) -> dict:
+    return {"name": name, "phone": "+998901112233", "tg_username": "@intake", "course_id": None, "course_title": None}
+
+
+async def _count(model, *criteria) -> int:
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count()).select_from(model).where(*criteria))
+
+
+def test_submit_after_stop_is_written_directly():
+    async def scenario():
+        batcher = ApplicationBatcher(window=0.001)
+        try:
+            batcher.start()
+            queued = await asyncio.wait_for(batcher.submit(_values("Batched"), "batched"), timeout=5)
+            await batcher.stop()
+            late = await asyncio.wait_for(batcher.submit(_values("After stop"), "after stop"), timeout=5)
+            assert queued["id"] != late["id"]
+            assert await _count(models.Application, models.Application.id == late["id"]) == 1
+            outbox = models.NotificationOutbox
+            assert await _count(outbox, outbox.payload["text"].as_string() == "after stop") == 1
+        finally:
+            await async_engine.dispose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app import migrate
+
+BACKEND_DIR = migrate.BASE_DIR
+
+
+def _create_all_database(tmp_path, revision: str):
+    """A database at `revision` without alembic_version, as create_all used to leave it."""
+    url = f"sqlite:///{tmp_path}/legacy.db"
+    env = dict(os.environ, DATABASE_URL=url)
+    subprocess.run([sys.executable, "-m", "app.migrate", "upgrade", revision], cwd=BACKEND_DIR, env=env, check=True)
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE alembic_version"))
+    return engine
+
+
+@pytest.mark.parametrize("revision", ["c0406f8291c1", "9d3e5a1c7b24", "7a6c3e1d9b52", "b3d8f2a6c471"])
+def test_detects_create_all_revision(tmp_path, revision):
+    engine = _create_all_database(tmp_path, revision)
+    try:
+        assert migrate.detect_revision(engine) == revision
+    finally:
+        engine.dispose()
+
+
+def test_baseline_is_not_mistaken_for_later_revisions(tmp_path):
+    # схема первого релиза: base64-колонки ещё на месте, хранилища изображений нет
+    engine = _create_all_database(tmp_path, "c0406f8291c1")
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE assets (hash VARCHAR(64) PRIMARY KEY)"))
+        with pytest.raises(migrate.SchemaMismatch):
+            migrate.detect_revision(engine)
+    finally:
+        engine.dispose()
+
+
+def test_empty_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/empty.db")
+    try:
+        assert migrate.detect_revision(engine) is None
+    finally:
+        engine.dispose()
@@ -0,0 +1,182 @@
+import asyncio
+import json
+from datetime import timedelta
+
+import httpx
+import pytest
+from sqlalchemy import delete, select, update
+
+from app import models
+from app.database import AsyncSessionLocal, SessionLocal, async_engine
+from app.services import outbox
+from app.services.outbox import OutboxWorker
+
+
+def run(coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            # соединения aiosqlite привязаны к циклу событий этого теста
+            await async_engine.dispose()
+
+    return asyncio.run(main())
+
+
+class FakeTelegram:
+    """sendMessage endpoint that answers from a script of status codes; records every delivered text."""
+
+    def __init__(self, *statuses: int, retry_after: int | None = None) -> None:
+        self.statuses = list(statuses)
+        self.retry_after = retry_after
+        self.sent: list[str] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status == 200:
+            self.sent.append(json.loads(request.content)["text"])
+            return httpx.Response(200, json={"ok": True})
+        if status == 429:
+            return httpx.Response(429, json={"ok": False, "parameters": {"retry_after": self.retry_after}})
+        return httpx.Response(status, text="error")
+
+
+def make_worker(transport: FakeTelegram) -> OutboxWorker:
+    worker = OutboxWorker(AsyncSessionLocal)
+    worker._client = httpx.AsyncClient(transport=httpx.MockTransport(transport), base_url="https://telegram.test")
+    return worker
+
+
+@pytest.fixture(autouse=True)
+def empty_outbox():
+    with SessionLocal() as db:
+        db.execute(delete(models.NotificationOutbox))
+        db.commit()
+
+
+def enqueue(*texts: str) -> None:
+    with SessionLocal() as db:
+        for text in texts:
+            outbox.enqueue(db, text)
+        db.commit()
+
+
+def rows() -> list[models.NotificationOutbox]:
+    with SessionLocal() as db:
+        return db.scalars(select(models.NotificationOutbox).order_by(models.NotificationOutbox.id)).all()
+
+
+def make_due() -> None:
+    with SessionLocal() as db:
+        db.execute(update(models.NotificationOutbox).where(models.NotificationOutbox.sent_at.is_(None))
+                   .where(models.NotificationOutbox.next_attempt_at.isnot(None))
+                   .values(next_attempt_at=outbox._now() - timedelta(seconds=1)))
+        db.commit()
+
+
+def test_delivers_and_marks_sent():
+    telegram = FakeTelegram()
+    enqueue("one", "two")
+
+    assert run(make_worker(telegram).drain()) == 2
+
+    assert telegram.sent == ["one", "two"]
+    assert all(row.sent_at is not None and row.next_attempt_at is None and row.attempts == 1 for row in rows())
+
+
+def test_server_error_is_retried_with_backoff():
+    telegram = FakeTelegram(500)
+    enqueue("retry me")
+    worker = make_worker(telegram)
+
+    run(worker.drain())
+    (row,) = rows()
+    assert row.sent_at is None and row.attempts == 1 and row.last_error.startswith("500")
+    assert row.next_attempt_at > outbox._now()
+    # повтор не раньше срока
+    assert run(make_worker(telegram).drain()) == 0
+
+    make_due()
+    run(make_worker(telegram).drain())
+    (row,) = rows()
+    assert telegram.sent == ["retry me"]
+    assert row.sent_at is not None and row.attempts == 2 and row.last_error is None
+
+
+def test_rate_limit_waits_retry_after():
+    telegram = FakeTelegram(429, retry_after=120)
+    enqueue("slow down")
+
+    run(make_worker(telegram).drain())
+    (row,) = rows()
+    delay = (row.next_attempt_at - outbox._now()).total_seconds()
+    assert 110 < delay <= 120
+
+
+def test_client_error_is_permanent():
+    telegram = FakeTelegram(400)
+    enqueue("bad markup")
+
+    run(make_worker(telegram).drain())
+    (row,) = rows()
+    assert row.sent_at is None and row.next_attempt_at is None and row.attempts == 1
+    assert telegram.sent == []
+
+
+def test_concurrent_workers_send_each_message_once():
+    telegram = FakeTelegram()
+    enqueue(*(f"message {number}" for number in range(10)))
+
+    async def both():
+        return await asyncio.gather(make_worker(telegram).drain(), make_worker(telegram).drain())
+
+    run(both())
+    assert sorted(telegram.sent) == sorted(f"message {number}" for number in range(10))
+
+
+def test_expired_lease_is_taken_over():
+    telegram = FakeTelegram()
+    enqueue("orphan")
+
+    async def crash_after_claim():
+        # воркер взял строку и умер до отправки
+        async with AsyncSessionLocal() as db:
+            return await make_worker(telegram)._claim(db)
+
+    assert len(run(crash_after_claim())) == 1
+    assert run(make_worker(telegram).drain()) == 0
+
+    make_due()
+    run(make_worker(telegram).drain())
+    assert telegram.sent == ["orphan"]
+    assert rows()[0].sent_at is not None
+
+
+def test_application_message_escapes_course_fields(client):
+    with SessionLocal() as db:
+        course = models.Course(
+            name="Escape <test>", language="en", level="B1 <b>", duration="3 < 4", slug="escape-test-en", locale="en"
+        )
+        db.add(course)
+        db.commit()
+        course_id = course.id
+
+    payload = {"name": "Тест", "phone": "+998901234567", "tg_username": "@tester", "course_id": course_id}
+    response = client.post("/api/public/applications", json=payload, headers={"X-Real-IP": "198.51.100.9"})
+    assert response.status_code == 201
+
+    (row,) = rows()
+    text = row.payload["text"]
+    assert "Escape &lt;test&gt;" in text and "B1 &lt;b&gt;" in text and "3 &lt; 4" in text
+    assert "<" not in text
+
+
+def test_disabled_outbox_does_not_warn(caplog):
+    from app.main import app
+
+    async def start():
+        async with app.router.lifespan_context(app):
+            pass
+
+    asyncio.run(start())
+    assert "not configured" not in caplog.text
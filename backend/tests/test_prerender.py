@@ -0,0 +1,15 @@
+from app.services import prerender
+
+
+def test_blog_card_has_no_inline_script():
+    post = {
+        "locale": "ru",
+        "slug": "x');alert(1);('",
+        "title": "Пост",
+        "excerpt": "",
+        "published_at": None,
+    }
+    html = prerender._blog_html([post], {"empty_blog": ""}, "ru")
+
+    assert "onclick" not in html
+    assert "alert(1);(&#x27;" in html
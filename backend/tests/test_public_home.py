@@ -0,0 +1,24 @@
+import pytest
+
+
+@pytest.mark.parametrize("sections", [",", " , ,"])
+def test_home_without_sections_is_rejected(client, sections):
+    response = client.get("/api/public/home", params={"sections": sections})
+    assert response.status_code == 400
+
+
+def test_home_unknown_section_is_rejected(client):
+    assert client.get("/api/public/home", params={"sections": "courses,nope"}).status_code == 400
+
+
+def test_home_subset(client):
+    response = client.get("/api/public/home", params={"sections": "courses,blog", "locale": "ru"})
+    assert response.status_code == 200
+
+
+def test_unknown_locale_is_rejected_before_the_cache(client):
+    from app.services.cache import response_cache
+
+    before = response_cache.stats()["entries"]
+    assert client.get("/api/public/courses", params={"locale": "xx-random"}).status_code == 400
+    assert response_cache.stats()["entries"] == before
@@ -0,0 +1,39 @@
+import argparse
+import asyncio
+
+import pytest
+
+from app.config import get_settings
+from bench import explain, seed
+
+settings = get_settings()
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    from app.database import SessionLocal
+
+    # больше сотни постов и заявок: bench.load.discover находит курсоры второй страницы
+    args = argparse.Namespace(
+        applications=120, posts=150, courses=8, teachers=3, reviews=3, partners=3,
+        images=0, variants=False, locales=["ru"], seed=42,
+    )
+    db = SessionLocal()
+    try:
+        seed.seed(db, args)
+    finally:
+        db.close()
+
+
+def test_list_routes_use_indexes(seeded):
+    args = argparse.Namespace(locale="ru", admin_login=settings.admin_login, admin_password=settings.admin_password)
+    report = asyncio.run(explain.check(args))
+
+    skipped = [name for name, result in report["routes"].items() if "skipped" in result]
+    assert not skipped
+    failures = {
+        name: sorted({problem for plan in result["plans"] for problem in plan["problems"]})
+        for name, result in report["routes"].items()
+    }
+    assert {name: problems for name, problems in failures.items() if problems} == {}
+    assert all(result["status"] == 200 for result in report["routes"].values())
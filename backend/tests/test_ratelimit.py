@@ -0,0 +1,22 @@
+from limits import parse_many
+
+from app.config import get_settings
+
+settings = get_settings()
+
+
+def _login_limit() -> int:
+    # самое строгое окно из RATE_LIMIT_LOGIN, например 5 из "5/minute;30/hour"
+    return min(item.amount for item in parse_many(settings.rate_limit_login))
+
+
+def test_login_is_limited_per_client_ip(client):
+    attacker = {"X-Real-IP": "203.0.113.7"}
+    payload = {"login": settings.admin_login, "password": "wrong"}
+    for _ in range(_login_limit()):
+        assert client.post("/api/auth/login", json=payload, headers=attacker).status_code == 401
+    assert client.post("/api/auth/login", json=payload, headers=attacker).status_code == 429
+
+    # ключ — X-Real-IP от nginx: другой клиент за тем же прокси свой лимит не потратил
+    other = {"X-Real-IP": "203.0.113.8"}
+    assert client.post("/api/auth/login", json=payload, headers=other).status_code == 401
@@ -0,0 +1,31 @@
+import time
+
+from app.services.cache import ResponseCache
+
+ENTITIES = ("courses",)
+
+
+def _put(cache: ResponseCache, key) -> None:
+    cache.set(key, ENTITIES, cache.versions(ENTITIES), b"[]", '"etag"', None)
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ResponseCache(ttl=60, max_entries=2)
+    _put(cache, "a")
+    _put(cache, "b")
+    assert cache.get("a") is not None
+    _put(cache, "c")
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_swept_without_being_read():
+    cache = ResponseCache(ttl=0.05)
+    for key in range(10):
+        _put(cache, key)
+    time.sleep(0.06)
+    _put(cache, "fresh")
+
+    assert cache.stats()["entries"] == 1
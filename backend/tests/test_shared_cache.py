@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+import fakeredis
+
+from app.services.cache import ResponseCache, SharedCache
+
+KEY = ("reviews", "ru")
+ENTITIES = ("reviews",)
+
+
+async def _worker(server) -> SharedCache:
+    """One uvicorn worker: its own local cache, the common Redis."""
+    local = ResponseCache(ttl=60)
+    shared = SharedCache(local, url="", ttl=60)
+    local.shared = shared
+    shared.start(fakeredis.aioredis.FakeRedis(server=server), fakeredis.FakeRedis(server=server))
+    return shared
+
+
+async def _wait(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not await condition():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+async def _invalidation_reaches_peer() -> None:
+    server = fakeredis.FakeServer()
+    first, second = await _worker(server), await _worker(server)
+    try:
+        # оба воркера подписаны (при подписке локальный кеш очищается)
+        async def subscribed():
+            return dict(await first._client.pubsub_numsub(first.channel)).get(first.channel.encode()) == 2
+
+        assert await _wait(subscribed)
+
+        entry, generations = await first.get(KEY, ENTITIES)
+        assert entry is None
+        await first.set(KEY, ENTITIES, generations, b"[]", '"v1"', None)
+
+        # холодный воркер берёт ответ из Redis, а не из БД
+        entry, generations = await second.get(KEY, ENTITIES)
+        assert entry == (b"[]", '"v1"', None)
+        second.local.set(KEY, ENTITIES, second.local.versions(ENTITIES), b"[]", '"v1"', None)
+
+        # правка в админке на первом воркере
+        first.local.bump(*ENTITIES)
+
+        async def dropped():
+            return second.local.get(KEY) is None
+
+        assert await _wait(dropped)
+        entry, _ = await second.get(KEY, ENTITIES)
+        assert entry is None
+    finally:
+        await first.stop()
+        await second.stop()
+
+
+def test_invalidation_reaches_other_workers():
+    asyncio.run(_invalidation_reaches_peer())
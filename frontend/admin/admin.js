@@ -100,7 +100,14 @@ async function loadSection(section) {
   if (!url) return
   try {
     const data = await api(url)
-    state.data[section] = data
+    if (section === 'applications') {
+      // заявки приходят страницами: первая страница + курсор для «Показать ещё»
+      state.data[section] = data.items
+      state.applicationsCursor = data.next_cursor
+      state.applicationsTotal = data.total
+    } else {
+      state.data[section] = data
+    }
     setMessage('Данные обновлены')
   } catch (err) {
     setMessage(err.message || 'Ошибка загрузки', true)
@@ -108,6 +115,39 @@ async function loadSection(section) {
   render()
 }
 
+async function loadMoreApplications() {
+  if (!state.applicationsCursor) return
+  try {
+    const page = await api(`/api/admin/applications?cursor=${encodeURIComponent(state.applicationsCursor)}`)
+    state.data.applications = [...(state.data.applications || []), ...page.items]
+    state.applicationsCursor = page.next_cursor
+  } catch (err) {
+    setMessage(err.message || 'Ошибка загрузки', true)
+  }
+  render()
+}
+
+async function exportApplications(format) {
+  // выгрузка требует токен, поэтому скачиваем через fetch, а не обычной ссылкой
+  setMessage('Готовим выгрузку...')
+  try {
+    const res = await fetch(`${API_BASE}/api/admin/applications/export?format=${format}`, {
+      headers: { Authorization: `Bearer ${state.token}` },
+    })
+    if (!res.ok) throw new Error(await res.text())
+    const blob = await res.blob()
+    const name = (res.headers.get('Content-Disposition') || '').match(/filename="([^"]+)"/)?.[1] || `applications.${format}`
+    const link = document.createElement('a')
+    link.href = URL.createObjectURL(blob)
+    link.download = name
+    link.click()
+    URL.revokeObjectURL(link.href)
+    setMessage('Выгрузка готова')
+  } catch (err) {
+    setMessage(err.message || 'Ошибка выгрузки', true)
+  }
+}
+
 function renderLogin() {
   adminRoot.innerHTML = `
     <div class="min-h-screen flex items-center justify-center bg-slate-100 px-4">
@@ -192,7 +232,13 @@ function listTable(section) {
       }
     })
   }
-  const buttonAdd = section === 'applications' ? '' : `<button class="btn btn-primary" data-open="${section}" title="Добавить">➕</button>`
+  const buttonAdd =
+    section === 'applications'
+      ? `<div style="display:flex; gap:8px;">
+          <button class="btn btn-ghost" data-export="csv" title="Выгрузить CSV">⬇️ CSV</button>
+          <button class="btn btn-ghost" data-export="xlsx" title="Выгрузить Excel">⬇️ XLSX</button>
+        </div>`
+      : `<button class="btn btn-primary" data-open="${section}" title="Добавить">➕</button>`
   const visibleData = data
   const rows = {
     courses: () =>
@@ -248,7 +294,7 @@ function listTable(section) {
         .map(
           (p) => `
         <tr>
-          <td>${p.logo_base64 ? `<img src="data:image/png;base64,${p.logo_base64}" alt="${p.name || ''}" style="height:40px;object-fit:contain;">` : ''}</td>
+          <td>${p.logo_url ? `<img src="${API_BASE}${p.logo_variants?.thumb?.url || p.logo_url}" alt="${p.name || ''}" style="height:40px;object-fit:contain;">` : ''}</td>
           <td>${p.name || ''}</td>
           <td>#${p.order ?? 0}</td>
           <td class="text-right">
@@ -346,6 +392,13 @@ function listTable(section) {
           </tbody>
         </table>
       </div>
+      ${
+        section === 'applications' && state.applicationsCursor
+          ? `<button class="btn btn-ghost w-full" id="load-more-applications" title="Показать ещё">Показать ещё (${data.length}${
+              state.applicationsTotal != null ? ` из ${state.applicationsTotal}` : ''
+            })</button>`
+          : ''
+      }
     </div>
   `
 }
@@ -586,6 +639,11 @@ function bindEvents() {
     })
   })
 
+  document.getElementById('load-more-applications')?.addEventListener('click', loadMoreApplications)
+  document.querySelectorAll('[data-export]').forEach((btn) => {
+    btn.addEventListener('click', () => exportApplications(btn.getAttribute('data-export')))
+  })
+
   document.querySelectorAll('[data-status]').forEach((btn) => {
     btn.addEventListener('click', async () => {
       const status = btn.getAttribute('data-status')
@@ -749,13 +807,16 @@ function bindEvents() {
           }
           const name = (fd.get('name_single') || '').trim() || null
           const file = fd.get('logo_single')
-          const logo_base64 = (await readFileAsBase64(file)) || record?.logo_base64 || null
-          if (!logo_base64 && !name) throw new Error('Добавьте логотип партнёра')
+          const logo_base64 = await readFileAsBase64(file)
+          // без нового файла сохраняем уже загруженный логотип по его hash
+          const logo_hash = logo_base64 ? null : record?.logo_hash || null
+          if (!logo_base64 && !logo_hash && !name) throw new Error('Добавьте логотип партнёра')
           payloads.push({
             ...common,
             name,
             locale: 'ru',
             logo_base64,
+            logo_hash,
           })
           break
         }
@@ -775,6 +836,7 @@ function bindEvents() {
               slug: slugBase || record?.slug || '',
               title,
               body,
+              cover_hash: record?.cover_hash || null,
               excerpt: (fd.get(`excerpt_${loc}`) || '').trim() || null,
               seo_title: (fd.get(`seo_title_${loc}`) || '').trim() || null,
               seo_description: (fd.get(`seo_description_${loc}`) || '').trim() || null,
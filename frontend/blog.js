@@ -1,3 +1,5 @@
+import { i18n } from './i18n.js'
+
 const API_BASE = (() => {
   const env = window.API_BASE_URL || window.VITE_API_BASE_URL
   if (env) return env
@@ -5,8 +7,11 @@ const API_BASE = (() => {
   return 'http://localhost:8000'
 })()
 
+// Страница от пререндера уже содержит пост (или курс) и ссылки на его переводы
+const prerendered = window.__PRERENDERED__ || null
+
 const params = new URLSearchParams(window.location.search)
-let currentLang = params.get('lang') || 'ru'
+let currentLang = prerendered?.locale || params.get('lang') || 'ru'
 const slug = params.get('slug')
 
 const langButtons = document.querySelectorAll('[data-lang]')
@@ -14,13 +19,36 @@ const titleEl = document.getElementById('post-title')
 const excerptEl = document.getElementById('post-excerpt')
 const bodyEl = document.getElementById('post-body')
 const metaEl = document.getElementById('post-meta')
+const sectionEl = document.getElementById('post-section')
+
+// Все языковые версии поста: { locale: { slug, title, available } } — один запрос вместо угадывания slug
+let translations = null
+
+function t(key) {
+  const dict = i18n[currentLang] || i18n.ru
+  return dict[key] || key
+}
 
 function syncLangButtons() {
   langButtons.forEach((b) => {
-    b.classList.toggle('active', b.getAttribute('data-lang') === currentLang)
+    const lang = b.getAttribute('data-lang')
+    b.classList.toggle('active', lang === currentLang)
+    if (translations) b.disabled = !translations[lang]?.available
   })
 }
 
+async function loadTranslations() {
+  try {
+    const res = await fetch(`${API_BASE}/api/public/blog/${encodeURIComponent(slug)}/translations`)
+    if (!res.ok) return
+    const data = await res.json()
+    translations = Object.fromEntries(data.items.map((item) => [item.locale, item]))
+    syncLangButtons()
+  } catch (err) {
+    console.warn(err)
+  }
+}
+
 async function loadPost() {
   if (!slug) {
     titleEl.textContent = 'Нет slug'
@@ -31,14 +59,19 @@ async function loadPost() {
   bodyEl.innerHTML = ''
   metaEl.textContent = ''
   try {
-    let rightSlug = slug.slice(0, -2) + currentLang;
-    const res = await fetch(`${API_BASE}/api/public/blog/${rightSlug}`)
+    const version = translations?.[currentLang]
+    const postSlug = version?.available ? version.slug : slug
+    const res = await fetch(`${API_BASE}/api/public/blog/${encodeURIComponent(postSlug)}`)
     if (!res.ok) throw new Error('Не найдено')
     const data = await res.json()
+    // версии на выбранном языке нет — показан исходный пост, подсвечиваем его язык
+    currentLang = data.locale
+    syncLangButtons()
     titleEl.textContent = data.title
     excerptEl.textContent = data.excerpt || ''
     bodyEl.innerHTML = data.body || ''
-    metaEl.textContent = `${data.locale.toUpperCase()} · ${data.is_published ? 'Опубликовано' : 'Черновик'}`
+    sectionEl.textContent = t('nav_blog')
+    metaEl.textContent = `${data.locale.toUpperCase()} · ${t(data.is_published ? 'post_published' : 'post_draft')}`
   } catch (err) {
     titleEl.textContent = 'Пост не найден'
     console.warn(err)
@@ -47,11 +80,21 @@ async function loadPost() {
 
 langButtons.forEach((btn) => {
   btn.addEventListener('click', () => {
-    currentLang = btn.getAttribute('data-lang')
+    if (prerendered) {
+      const lang = btn.getAttribute('data-lang')
+      window.location.href = prerendered.translations?.[lang] || `/${lang}/`
+      return
+    }
+    const lang = btn.getAttribute('data-lang')
+    if (lang === currentLang || (translations && !translations[lang]?.available)) return
+    currentLang = lang
     syncLangButtons()
     loadPost()
   })
 })
 
 syncLangButtons()
-loadPost()
+if (!prerendered) {
+  if (slug) loadTranslations().then(loadPost)
+  else loadPost()
+}
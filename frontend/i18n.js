@@ -0,0 +1,216 @@
+// Общий словарь интерфейса: его же читает пререндер (backend/app/services/prerender.py),
+// поэтому объект записан строгим JSON
+export const i18n = {
+  "ru": {
+    "hero_tagline": "Учись. Расти. Побеждай.",
+    "nav_courses": "Курсы",
+    "nav_track": "Трек",
+    "nav_blog": "Блог",
+    "nav_contacts": "Контакты",
+    "cta_apply": "Оставить заявку",
+    "hero_lead": "Технологии. Языки. Карьера.",
+    "hero_title": "Премиальное обучение с реальным результатом",
+    "hero_subtitle": "Интенсивные курсы, индивидуальный трек развития и поддержка менторов 24/7. Учись там, где ценят время.",
+    "btn_choose": "Выбрать курс",
+    "btn_how": "Как мы учим",
+    "stat_langs": "Языка обучения",
+    "stat_hw": "Проверка ДЗ",
+    "stat_support": "Поддержка",
+    "stat_projects": "Пет‑проекта",
+    "stat_live": "Обновление данных с сервера",
+    "section_courses": "Курсы",
+    "section_courses_sub": "Актуальные направления с живыми менторами.",
+    "section_track": "Трек развития",
+    "section_track_sub": "Пошаговый план до результата.",
+    "section_reviews": "Отзывы",
+    "section_reviews_sub": "Результаты студентов и партнёров.",
+    "section_blog": "Блог",
+    "section_blog_sub": "Полезные материалы и новости.",
+    "section_contacts": "Контакты",
+    "section_contacts_sub": "Мы всегда на связи.",
+    "contact_address": "Адрес",
+    "contact_phone": "Телефон",
+    "contact_email": "Почта",
+    "contact_socials": "Соцсети",
+    "form_title": "Оставьте заявку",
+    "form_subtitle": "Свяжемся за 10 минут",
+    "form_name": "Имя",
+    "form_phone": "Телефон",
+    "form_tg": "Telegram",
+    "form_course": "Курс",
+    "form_submit": "Отправить",
+    "ph_name": "Ваше имя",
+    "ph_phone": "+998...",
+    "ph_tg": "@username",
+    "ph_course": "Название или выберите ниже",
+    "empty_courses": "Нет курсов",
+    "empty_track": "Нет шагов трека",
+    "empty_reviews": "Нет отзывов",
+    "empty_blog": "Нет записей",
+    "empty_contacts": "Контакты не указаны",
+    "empty_partners": "Нет партнёров",
+    "post_published": "Опубликовано",
+    "post_draft": "Черновик",
+    "course_active": "Активен",
+    "course_hidden": "Скрыт"
+  },
+  "uz": {
+    "hero_tagline": "O‘qing. O‘sib. G‘alaba qozon.",
+    "nav_courses": "Kurslar",
+    "nav_track": "Trek",
+    "nav_blog": "Blog",
+    "nav_contacts": "Aloqa",
+    "cta_apply": "Ariza qoldirish",
+    "hero_lead": "Texnologiya. Tilllar. Karera.",
+    "hero_title": "Natijali premium ta’lim",
+    "hero_subtitle": "Intensiv kurslar, individual rivojlanish treki va 24/7 mentor ko‘magi.",
+    "btn_choose": "Kurs tanlash",
+    "btn_how": "Qanday o‘qitamiz",
+    "stat_langs": "O‘qitish tili",
+    "stat_hw": "Uy vazifasi tekshiruvi",
+    "stat_support": "Qo‘llab-quvvatlash",
+    "stat_projects": "Pet-loyihalar",
+    "stat_live": "Ma’lumotlar serverdan olinadi",
+    "section_courses": "Kurslar",
+    "section_courses_sub": "Mentorlar bilan dolzarb yo‘nalishlar.",
+    "section_track": "Rivojlanish treki",
+    "section_track_sub": "Natijaga yetkazuvchi qadamlar.",
+    "section_reviews": "Sharhlar",
+    "section_reviews_sub": "Talabalar va hamkorlar natijalari.",
+    "section_blog": "Blog",
+    "section_blog_sub": "Foydali materiallar va yangiliklar.",
+    "section_contacts": "Aloqa",
+    "section_contacts_sub": "Doimo aloqadamiz.",
+    "contact_address": "Manzil",
+    "contact_phone": "Telefon",
+    "contact_email": "Pochta",
+    "contact_socials": "Ijtimoiy tarmoqlar",
+    "form_title": "Ariza qoldiring",
+    "form_subtitle": "10 daqiqada bog‘lanamiz",
+    "form_name": "Ism",
+    "form_phone": "Telefon",
+    "form_tg": "Telegram",
+    "form_course": "Kurs",
+    "form_submit": "Yuborish",
+    "ph_name": "Ismingiz",
+    "ph_phone": "+998...",
+    "ph_tg": "@username",
+    "ph_course": "Nomi yoki tanlang",
+    "empty_courses": "Kurslar yo‘q",
+    "empty_track": "Trek bosqichlari yo‘q",
+    "empty_reviews": "Sharhlar yo‘q",
+    "empty_blog": "Yozuvlar yo‘q",
+    "empty_contacts": "Aloqa ma’lumoti yo‘q",
+    "empty_partners": "Hamkorlar yo‘q",
+    "post_published": "Chop etilgan",
+    "post_draft": "Qoralama",
+    "course_active": "Aktiv",
+    "course_hidden": "Yashirin"
+  },
+  "en": {
+    "hero_tagline": "Learn. Grow. Win.",
+    "nav_courses": "Courses",
+    "nav_track": "Track",
+    "nav_blog": "Blog",
+    "nav_contacts": "Contacts",
+    "cta_apply": "Apply now",
+    "hero_lead": "Tech. Languages. Career.",
+    "hero_title": "Premium learning with real outcomes",
+    "hero_subtitle": "Intensive courses, personal growth track, and 24/7 mentor support.",
+    "btn_choose": "Choose a course",
+    "btn_how": "How we teach",
+    "stat_langs": "Teaching languages",
+    "stat_hw": "Homework check",
+    "stat_support": "Support",
+    "stat_projects": "Pet projects",
+    "stat_live": "Live data from API",
+    "section_courses": "Courses",
+    "section_courses_sub": "Fresh programs with live mentors.",
+    "section_track": "Growth track",
+    "section_track_sub": "Step-by-step to results.",
+    "section_reviews": "Reviews",
+    "section_reviews_sub": "Results of students and partners.",
+    "section_blog": "Blog",
+    "section_blog_sub": "Useful materials and news.",
+    "section_contacts": "Contacts",
+    "section_contacts_sub": "We are always in touch.",
+    "contact_address": "Address",
+    "contact_phone": "Phone",
+    "contact_email": "Email",
+    "contact_socials": "Socials",
+    "form_title": "Leave a request",
+    "form_subtitle": "We will call in 10 minutes",
+    "form_name": "Name",
+    "form_phone": "Phone",
+    "form_tg": "Telegram",
+    "form_course": "Course",
+    "form_submit": "Send",
+    "ph_name": "Your name",
+    "ph_phone": "+998...",
+    "ph_tg": "@username",
+    "ph_course": "Course name or choose below",
+    "empty_courses": "No courses",
+    "empty_track": "No track steps",
+    "empty_reviews": "No reviews",
+    "empty_blog": "No posts",
+    "empty_contacts": "No contacts",
+    "empty_partners": "No partners",
+    "post_published": "Published",
+    "post_draft": "Draft",
+    "course_active": "Active",
+    "course_hidden": "Hidden"
+  },
+  "ja": {
+    "hero_tagline": "学ぶ。成長する。勝つ。",
+    "nav_courses": "コース",
+    "nav_track": "トラック",
+    "nav_blog": "ブログ",
+    "nav_contacts": "連絡先",
+    "cta_apply": "申し込み",
+    "hero_lead": "テクノロジー。言語。キャリア。",
+    "hero_title": "確かな成果のプレミアム学習",
+    "hero_subtitle": "集中コース、個別トラック、24/7メンターサポート。",
+    "btn_choose": "コースを選ぶ",
+    "btn_how": "学び方",
+    "stat_langs": "学習言語",
+    "stat_hw": "課題チェック",
+    "stat_support": "サポート",
+    "stat_projects": "ペットプロジェクト",
+    "stat_live": "APIからのライブデータ",
+    "section_courses": "コース",
+    "section_courses_sub": "講師による最新プログラム。",
+    "section_track": "成長トラック",
+    "section_track_sub": "結果へ導くステップ。",
+    "section_reviews": "レビュー",
+    "section_reviews_sub": "受講生とパートナーの成果。",
+    "section_blog": "ブログ",
+    "section_blog_sub": "役立つ資料とニュース。",
+    "section_contacts": "連絡先",
+    "section_contacts_sub": "いつでもご連絡ください。",
+    "contact_address": "住所",
+    "contact_phone": "電話",
+    "contact_email": "メール",
+    "contact_socials": "SNS",
+    "form_title": "申し込み",
+    "form_subtitle": "10分以内にご連絡します",
+    "form_name": "名前",
+    "form_phone": "電話",
+    "form_tg": "Telegram",
+    "form_course": "コース",
+    "form_submit": "送信",
+    "ph_name": "お名前",
+    "ph_phone": "+81...",
+    "ph_tg": "@username",
+    "ph_course": "コース名または選択",
+    "empty_courses": "コースがありません",
+    "empty_track": "トラックがありません",
+    "empty_reviews": "レビューがありません",
+    "empty_blog": "投稿がありません",
+    "empty_contacts": "連絡先がありません",
+    "empty_partners": "パートナーがいません",
+    "post_published": "公開済み",
+    "post_draft": "下書き",
+    "course_active": "公開",
+    "course_hidden": "非公開"
+  }
+}
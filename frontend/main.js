@@ -1,3 +1,5 @@
+import { i18n } from './i18n.js'
+
 const API_BASE = (() => {
   const env = window.API_BASE_URL || window.VITE_API_BASE_URL
   if (env) return env
@@ -5,211 +7,11 @@ const API_BASE = (() => {
   return "http://localhost:8000"
 })()
 
-const i18n = {
-  ru: {
-    hero_tagline: 'Учись. Расти. Побеждай.',
-    nav_courses: 'Курсы',
-    nav_track: 'Трек',
-    nav_blog: 'Блог',
-    nav_contacts: 'Контакты',
-    cta_apply: 'Оставить заявку',
-    hero_lead: 'Технологии. Языки. Карьера.',
-    hero_title: 'Премиальное обучение с реальным результатом',
-    hero_subtitle: 'Интенсивные курсы, индивидуальный трек развития и поддержка менторов 24/7. Учись там, где ценят время.',
-    btn_choose: 'Выбрать курс',
-    btn_how: 'Как мы учим',
-    stat_langs: 'Языка обучения',
-    stat_hw: 'Проверка ДЗ',
-    stat_support: 'Поддержка',
-    stat_projects: 'Пет‑проекта',
-    stat_live: 'Обновление данных с сервера',
-    section_courses: 'Курсы',
-    section_courses_sub: 'Актуальные направления с живыми менторами.',
-    section_track: 'Трек развития',
-    section_track_sub: 'Пошаговый план до результата.',
-    section_reviews: 'Отзывы',
-    section_reviews_sub: 'Результаты студентов и партнёров.',
-    section_blog: 'Блог',
-    section_blog_sub: 'Полезные материалы и новости.',
-    section_contacts: 'Контакты',
-    section_contacts_sub: 'Мы всегда на связи.',
-    contact_address: 'Адрес',
-    contact_phone: 'Телефон',
-    contact_email: 'Почта',
-    contact_socials: 'Соцсети',
-    form_title: 'Оставьте заявку',
-    form_subtitle: 'Свяжемся за 10 минут',
-    form_name: 'Имя',
-    form_phone: 'Телефон',
-    form_tg: 'Telegram',
-    form_course: 'Курс',
-    form_submit: 'Отправить',
-    ph_name: 'Ваше имя',
-    ph_phone: '+998...',
-    ph_tg: '@username',
-    ph_course: 'Название или выберите ниже',
-    empty_courses: 'Нет курсов',
-    empty_track: 'Нет шагов трека',
-    empty_reviews: 'Нет отзывов',
-    empty_blog: 'Нет записей',
-    empty_contacts: 'Контакты не указаны',
-    course_active: 'Активен',
-    course_hidden: 'Скрыт',
-  },
-  uz: {
-    hero_tagline: 'O‘qing. O‘sib. G‘alaba qozon.',
-    nav_courses: 'Kurslar',
-    nav_track: 'Trek',
-    nav_blog: 'Blog',
-    nav_contacts: 'Aloqa',
-    cta_apply: 'Ariza qoldirish',
-    hero_lead: 'Texnologiya. Tilllar. Karera.',
-    hero_title: 'Natijali premium ta’lim',
-    hero_subtitle: 'Intensiv kurslar, individual rivojlanish treki va 24/7 mentor ko‘magi.',
-    btn_choose: 'Kurs tanlash',
-    btn_how: 'Qanday o‘qitamiz',
-    stat_langs: 'O‘qitish tili',
-    stat_hw: 'Uy vazifasi tekshiruvi',
-    stat_support: 'Qo‘llab-quvvatlash',
-    stat_projects: 'Pet-loyihalar',
-    stat_live: 'Ma’lumotlar serverdan olinadi',
-    section_courses: 'Kurslar',
-    section_courses_sub: 'Mentorlar bilan dolzarb yo‘nalishlar.',
-    section_track: 'Rivojlanish treki',
-    section_track_sub: 'Natijaga yetkazuvchi qadamlar.',
-    section_reviews: 'Sharhlar',
-    section_reviews_sub: 'Talabalar va hamkorlar natijalari.',
-    section_blog: 'Blog',
-    section_blog_sub: 'Foydali materiallar va yangiliklar.',
-    section_contacts: 'Aloqa',
-    section_contacts_sub: 'Doimo aloqadamiz.',
-    contact_address: 'Manzil',
-    contact_phone: 'Telefon',
-    contact_email: 'Pochta',
-    contact_socials: 'Ijtimoiy tarmoqlar',
-    form_title: 'Ariza qoldiring',
-    form_subtitle: '10 daqiqada bog‘lanamiz',
-    form_name: 'Ism',
-    form_phone: 'Telefon',
-    form_tg: 'Telegram',
-    form_course: 'Kurs',
-    form_submit: 'Yuborish',
-    ph_name: 'Ismingiz',
-    ph_phone: '+998...',
-    ph_tg: '@username',
-    ph_course: 'Nomi yoki tanlang',
-    empty_courses: 'Kurslar yo‘q',
-    empty_track: 'Trek bosqichlari yo‘q',
-    empty_reviews: 'Sharhlar yo‘q',
-    empty_blog: 'Yozuvlar yo‘q',
-    empty_contacts: 'Aloqa ma’lumoti yo‘q',
-    course_active: 'Aktiv',
-    course_hidden: 'Yashirin',
-  },
-  en: {
-    hero_tagline: 'Learn. Grow. Win.',
-    nav_courses: 'Courses',
-    nav_track: 'Track',
-    nav_blog: 'Blog',
-    nav_contacts: 'Contacts',
-    cta_apply: 'Apply now',
-    hero_lead: 'Tech. Languages. Career.',
-    hero_title: 'Premium learning with real outcomes',
-    hero_subtitle: 'Intensive courses, personal growth track, and 24/7 mentor support.',
-    btn_choose: 'Choose a course',
-    btn_how: 'How we teach',
-    stat_langs: 'Teaching languages',
-    stat_hw: 'Homework check',
-    stat_support: 'Support',
-    stat_projects: 'Pet projects',
-    stat_live: 'Live data from API',
-    section_courses: 'Courses',
-    section_courses_sub: 'Fresh programs with live mentors.',
-    section_track: 'Growth track',
-    section_track_sub: 'Step-by-step to results.',
-    section_reviews: 'Reviews',
-    section_reviews_sub: 'Results of students and partners.',
-    section_blog: 'Blog',
-    section_blog_sub: 'Useful materials and news.',
-    section_contacts: 'Contacts',
-    section_contacts_sub: 'We are always in touch.',
-    contact_address: 'Address',
-    contact_phone: 'Phone',
-    contact_email: 'Email',
-    contact_socials: 'Socials',
-    form_title: 'Leave a request',
-    form_subtitle: 'We will call in 10 minutes',
-    form_name: 'Name',
-    form_phone: 'Phone',
-    form_tg: 'Telegram',
-    form_course: 'Course',
-    form_submit: 'Send',
-    ph_name: 'Your name',
-    ph_phone: '+998...',
-    ph_tg: '@username',
-    ph_course: 'Course name or choose below',
-    empty_courses: 'No courses',
-    empty_track: 'No track steps',
-    empty_reviews: 'No reviews',
-    empty_blog: 'No posts',
-    empty_contacts: 'No contacts',
-    course_active: 'Active',
-    course_hidden: 'Hidden',
-  },
-  ja: {
-    hero_tagline: '学ぶ。成長する。勝つ。',
-    nav_courses: 'コース',
-    nav_track: 'トラック',
-    nav_blog: 'ブログ',
-    nav_contacts: '連絡先',
-    cta_apply: '申し込み',
-    hero_lead: 'テクノロジー。言語。キャリア。',
-    hero_title: '確かな成果のプレミアム学習',
-    hero_subtitle: '集中コース、個別トラック、24/7メンターサポート。',
-    btn_choose: 'コースを選ぶ',
-    btn_how: '学び方',
-    stat_langs: '学習言語',
-    stat_hw: '課題チェック',
-    stat_support: 'サポート',
-    stat_projects: 'ペットプロジェクト',
-    stat_live: 'APIからのライブデータ',
-    section_courses: 'コース',
-    section_courses_sub: '講師による最新プログラム。',
-    section_track: '成長トラック',
-    section_track_sub: '結果へ導くステップ。',
-    section_reviews: 'レビュー',
-    section_reviews_sub: '受講生とパートナーの成果。',
-    section_blog: 'ブログ',
-    section_blog_sub: '役立つ資料とニュース。',
-    section_contacts: '連絡先',
-    section_contacts_sub: 'いつでもご連絡ください。',
-    contact_address: '住所',
-    contact_phone: '電話',
-    contact_email: 'メール',
-    contact_socials: 'SNS',
-    form_title: '申し込み',
-    form_subtitle: '10分以内にご連絡します',
-    form_name: '名前',
-    form_phone: '電話',
-    form_tg: 'Telegram',
-    form_course: 'コース',
-    form_submit: '送信',
-    ph_name: 'お名前',
-    ph_phone: '+81...',
-    ph_tg: '@username',
-    ph_course: 'コース名または選択',
-    empty_courses: 'コースがありません',
-    empty_track: 'トラックがありません',
-    empty_reviews: 'レビューがありません',
-    empty_blog: '投稿がありません',
-    empty_contacts: '連絡先がありません',
-    course_active: '公開',
-    course_hidden: '非公開',
-  },
-}
+// Страница, собранная пререндером, приносит данные главной с собой — первый запрос к API не нужен
+const prerendered = window.__PRERENDERED__ || null
 
 const langButtons = document.querySelectorAll('[data-lang]')
-let currentLang = 'ru'
+let currentLang = prerendered?.locale || 'ru'
 let cache = {}
 
 const loader = document.getElementById('loader')
@@ -307,7 +109,7 @@ function renderCourses(list = []) {
         <div>
           <div class="flex items-start justify-between gap-3 mb-2">
             <div>
-              <h3 class="text-xl font-semibold text-slate-900">${c.name}</h3>
+              <h3 class="text-xl font-semibold text-slate-900">${prerendered ? `<a href="/${c.locale}/courses/${encodeURIComponent(c.slug)}/" class="hover:text-primary-600">${c.name}</a>` : c.name}</h3>
               <p class="text-sm text-slate-500">${c.language} · ${c.level ?? ''}</p>
             </div>
             <span class="px-2 py-1 text-xs rounded ${c.is_active ? 'bg-emerald-100 text-emerald-700' : 'bg-slate-100 text-slate-500'}">${c.is_active ? t('course_active') : t('course_hidden')}</span>
@@ -378,19 +180,24 @@ function renderReviews(list = []) {
   applyReveal()
 }
 
+function blogHref(b) {
+  if (prerendered) return `/${b.locale}/blog/${encodeURIComponent(b.slug)}/`
+  return `blog.html?slug=${encodeURIComponent(b.slug)}&lang=${currentLang}`
+}
+
 function renderBlog(list = []) {
   if (!blogList) return
   blogList.innerHTML = list.length
     ? list
         .map(
           (b) => `
-      <article onclick="window.location.href='./blog.html?slug=${encodeURIComponent(b.slug)}&lang=${currentLang}'" class="glass rounded-2xl p-5 border border-slate-100 bg-white/90 reveal cursor-pointer">
+      <article class="relative glass rounded-2xl p-5 border border-slate-100 bg-white/90 reveal">
         <div class="text-xs text-primary-600 mb-1">${b.locale}</div>
         <h3 class="text-lg font-semibold text-slate-900">
-          <a href="blog.html?slug=${encodeURIComponent(b.slug)}&lang=${currentLang}" class="hover:text-primary-600">${b.title}</a>
+          <a href="${blogHref(b)}" class="hover:text-primary-600 after:absolute after:inset-0">${b.title}</a>
         </h3>
         <p class="text-sm text-slate-600 mb-2">${b.excerpt ?? ''}</p>
-        <div class="text-xs text-slate-500">${b.is_published ? 'Опубликован' : 'Черновик'}</div>
+        <div class="text-xs text-slate-500">${b.published_at ? new Date(b.published_at).toLocaleDateString(currentLang) : ''}</div>
       </article>
     `,
         )
@@ -405,7 +212,7 @@ function renderPartners(list = []) {
   if (!trackEl || !trackEl2) return
   console.log(list);
   if (!list.length) {
-    trackEl.innerHTML = '<div class="text-slate-500 px-4 py-2">Нет партнёров</div>'
+    trackEl.innerHTML = `<div class="text-slate-500 px-4 py-2">${t('empty_partners')}</div>`
     return
   }
 
@@ -413,7 +220,7 @@ function renderPartners(list = []) {
   const items = list
     .map(
       (p) => `<div class="partner-card">
-        ${p.logo_base64 ? `<img src="data:image/png;base64,${p.logo_base64}" alt="${p.name || ''}" style="max-height: 80px; object-fit:contain; margin:0 auto;" />` : ''}
+        ${p.logo_url ? `<img src="${API_BASE}${p.logo_variants?.thumb?.url || p.logo_url}" alt="${p.name || ''}" width="${p.logo_variants?.thumb?.width || p.logo_width || ''}" height="${p.logo_variants?.thumb?.height || p.logo_height || ''}" loading="lazy" style="max-height: 80px; width:auto; object-fit:contain; margin:0 auto;" />` : ''}
       </div>`
     )
     .join('')
@@ -461,31 +268,38 @@ function updateDashboard(data = {}) {
     .join('')
 }
 
+function renderHome(home) {
+  const courses = home.courses || []
+  const track = home.track || []
+  const reviews = home.reviews || []
+  const partners = home.partners || []
+  const blog = home.blog || []
+  const contacts = home.contacts || null
+  cache[currentLang] = { courses, track, reviews, partners, blog, contacts }
+  renderCourses(courses)
+  fillCourseSelect(courses)
+  renderTrack(track)
+  renderReviews(reviews)
+  renderBlog(blog)
+  renderPartners(partners)
+  renderContacts(contacts)
+  updateDashboard({ courses, track, reviews, blog })
+}
+
 async function loadAll() {
+  if (prerendered?.home && prerendered.locale === currentLang) {
+    // разметка уже в HTML — перерисовываем из тех же данных только ради обработчиков
+    renderHome(prerendered.home)
+    return
+  }
   showLoader(true)
   renderSkeletons(coursesList, 4)
   renderSkeletons(trackList, 3)
   renderSkeletons(reviewsList, 3)
   renderSkeletons(blogList, 3)
   try {
-    const localeParam = `?locale=${currentLang}`
-    const [courses, track, reviews, partners, blog, contacts] = await Promise.all([
-      fetchJson(`/api/public/courses${localeParam}`).catch(() => []),
-      fetchJson(`/api/public/track${localeParam}`).catch(() => []),
-      fetchJson(`/api/public/reviews${localeParam}`).catch(() => []),
-      fetchJson(`/api/public/partners`).catch(() => []),
-      fetchJson(`/api/public/blog${localeParam}`).catch(() => []),
-      fetchJson(`/api/public/contacts`).catch(() => null),
-    ])
-    cache[currentLang] = { courses, track, reviews, partners, blog, contacts }
-    renderCourses(courses)
-    fillCourseSelect(courses)
-    renderTrack(track)
-    renderReviews(reviews)
-    renderBlog(blog)
-    renderPartners(partners)
-    renderContacts(contacts)
-    updateDashboard({ courses, track, reviews, blog })
+    // одна выборка вместо шести: все секции главной приходят одним ответом
+    renderHome(await fetchJson(`/api/public/home?locale=${currentLang}`).catch(() => ({})))
   } catch (err) {
     console.warn('API error', err)
   } finally {
@@ -496,6 +310,11 @@ async function loadAll() {
 // Lang switch
 langButtons.forEach((btn) => {
   btn.addEventListener('click', () => {
+    if (prerendered) {
+      // у каждой локали своя готовая страница
+      window.location.href = `/${btn.getAttribute('data-lang')}/`
+      return
+    }
     currentLang = btn.getAttribute('data-lang')
     syncLangButtons()
     applyTranslations(currentLang)